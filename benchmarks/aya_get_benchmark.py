@@ -0,0 +1,37 @@
+"""Microbenchmark of `Aya.get()`: building the AyaFormat of every call (the
+old behaviour) against the AyaFormat memoized per aya
+
+Usage:
+    python benchmarks/aya_get_benchmark.py --number 20000
+"""
+
+import argparse
+import timeit
+
+from quran_transcript import Aya
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    aya = Aya(2, 282)
+    aya.get()  # loading the corpus
+
+    cases = [
+        (
+            "build AyaFormat (before)",
+            lambda: aya._get(aya.sura_idx, aya.aya_idx),
+            args.number,
+        ),
+        ("memoized get() (after)", aya.get, args.number),
+        (
+            "get() of all the Quran ayat",
+            lambda: [a.get() for a in Aya(1, 1).get_ayat_after()],
+            10,
+        ),
+    ]
+    for name, func, number in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f"{name:<30} {seconds * 1e6:12.2f} us per call")
@@ -0,0 +1,108 @@
+"""Latency and recall of `fuzzy_search` on noisy queries
+
+Queries are random spans of imlaey words with random character edits
+(substitutions, deletions and insertions of arabic letters) like the
+errors of speech recognition. A query is found if a returned item starts
+at the aya and word of the original span. The recall is measured on the
+queries whose original text occurs once in the Quran.
+
+Usage:
+    python benchmarks/fuzzy_search_benchmark.py [--queries 200] [--noise 0.1]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from quran_transcript import Aya, fuzzy_search, search
+from quran_transcript.utils import PartOfUthmaniWord
+
+SEARCH_KWARGS = {"remove_tashkeel": True}
+LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+
+
+def add_noise(text: str, noise: float, rnd: random.Random) -> str:
+    """Edits about `noise` of the characters of `text` (spaces are kept)"""
+    chars = []
+    for c in text:
+        if c == " " or rnd.random() >= noise:
+            chars.append(c)
+            continue
+        edit = rnd.choice(["substitute", "delete", "insert"])
+        if edit == "substitute":
+            chars.append(rnd.choice(LETTERS))
+        elif edit == "insert":
+            chars += [c, rnd.choice(LETTERS)]
+    return "".join(chars)
+
+
+def get_queries(
+    num_queries: int, noise: float, seed=0
+) -> list[tuple[str, tuple[int, int, int]]]:
+    """Returns (noisy text, (sura_idx, aya_idx, start word) of the text) of
+    texts occurring once in the Quran
+    """
+    rnd = random.Random(seed)
+    queries = []
+    while len(queries) < num_queries:
+        aya = Aya(1, 1).set_new_abs(rnd.randint(1, 6236))
+        words = aya.get().imlaey_words
+        start = rnd.randrange(len(words))
+        text = " ".join(words[start : start + rnd.randint(3, 8)])
+        try:
+            if len(search(text, window=None, **SEARCH_KWARGS)) != 1:
+                continue
+        except PartOfUthmaniWord:
+            continue
+        queries.append(
+            (add_noise(text, noise, rnd), (aya.sura_idx, aya.aya_idx, start))
+        )
+    return queries
+
+
+def is_found(item, target: tuple[int, int, int]) -> bool:
+    return (
+        item.start_aya.sura_idx,
+        item.start_aya.aya_idx,
+        item.imlaey_word_span.start,
+    ) == target
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.1)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--min-ratio", type=float, default=0.7)
+    parser.add_argument("--scorer", default="banded")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fuzzy_search("الحمد لله", **SEARCH_KWARGS)
+    print(f"index build (first query): {time.perf_counter() - start:.3f} s")
+
+    latencies = []
+    top1 = topk = 0
+    for text, target in get_queries(args.queries, args.noise):
+        start = time.perf_counter()
+        items = fuzzy_search(
+            text,
+            top_k=args.top_k,
+            min_ratio=args.min_ratio,
+            scorer=args.scorer,
+            **SEARCH_KWARGS,
+        )
+        latencies.append(time.perf_counter() - start)
+        top1 += len(items) > 0 and is_found(items[0], target)
+        topk += any(is_found(item, target) for item in items)
+
+    latencies.sort()
+    print(
+        f"noise={args.noise}, min_ratio={args.min_ratio}, scorer={args.scorer}: "
+        f"p50 {statistics.median(latencies) * 1e3:.1f} ms, "
+        f"p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1e3:.1f} ms, "
+        f"max {latencies[-1] * 1e3:.1f} ms | "
+        f"recall@1 {top1 / len(latencies):.3f}, "
+        f"recall@{args.top_k} {topk / len(latencies):.3f}"
+    )
@@ -0,0 +1,82 @@
+"""Per call cost of `normalize_aya` on all the ayat of the Quran
+
+Compares the former regex implementation (one `re.sub` per filter), the
+compiled `AyaNormalizer` without cache and `normalize_aya` (compiled and
+cached, measured on repeated inputs)
+
+Usage:
+    python benchmarks/normalize_benchmark.py
+"""
+
+import re
+import time
+
+from quran_transcript import Aya, AyaNormalizer, alphabet as alpha, normalize_aya
+
+NORMALIZE_KWARGS = {
+    "remove_spaces": True,
+    "ignore_hamazat": True,
+    "ignore_alef_maksoora": True,
+    "remove_small_alef": True,
+    "remove_tashkeel": True,
+    "normalize_taat": True,
+}
+
+
+def regex_normalize_aya(
+    text: str,
+    remove_spaces=True,
+    ignore_hamazat=False,
+    ignore_alef_maksoora=True,
+    ignore_taa_marboota=False,
+    normalize_taat=False,
+    remove_small_alef=True,
+    remove_tashkeel=False,
+) -> str:
+    """The former `normalize_aya`"""
+    norm_text = text
+    if remove_spaces:
+        norm_text = re.sub(r"\s+", "", norm_text)
+    if ignore_alef_maksoora:
+        norm_text = re.sub(alpha.imlaey.alef_maksoora, alpha.imlaey.alef, norm_text)
+    if ignore_hamazat:
+        norm_text = re.sub(f"[{alpha.imlaey.hamazat}]", alpha.imlaey.hamza, norm_text)
+    if ignore_taa_marboota:
+        norm_text = re.sub(
+            f"[{alpha.imlaey.taa_marboota}]", alpha.imlaey.haa, norm_text
+        )
+    if normalize_taat:
+        norm_text = re.sub(
+            f"[{alpha.imlaey.taa_marboota}]", alpha.imlaey.taa_mabsoota, norm_text
+        )
+    if remove_small_alef:
+        norm_text = re.sub(alpha.imlaey.small_alef, "", norm_text)
+    if remove_tashkeel:
+        norm_text = re.sub(f"[{alpha.imlaey.tashkeel}]", "", norm_text)
+    return norm_text
+
+
+def per_call(func, texts: list[str]) -> float:
+    """Returns the mean seconds per call"""
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return (time.perf_counter() - start) / len(texts)
+
+
+if __name__ == "__main__":
+    texts = [aya.get().imlaey for aya in Aya(1, 1).get_ayat_after(num_ayat=6236)]
+    uncached = AyaNormalizer(**NORMALIZE_KWARGS, cache_size=0)
+    assert all(
+        uncached(text) == regex_normalize_aya(text, **NORMALIZE_KWARGS)
+        for text in texts
+    )
+
+    normalize_aya(texts[0], **NORMALIZE_KWARGS)  # building the normalizer
+    for name, func in [
+        ("regex", lambda text: regex_normalize_aya(text, **NORMALIZE_KWARGS)),
+        ("compiled", uncached),
+        ("normalize_aya (first call)", lambda t: normalize_aya(t, **NORMALIZE_KWARGS)),
+        ("normalize_aya (cached)", lambda t: normalize_aya(t, **NORMALIZE_KWARGS)),
+    ]:
+        print(f"{name:>28}: {per_call(func, texts) * 1e6:7.2f} us / call")
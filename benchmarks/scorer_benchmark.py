@@ -0,0 +1,91 @@
+"""Speed and accuracy of the tasmeea scorers (`quran_transcript.scorers`) on
+the suar of `tests/test_tasmeea_multi.py` and `tests/test_tasmeea.py`
+
+Accuracy is measured against the exact character Levenshtein scorer
+("levenshtein"): the ratio of segments matched to the same span (or not
+matched by both). Also reports the number of matched segments.
+
+Usage:
+    python benchmarks/scorer_benchmark.py
+    python benchmarks/scorer_benchmark.py --scorers banded token phonetic
+
+"numpy" (the reference vectorized scorer, not a faster one) is run only if
+given in `--scorers`
+"""
+
+import argparse
+import copy
+from pathlib import Path
+import time
+import warnings
+
+from quran_transcript import Aya, tasmeea_sura_multi_part
+from quran_transcript.scorers import SCORERS
+
+from tasmeea_benchmark import NORMALIZE_KWARGS, TESTS_FILE, load_suar
+
+TASMEEA_FILE = Path(__file__).parent.parent / "tests/test_tasmeea.py"
+
+TASMEEA_KWARGS = dict(
+    overlap_words=16,
+    window_words=32,
+    acceptance_ratio=0.85,
+    multi_part_truncation_words=2,
+    **NORMALIZE_KWARGS,
+)
+
+
+def get_spans(outputs) -> list[tuple | None]:
+    return [
+        None if out[0] is None else (out[0].start_span, out[0].end_span)
+        for out in outputs
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    default_scorers = [name for name in SCORERS if name != "numpy"]
+    parser.add_argument(
+        "--scorers", nargs="*", choices=list(SCORERS), default=default_scorers
+    )
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    # `tests/test_tasmeea.py` has the lists of sura 114 only
+    suar = load_suar(TESTS_FILE) + [
+        (114 if sura_idx is None else sura_idx, sura_list)
+        for sura_idx, sura_list in load_suar(TASMEEA_FILE)
+    ]
+    Aya(1, 1).get()  # loading the corpus
+    references = [
+        get_spans(
+            tasmeea_sura_multi_part(
+                copy.deepcopy(sura_list),
+                sura_idx,
+                scorer="levenshtein",
+                **TASMEEA_KWARGS,
+            )
+        )
+        for sura_idx, sura_list in suar
+    ]
+
+    for name in args.scorers:
+        seconds = 0.0
+        num_same = 0
+        num_matched = 0
+        num_segments = 0
+        for (sura_idx, sura_list), reference in zip(suar, references):
+            start = time.perf_counter()
+            outputs = tasmeea_sura_multi_part(
+                copy.deepcopy(sura_list), sura_idx, scorer=name, **TASMEEA_KWARGS
+            )
+            seconds += time.perf_counter() - start
+            spans = get_spans(outputs)
+            num_same += sum(span == ref for span, ref in zip(spans, reference))
+            num_matched += sum(span is not None for span in spans)
+            num_segments += len(spans)
+        print(
+            f"{name:>12}: {seconds:7.2f} s, "
+            f"same as levenshtein: {num_same / num_segments:6.1%}, "
+            f"matched: {num_matched:>5} / {num_segments}"
+        )
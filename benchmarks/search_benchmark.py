@@ -0,0 +1,113 @@
+"""Per query cost of `search`: the whole Quran index against the regex scan
+of the window ayat
+
+Queries are random word spans of random ayat searched with several window
+sizes. The regex scan is `utils._search_regex`, the former `search` path.
+
+Usage:
+    python benchmarks/search_benchmark.py [--queries 200]
+"""
+
+import argparse
+import random
+import time
+
+from quran_transcript import Aya, normalize_aya, search
+from quran_transcript import utils
+
+SEARCH_KWARGS = {"remove_tashkeel": True}
+
+
+def get_queries(num_queries: int, seed=0) -> list[tuple[str, Aya]]:
+    """Returns (text, aya of the text) of random word spans (windows of 200
+    ayat around them do not wrap around the Quran)
+    """
+    rnd = random.Random(seed)
+    queries = []
+    for _ in range(num_queries):
+        aya = Aya(1, 1).set_new_abs(rnd.randint(101, 6136))
+        words = aya.get().imlaey_words
+        start = rnd.randrange(len(words))
+        queries.append((" ".join(words[start : start + rnd.randint(2, 5)]), aya))
+    return queries
+
+
+def per_query(func, queries: list[tuple[str, Aya]]) -> float:
+    """Returns the mean seconds per query"""
+    start = time.perf_counter()
+    for text, aya in queries:
+        func(text, aya)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def regex_search(text: str, aya: Aya, window: int) -> list:
+    """The matching step of the former `search` (both bismillah passes)"""
+    norm_text = normalize_aya(text, **SEARCH_KWARGS)
+    return [
+        utils._search_regex(
+            norm_text,
+            loop_aya=aya.step(-window // 2),
+            window=window,
+            include_bismillah=bismillah,
+            **SEARCH_KWARGS,
+        )
+        for bismillah in [False, True]
+    ]
+
+
+def index_search(text: str, aya: Aya, window: int | None) -> list:
+    """The matching step of `search` (both bismillah passes)"""
+    norm_text = normalize_aya(text, **SEARCH_KWARGS)
+    loop_aya = aya.set_new_abs(1) if window is None else aya.step(-window // 2)
+    return [
+        utils._search_index(
+            norm_text,
+            loop_aya=loop_aya,
+            num_ayat=6236 if window is None else window + 1,
+            include_bismillah=bismillah,
+            **SEARCH_KWARGS,
+        )
+        for bismillah in [False, True]
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index_search("الحمد لله", Aya(1, 1), None)
+    print(f"index build (both bismillah passes): {time.perf_counter() - start:.3f} s")
+
+    queries = get_queries(args.queries)
+    for window in [2, 20, 200, None]:
+        idx = per_query(lambda t, a: index_search(t, a, window), queries)
+        line = f"window={str(window):>5}: index {idx * 1e6:9.1f} us"
+        if window is not None:
+            regex = per_query(lambda t, a: regex_search(t, a, window), queries)
+            line += f" | regex {regex * 1e6:9.1f} us"
+        print(line)
+
+    full = per_query(lambda t, a: search(t, start_aya=a, **SEARCH_KWARGS), queries)
+    print(f"search (window=2): {full * 1e6:.1f} us")
+
+    # high hit queries: the uthmani script is decoded only when accessed
+    for text in ["الله", "من"]:
+        # warming up the imlaey to uthmani encodings
+        [item.uthmani_script for item in search(text, window=None, **SEARCH_KWARGS)]
+        start = time.perf_counter()
+        items = search(text, window=None, spans_only=True, **SEARCH_KWARGS)
+        spans = time.perf_counter() - start
+        start = time.perf_counter()
+        items = search(text, window=None, **SEARCH_KWARGS)
+        checked = time.perf_counter() - start
+        start = time.perf_counter()
+        for item in items:
+            item.uthmani_script
+        decode = time.perf_counter() - start
+        print(
+            f"search({text!r}, window=None) {len(items)} items: "
+            f"spans_only {spans * 1e3:.1f} ms | checked {checked * 1e3:.1f} ms | "
+            f"+ uthmani scripts {decode * 1e3:.1f} ms"
+        )
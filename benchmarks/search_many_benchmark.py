@@ -0,0 +1,63 @@
+"""Throughput of `search_many` against `search` in a loop
+
+Queries are random word spans of random ayat (the ones that are part of an
+uthmani word are skipped as `search` raises for them) searched in the whole
+Quran.
+
+Usage:
+    python benchmarks/search_many_benchmark.py [--queries 20000] [--workers 1]
+"""
+
+import argparse
+import random
+import time
+
+from quran_transcript import Aya, search, search_many
+from quran_transcript.utils import PartOfUthmaniWord
+
+SEARCH_KWARGS = {"remove_tashkeel": True}
+
+
+def get_queries(num_queries: int, seed=0) -> list[str]:
+    rnd = random.Random(seed)
+    queries = []
+    while len(queries) < num_queries:
+        aya = Aya(1, 1).set_new_abs(rnd.randint(1, 6236))
+        words = aya.get().imlaey_words
+        start = rnd.randrange(len(words))
+        text = " ".join(words[start : start + rnd.randint(2, 6)])
+        try:
+            search(text, window=None, **SEARCH_KWARGS)
+        except PartOfUthmaniWord:
+            continue
+        queries.append(text)
+    return queries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--window", type=int, default=None)
+    args = parser.parse_args()
+
+    queries = get_queries(args.queries)
+    # warming up the normalized corpus and the indices
+    search_many(queries[:1], window=None, **SEARCH_KWARGS)
+
+    start = time.perf_counter()
+    for text in queries:
+        search(text, window=args.window, **SEARCH_KWARGS)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    search_many(
+        queries, window=args.window, num_workers=args.workers, **SEARCH_KWARGS
+    )
+    batch = time.perf_counter() - start
+    print(
+        f"{len(queries)} queries, window={args.window}: "
+        f"search loop {loop:.2f} s ({len(queries) / loop:.0f} q/s) | "
+        f"search_many(num_workers={args.workers}) {batch:.2f} s "
+        f"({len(queries) / batch:.0f} q/s)"
+    )
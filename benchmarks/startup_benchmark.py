@@ -0,0 +1,60 @@
+"""Cold start benchmark: every measurement runs in a fresh python process
+
+Usage:
+    python benchmarks/startup_benchmark.py --repeats 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STEPS = {
+    "import": "import quran_transcript",
+    "import + Aya(1, 1).get()": "from quran_transcript import Aya; Aya(1, 1).get()",
+    "import + search": (
+        "from quran_transcript import search; "
+        "search('الحمد لله', remove_tashkeel=True)"
+    ),
+    "import + phonetizer": "from quran_transcript import quran_phonetizer",
+}
+
+TIMER = """
+import sys, time
+opened = []
+sys.addaudithook(
+    lambda ev, args: opened.append(args[0])
+    if ev == "open" and "quran-script" in str(args[0])
+    else None
+)
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start, len(opened))
+"""
+
+
+def run_step(code: str) -> tuple[float, int]:
+    out = subprocess.run(
+        [sys.executable, "-c", TIMER.format(code=code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seconds, num_files = out.stdout.split()
+    return float(seconds), int(num_files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, code in STEPS.items():
+        times = []
+        for _ in range(args.repeats):
+            seconds, num_files = run_step(code)
+            times.append(seconds)
+        print(
+            f"{name:<30} median: {statistics.median(times) * 1000:8.1f} ms, "
+            f"min: {min(times) * 1000:8.1f} ms, data files opened: {num_files}"
+        )
@@ -0,0 +1,126 @@
+"""Benchmark of `tasmeea_sura_multi_part` on the suar of
+`tests/test_tasmeea_multi.py`
+
+Reports the time of every sura with the number of segment scripts built
+(`Aya.get_by_imlaey_words`) and the number of Levenshtein distances computed
+(counted in this process only, so not with `--num-workers` > 1)
+
+Usage:
+    python benchmarks/tasmeea_benchmark.py
+    python benchmarks/tasmeea_benchmark.py --suar 26 13
+    python benchmarks/tasmeea_benchmark.py --num-workers 4 --chunk-segments 16
+    python benchmarks/tasmeea_benchmark.py --use-qgram-index
+    python benchmarks/tasmeea_benchmark.py --quran
+    python benchmarks/tasmeea_benchmark.py --alignment dp
+    python benchmarks/tasmeea_benchmark.py --scorer token
+"""
+
+import argparse
+import ast
+from pathlib import Path
+import time
+import warnings
+
+import Levenshtein
+
+from quran_transcript import Aya, tasmeea_quran, tasmeea_sura_multi_part
+from quran_transcript import scorers
+
+TESTS_FILE = Path(__file__).parent.parent / "tests/test_tasmeea_multi.py"
+
+NORMALIZE_KWARGS = {
+    "remove_spaces": True,
+    "ignore_hamazat": True,
+    "ignore_alef_maksoora": True,
+    "remove_small_alef": True,
+    "remove_tashkeel": True,
+    "normalize_taat": True,
+}
+
+
+def load_suar(path: Path = TESTS_FILE) -> list[tuple[int, list[list[str]]]]:
+    """Returns every (sura_idx, sura_list) assigned in the `__main__` block"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    main = [node for node in tree.body if isinstance(node, ast.If)][0]
+    suar = []
+    sura_idx = None
+    for node in main.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id == "sura_idx":
+                sura_idx = ast.literal_eval(node.value)
+            elif node.targets[0].id == "sura_list":
+                suar.append((sura_idx, ast.literal_eval(node.value)))
+    return suar
+
+
+class CallCounter:
+    def __init__(self, func):
+        self.func = func
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.func(*args, **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--suar", type=int, nargs="*", default=None)
+    parser.add_argument("--num-workers", type=int, default=1)
+    parser.add_argument("--chunk-segments", type=int, default=32)
+    parser.add_argument("--use-qgram-index", action="store_true")
+    parser.add_argument("--alignment", choices=["greedy", "dp"], default="greedy")
+    parser.add_argument("--scorer", choices=list(scorers.SCORERS), default=None)
+    # locating the sura with `tasmeea_quran` instead of giving it
+    parser.add_argument("--quran", action="store_true")
+    args = parser.parse_args()
+    if args.quran and args.alignment != "greedy":
+        parser.error("--quran supports the greedy alignment only")
+    warnings.simplefilter("ignore")
+
+    segments_counter = CallCounter(Aya.get_by_imlaey_words)
+    distance_counter = CallCounter(Levenshtein.distance)
+    Aya.get_by_imlaey_words = lambda self, *a, **kw: segments_counter(self, *a, **kw)
+    scorers.lv.distance = distance_counter
+
+    Aya(1, 1).get()  # loading the corpus
+    total = 0.0
+    for sura_idx, sura_list in load_suar():
+        if args.suar and sura_idx not in args.suar:
+            continue
+        segments_counter.count = 0
+        distance_counter.count = 0
+        start = time.perf_counter()
+        if args.quran:
+            tasmeea_quran(
+                [seg for part in sura_list for seg in part],
+                overlap_words=16,
+                window_words=32,
+                acceptance_ratio=0.85,
+                use_qgram_index=args.use_qgram_index,
+                scorer=args.scorer,
+                **NORMALIZE_KWARGS,
+            )
+        else:
+            tasmeea_sura_multi_part(
+                sura_list,
+                sura_idx,
+                overlap_words=16,
+                window_words=32,
+                acceptance_ratio=0.85,
+                multi_part_truncation_words=2,
+                num_workers=args.num_workers,
+                chunk_segments=args.chunk_segments,
+                use_qgram_index=args.use_qgram_index,
+                alignment=args.alignment,
+                scorer=args.scorer,
+                **NORMALIZE_KWARGS,
+            )
+        seconds = time.perf_counter() - start
+        total += seconds
+        print(
+            f"sura {sura_idx:>3} ({len(sura_list):>3} segments): {seconds:7.2f} s, "
+            f"segments built: {segments_counter.count:>8}, "
+            f"distances: {distance_counter.count:>8}"
+        )
+    print(f"total: {total:.2f} s")
@@ -0,0 +1,19 @@
+import argparse
+from pathlib import Path
+
+from quran_transcript.corpus import compile_quran_corpus, DEFAULT_QURAN_PATH
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compile the Quran json script into a memory mapped binary file"
+    )
+    parser.add_argument("--quran-path", type=Path, default=DEFAULT_QURAN_PATH)
+    parser.add_argument(
+        "--out-path",
+        type=Path,
+        default=None,
+        help="Default: beside the json script with `.bin` suffix",
+    )
+    args = parser.parse_args()
+    print(compile_quran_corpus(out_path=args.out_path, quran_path=args.quran_path))
@@ -1,4 +1,5 @@
 from quran_transcript.utils import Aya
+import json
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Response, status
 from pydantic import BaseModel
@@ -12,7 +13,12 @@ async def lifespan(app: FastAPI):
     # StartUP event (called before start)
 
     # Get Sura names
-    start_aya = Aya(sura_idx=1, aya_idx=1, quran_path=QURAN_MAP_PATH)
+    # NOTE: loading our own copy of the script as we edit the rasm map
+    with open(QURAN_MAP_PATH, "r", encoding="utf8") as f:
+        quran_dict = json.load(f)
+    start_aya = Aya(
+        sura_idx=1, aya_idx=1, quran_path=QURAN_MAP_PATH, quran_dict=quran_dict
+    )
     suar_names = []
     for sura_idx in range(1, 115, 1):
         start_aya.set(sura_idx=sura_idx, aya_idx=1)
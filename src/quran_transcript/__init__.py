@@ -1,3 +1,5 @@
+import importlib
+
 from .utils import (
     Aya,
     AyaFormat,
@@ -6,35 +8,116 @@ from .utils import (
     SearchItem,
     WordSpan,
     normalize_aya,
+    AyaNormalizer,
+    get_normalizer,
+    get_normalized_corpus,
     EncodingOutput,
     QuranWordIndex,
     Imlaey2uthmaniOutput,
     SegmentScripts,
 )
+from .corpus import (
+    QuranCorpus,
+    CompiledQuranCorpus,
+    NormalizedQuranCorpus,
+    load_quran_corpus,
+    compile_quran_corpus,
+    get_cache_dir,
+)
 
-from .tasmeea import tasmeea_sura_multi_part, tasmeea_sura, check_sura_missing_parts
-from .phonetics.phonetizer import quran_phonetizer, QuranPhoneticScriptOutput
-from .phonetics.sifa import SifaOutput, chunck_phonemes
-from .phonetics.moshaf_attributes import MoshafAttributes
-
+from .scorers import (
+    Scorer,
+    LevenshteinScorer,
+    BandedLevenshteinScorer,
+    TokenScorer,
+    PhoneticScorer,
+    NumpyScorer,
+    get_scorer,
+)
+from .sura_index import (
+    QGramIndex,
+    SuraQGramIndex,
+    QuranQGramIndex,
+    get_sura_qgram_index,
+    get_quran_qgram_index,
+)
+from .fuzzy import fuzzy_search
+from .batch_search import AhoCorasick, search_many
+from .tasmeea import (
+    tasmeea_sura_multi_part,
+    tasmeea_sura,
+    tasmeea_quran,
+    tasmeea_batch,
+    TasmeeaSession,
+    check_sura_missing_parts,
+)
 from . import alphabet as alphabet
 
+# NOTE: the phonetics modules build their operations from the alphabets at
+# import time so we import them lazily on first use to keep
+# `import quran_transcript` free of any file loading (and pydantic import)
+_LAZY_IMPORTS = {
+    "MoshafAttributes": ".phonetics.moshaf_attributes",
+    "quran_phonetizer": ".phonetics.phonetizer",
+    "QuranPhoneticScriptOutput": ".phonetics.phonetizer",
+    "SifaOutput": ".phonetics.sifa",
+    "chunck_phonemes": ".phonetics.sifa",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "Aya",
     "AyaFormat",
     "search",
+    "fuzzy_search",
+    "search_many",
+    "AhoCorasick",
     "RasmFormat",
     "SearchItem",
     "WordSpan",
     "normalize_aya",
+    "AyaNormalizer",
+    "get_normalizer",
+    "get_normalized_corpus",
     "alphabet",
     "EncodingOutput",
     "QuranWordIndex",
     "Imlaey2uthmaniOutput",
     "SegmentScripts",
+    "QuranCorpus",
+    "NormalizedQuranCorpus",
+    "load_quran_corpus",
+    "CompiledQuranCorpus",
+    "compile_quran_corpus",
+    "get_cache_dir",
     "tasmeea_sura",
     "tasmeea_sura_multi_part",
+    "tasmeea_quran",
+    "tasmeea_batch",
+    "TasmeeaSession",
+    "Scorer",
+    "LevenshteinScorer",
+    "BandedLevenshteinScorer",
+    "TokenScorer",
+    "PhoneticScorer",
+    "NumpyScorer",
+    "get_scorer",
+    "QGramIndex",
+    "SuraQGramIndex",
+    "QuranQGramIndex",
+    "get_sura_qgram_index",
+    "get_quran_qgram_index",
     "check_sura_missing_parts",
     "quran_phonetizer",
     "MoshafAttributes",
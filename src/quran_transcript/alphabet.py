@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 import json
 from pathlib import Path
+import threading
 from typing import Literal
 
 
@@ -404,10 +405,27 @@ BASE_PATH = Path(__file__).parent
 alphabet_path = BASE_PATH / "quran-script/quran-alphabet.json"
 begin_with_hamzat_wasl_path = BASE_PATH / "quran-script/begin_with_hamzat_wasl.json"
 
-with open(begin_with_hamzat_wasl_path, "r", encoding="utf8") as f:
-    begin_hamzat_wasl = BeginHamzatWasl(**json.load(f))
-with open(alphabet_path, "r", encoding="utf8") as f:
-    alphabet_dict = json.load(f)
+# NOTE: the alphabets are loaded lazily on the first access (not at import time)
+# for fast startup. Ex: `alphabet.uthmani` loads all of them
+_LAZY_NAMES = {
+    "begin_hamzat_wasl",
+    "alphabet_dict",
+    "imlaey",
+    "unique_rasm",
+    "istiaatha",
+    "sadaka",
+    "uthmani",
+    "phonetics",
+    "phonetic_groups",
+}
+_load_lock = threading.Lock()
+
+
+def _load_alphabets() -> dict:
+    with open(begin_with_hamzat_wasl_path, "r", encoding="utf8") as f:
+        begin_hamzat_wasl = BeginHamzatWasl(**json.load(f))
+    with open(alphabet_path, "r", encoding="utf8") as f:
+        alphabet_dict = json.load(f)
     imlaey = ImlaeyAlphabet(**alphabet_dict["imlaey"])
     unique_rasm = UniqueRasmMap(**alphabet_dict["unique_rasm_map"])
     istiaatha = Istiaatha(**alphabet_dict["istiaatha"])
@@ -551,3 +569,24 @@ with open(alphabet_path, "r", encoding="utf8") as f:
         + phonetics.noon_mokhfah
         + phonetics.meem_mokhfah,
     )
+
+    return {
+        "begin_hamzat_wasl": begin_hamzat_wasl,
+        "alphabet_dict": alphabet_dict,
+        "imlaey": imlaey,
+        "unique_rasm": unique_rasm,
+        "istiaatha": istiaatha,
+        "sadaka": sadaka,
+        "uthmani": uthmani,
+        "phonetics": phonetics,
+        "phonetic_groups": phonetic_groups,
+    }
+
+
+def __getattr__(name: str):
+    if name in _LAZY_NAMES:
+        with _load_lock:
+            if name not in globals():
+                globals().update(_load_alphabets())
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
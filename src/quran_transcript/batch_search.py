@@ -0,0 +1,467 @@
+import re
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .utils import (
+    Aya,
+    AyaCursor,
+    SearchItem,
+    WordSpan,
+    PartOfUthmaniWord,
+    _INDEX_MIN_AYAT,
+    _get_finditer_starts,
+    _get_imlaey_words_and_str,
+    _get_search_index,
+    _get_words_offsets,
+    _get_words_span,
+    _check_result_item,
+    _strip_istiaatha,
+    normalize_aya,
+    search,
+)
+
+
+class AhoCorasick(object):
+    def __init__(self, patterns: list[str]):
+        """Aho–Corasick automaton of non empty `patterns` to find all of
+        them in a single pass over a text
+
+        Attributes:
+            goto (list[dict[str, int]]): the trie transitions of every state
+            fail (list[int]): the longest proper suffix state of every state
+            outputs (list[list[int]]): the indices of the patterns ending
+                at every state (without the ones of its suffix states)
+            output_link (list[int]): the nearest suffix state with outputs
+                or -1
+        """
+        assert all(patterns), "patterns can not be empty"
+        self.patterns = patterns
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for pattern_idx, pattern in enumerate(patterns):
+            state = 0
+            for c in pattern:
+                transitions = goto[state]
+                state = transitions.get(c, -1)
+                if state == -1:
+                    state = len(goto)
+                    transitions[c] = state
+                    goto.append({})
+                    outputs.append([])
+            outputs[state].append(pattern_idx)
+
+        # breadth first so the suffix states are done before
+        fail = [0] * len(goto)
+        output_link = [-1] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for c, next_state in goto[state].items():
+                queue.append(next_state)
+                suffix_state = fail[state]
+                while suffix_state and c not in goto[suffix_state]:
+                    suffix_state = fail[suffix_state]
+                suffix_state = goto[suffix_state].get(c, 0)
+                fail[next_state] = suffix_state
+                output_link[next_state] = (
+                    suffix_state if outputs[suffix_state] else output_link[suffix_state]
+                )
+        self.goto = goto
+        self.outputs = outputs
+        self.fail = fail
+        self.output_link = output_link
+
+    def iter_matches(self, text: str, ends: set[int] | dict[int, int] | None = None):
+        """Yields (end character (exclusive), pattern index) of every
+        occurrence of the patterns in `text` (overlapping ones too)
+
+        Args:
+            ends (set[int] | dict[int, int] | None): only the occurrences
+                ending at these characters are yielded. None means all
+        """
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        output_link = self.output_link
+        state = 0
+        for end, c in enumerate(text, start=1):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if ends is not None and end not in ends:
+                continue
+            out_state = state if outputs[state] else output_link[state]
+            while out_state > 0:
+                for pattern_idx in outputs[out_state]:
+                    yield end, pattern_idx
+                out_state = output_link[out_state]
+
+
+# the patterns are looked up one by one in the `search` index instead of
+# scanning the text if they are fewer than (characters of the text) / this
+_CHARS_PER_PATTERN = 512
+
+# (absolute aya index from 0, num_ayat, start word, end word, has_bismillah)
+_Match = tuple[int, int, int, int, bool]
+
+
+def _get_index_matches(
+    patterns: list[str],
+    aya: Aya,
+    first_aya: int,
+    num_ayat: int,
+    include_bismillah: bool,
+    kwargs: dict,
+) -> list[list[_Match]]:
+    """Matches the normalized `patterns` over the ayat
+    [first_aya, first_aya + num_ayat - 1] (not wrapping around the end of
+    the Quran) in the text of the whole Quran `search` index like
+    `utils._search_index`
+    """
+    index = _get_search_index(aya, include_bismillah=include_bismillah, **kwargs)
+    start_word = index.aya_word_offsets[first_aya]
+    start_char = index.word_starts[start_word]
+    end_char = index.word_starts[index.aya_word_offsets[first_aya + num_ayat]]
+    # the character -> the first word starting at it (also the
+    # exclusive end word of the words ending at it)
+    char_to_word: dict[int, int] = {}
+    for word_idx in range(
+        bisect_left(index.word_starts, start_char), len(index.word_starts)
+    ):
+        char_idx = index.word_starts[word_idx]
+        if char_idx > end_char:
+            break
+        char_to_word.setdefault(char_idx - start_char, word_idx)
+
+    pattern_spans: list[list[tuple[int, int]]] = [[] for _ in patterns]
+    if len(patterns) * _CHARS_PER_PATTERN < end_char - start_char:
+        # cheaper to look every pattern up in the index than to scan
+        for spans, pattern in zip(pattern_spans, patterns):
+            for match_start_word in index.find(pattern):
+                match_end = index.word_starts[match_start_word] + len(pattern)
+                match_end -= start_char
+                if match_start_word >= start_word and match_end in char_to_word:
+                    spans.append((match_start_word, char_to_word[match_end]))
+    else:
+        automaton = AhoCorasick(patterns)
+        for end, idx in automaton.iter_matches(
+            index.text[start_char:end_char], ends=char_to_word
+        ):
+            match_start_word = char_to_word.get(end - len(patterns[idx]))
+            if match_start_word is None or match_start_word < start_word:
+                continue
+            pattern_spans[idx].append((match_start_word, char_to_word[end]))
+
+    matches: list[list[_Match]] = []
+    for pattern, spans in zip(patterns, pattern_spans):
+        spans.sort()
+        match_starts = [index.word_starts[word_idx] for word_idx, _ in spans]
+        finditer_starts = set(
+            _get_finditer_starts(
+                index.text, pattern, match_starts, first_char=start_char
+            )
+        )
+        pattern_matches = []
+        for match_start_word, match_end_word in spans:
+            if index.word_starts[match_start_word] not in finditer_starts:
+                continue
+            start_aya_idx, start_word_idx = index.get_vertex(match_start_word)
+            end_aya_idx, end_word_idx = index.get_vertex(match_end_word, end=True)
+            pattern_matches.append(
+                (
+                    start_aya_idx,
+                    end_aya_idx - start_aya_idx + 1,
+                    start_word_idx,
+                    end_word_idx,
+                    include_bismillah,
+                )
+            )
+        matches.append(pattern_matches)
+    return matches
+
+
+def _get_window_matches(
+    patterns: list[str],
+    aya: Aya,
+    first_aya: int,
+    num_ayat: int,
+    suffix: str,
+    include_bismillah: bool,
+    kwargs: dict,
+) -> list[list[_Match]]:
+    """Matches the normalized `patterns` over the normalized words of the
+    ayat [first_aya, first_aya + num_ayat - 1] (built once for all the
+    patterns) like `utils._search_regex`
+    """
+    loop_aya = aya.set_new_abs(first_aya + 1)
+    words_list, text = _get_imlaey_words_and_str(
+        start_aya=loop_aya,
+        window=num_ayat - 1,
+        suffix=suffix,
+        include_bismillah=include_bismillah,
+        **kwargs,
+    )
+    offsets = _get_words_offsets(words_list)
+    # only the occurrences starting and ending at words can be matches
+    pattern_starts: list[list[int]] = [[] for _ in patterns]
+    for end, idx in AhoCorasick(patterns).iter_matches(text, ends=offsets.end_to_word):
+        if end - len(patterns[idx]) in offsets.start_to_word:
+            pattern_starts[idx].append(end - len(patterns[idx]))
+
+    total_ayat = aya.corpus.total_ayat
+    matches: list[list[_Match]] = []
+    for pattern, starts in zip(patterns, pattern_starts):
+        pattern_matches = []
+        for match_start in _get_finditer_starts(text, pattern, starts):
+            span = _get_words_span(
+                start=match_start,
+                end=match_start + len(pattern),
+                words_list=words_list,
+                offsets=offsets,
+            )
+            if span is None:
+                continue
+            start_vertex, end_vertex = span
+            pattern_matches.append(
+                (
+                    (first_aya + start_vertex.aya_idx) % total_ayat,
+                    end_vertex.aya_idx - start_vertex.aya_idx + 1,
+                    start_vertex.word_idx,
+                    end_vertex.word_idx,
+                    include_bismillah,
+                )
+            )
+        matches.append(pattern_matches)
+    return matches
+
+
+def _search_many_task(
+    patterns: list[str],
+    aya: Aya,
+    first_aya: int,
+    num_ayat: int,
+    suffix: str,
+    spans_only: bool,
+    use_index: bool,
+    kwargs: dict,
+) -> list[list[_Match] | PartOfUthmaniWord]:
+    """Matches the normalized `patterns` over the ayat
+    [first_aya, first_aya + num_ayat - 1] like `search` (overlapping
+    occurrences are skipped like `re.finditer` and the bismillah pass is
+    for the patterns not found without bismillah) either in the whole Quran
+    index (`use_index`) or in the normalized words of the window ayat. The
+    spans are checked once by `_check_result_item` unless `spans_only`
+
+    Returns plain tuples instead of `SearchItem`s to be sent back by the
+    process pool workers (`Aya` holds the whole corpus). The output of a
+    pattern with a span that is a part of an uthmani word is the
+    `PartOfUthmaniWord` raised for it
+    """
+    outputs: list[list[_Match] | PartOfUthmaniWord] = [[] for _ in patterns]
+    # checked span -> the error raised for it if any
+    checked: dict[_Match, PartOfUthmaniWord | None] = {}
+    pending = list(range(len(patterns)))
+    for bismillah_flag in [False, True]:
+        if not pending:
+            break
+        pending_patterns = [patterns[idx] for idx in pending]
+        if use_index:
+            matches = _get_index_matches(
+                pending_patterns, aya, first_aya, num_ayat, bismillah_flag, kwargs
+            )
+        else:
+            matches = _get_window_matches(
+                pending_patterns,
+                aya,
+                first_aya,
+                num_ayat,
+                suffix,
+                bismillah_flag,
+                kwargs,
+            )
+
+        not_found = []
+        for idx, pattern_matches in zip(pending, matches):
+            if not pattern_matches:
+                not_found.append(idx)
+                continue
+            for key in pattern_matches:
+                start_aya_idx, num_match_ayat, start_word_idx, end_word_idx, _ = key
+                if not spans_only and key not in checked:
+                    checked[key] = None
+                    try:
+                        _check_result_item(
+                            SearchItem(
+                                start_aya=aya.set_new_abs(start_aya_idx + 1),
+                                num_ayat=num_match_ayat,
+                                imlaey_word_span=WordSpan(
+                                    start=start_word_idx, end=end_word_idx
+                                ),
+                                has_bismillah=bismillah_flag,
+                            )
+                        )
+                    except PartOfUthmaniWord as error:
+                        checked[key] = error
+                if not spans_only and checked[key] is not None:
+                    outputs[idx] = checked[key]
+                    break
+                outputs[idx].append(key)
+        pending = not_found
+    return outputs
+
+
+def _search_many_job(
+    patterns: list[str],
+    quran_path: Path,
+    join_prefix: str,
+    first_aya: int,
+    num_ayat: int,
+    suffix: str,
+    spans_only: bool,
+    use_index: bool,
+    kwargs: dict,
+) -> list[list[_Match] | PartOfUthmaniWord]:
+    """Process pool job of `search_many`"""
+    aya = Aya(quran_path=quran_path, join_prefix=join_prefix)
+    return _search_many_task(
+        patterns, aya, first_aya, num_ayat, suffix, spans_only, use_index, kwargs
+    )
+
+
+def search_many(
+    texts: list[str],
+    start_aya: Aya | None = None,
+    window: int | None = 2,
+    suffix=" ",
+    spans_only=False,
+    num_workers: int = 1,
+    **kwargs,
+) -> list[list[SearchItem] | PartOfUthmaniWord]:
+    """`search` of many texts in one pass over the Quran
+
+    The normalized texts are matched together by an Aho–Corasick automaton
+    over the normalized text of the window ayat so the cost does not grow
+    with the number of texts times the window. Duplicated texts are matched
+    once. Like `search` windows of `_INDEX_MIN_AYAT` ayat or more use the
+    text of the whole Quran `search` index (where the texts are looked up
+    instead if they are few for the window, see `_CHARS_PER_PATTERN`) and
+    smaller ones (or the ones wrapping around the end of the Quran) the
+    normalized words of the window ayat built once for all the texts.
+
+    The texts that `search` would match as a regex are searched one by one
+    with `search`
+
+    Args:
+        texts (list[str]): the texts to search with (expected with imlaey
+            script)
+        start_aya (Aya | None): the pivot aya of the window of every text.
+            If None `Aya(1, 1)` is used
+        window (int | None): the search window (see `search`). If None the
+            whole Quran is searched
+        suffix (str): the suffix that sperate the quran words
+        spans_only (bool): see `search`
+        num_workers (int): if > 1 the distinct texts are split between
+            `num_workers` processes each matching them in a single pass. The
+            workers load the Quran of `start_aya.quran_path`
+        kwargs: the arguments of `normalize_aya`
+
+    Returns:
+        list[list[SearchItem] | PartOfUthmaniWord]: the outputs of `search`
+        for every text in the same order of `texts`. The output of a text
+        that `search` raises `PartOfUthmaniWord` for (a match is a part of an
+        uthmani word and not `spans_only`) is the raised error instead so
+        the other texts are still returned
+    """
+    if start_aya is None:
+        start_aya = Aya(1, 1)
+    total_ayat = start_aya.corpus.total_ayat
+    if window is None:
+        loop_aya = start_aya.set_new_abs(1)
+        num_ayat = total_ayat
+    else:
+        loop_aya = start_aya.step(-window // 2)
+        num_ayat = window + 1
+    first_aya = loop_aya.get_abs_aya_idx() - 1
+    use_index = (
+        suffix == start_aya.join_prefix
+        and num_ayat >= _INDEX_MIN_AYAT
+        and first_aya + num_ayat <= total_ayat
+    )
+
+    outputs: list[list[SearchItem] | PartOfUthmaniWord | None] = [None] * len(texts)
+    # normalized text -> ids of texts
+    pattern_to_ids: dict[str, list[int]] = {}
+    # id of text -> has istiaatha
+    istiaatha_ids: set[int] = set()
+    for text_idx, text in enumerate(texts):
+        normalized_text = normalize_aya(text, remove_spaces=True, **kwargs)
+        if normalized_text == "":
+            outputs[text_idx] = []
+            continue
+        normalized_text, has_istiaatha = _strip_istiaatha(
+            normalized_text, start_aya, suffix=suffix, **kwargs
+        )
+        if (
+            num_ayat <= 0
+            or normalized_text == ""
+            or re.escape(normalized_text) != normalized_text
+        ):
+            try:
+                outputs[text_idx] = search(
+                    text,
+                    start_aya=start_aya,
+                    window=window,
+                    suffix=suffix,
+                    spans_only=spans_only,
+                    **kwargs,
+                )
+            except PartOfUthmaniWord as error:
+                outputs[text_idx] = error
+        else:
+            pattern_to_ids.setdefault(normalized_text, []).append(text_idx)
+            if has_istiaatha:
+                istiaatha_ids.add(text_idx)
+
+    patterns = list(pattern_to_ids)
+    task_args = (first_aya, num_ayat, suffix, spans_only, use_index, kwargs)
+    if num_workers <= 1 or len(patterns) < 2:
+        matches = _search_many_task(patterns, start_aya, *task_args)
+    else:
+        chunk_len = -(-len(patterns) // num_workers)
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(
+                    _search_many_job,
+                    patterns[start : start + chunk_len],
+                    start_aya.quran_path,
+                    start_aya.join_prefix,
+                    *task_args,
+                )
+                for start in range(0, len(patterns), chunk_len)
+            ]
+            matches = [match for future in futures for match in future.result()]
+
+    # absolute aya index -> its cursor (shared by the items of every text)
+    cursors: dict[int, AyaCursor] = {}
+    for pattern, pattern_matches in zip(patterns, matches):
+        for text_idx in pattern_to_ids[pattern]:
+            if isinstance(pattern_matches, PartOfUthmaniWord):
+                outputs[text_idx] = pattern_matches
+                continue
+            items = []
+            for abs_idx, num_match_ayat, start, end, bismillah in pattern_matches:
+                if abs_idx not in cursors:
+                    sura_idx, aya_idx = start_aya.corpus.get_sura_aya_idx(abs_idx)
+                    cursors[abs_idx] = AyaCursor(sura_idx=sura_idx, aya_idx=aya_idx)
+                items.append(
+                    SearchItem(
+                        start_aya=start_aya._from_cursor(cursors[abs_idx]),
+                        num_ayat=num_match_ayat,
+                        imlaey_word_span=WordSpan(start=start, end=end),
+                        has_bismillah=bismillah,
+                        has_istiaatha=text_idx in istiaatha_ids,
+                        suffix=suffix,
+                    )
+                )
+            outputs[text_idx] = items
+    return outputs
@@ -0,0 +1,621 @@
+from pathlib import Path
+from functools import lru_cache
+from array import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Sequence
+
+BASE_PATH = Path(__file__).parent
+DEFAULT_QURAN_PATH = BASE_PATH / "quran-script/quran-uthmani-imlaey.json"
+COMPILED_SUFFIX = ".bin"
+
+
+class ReadOnlyCorpusError(Exception):
+    pass
+
+
+class QuranCorpus(object):
+    def __init__(
+        self,
+        quran_dict: dict,
+        quran_path: str | Path | None = None,
+        read_only=True,
+    ):
+        """Holder of the Quran script (uthmani & imlaey) shared between `Aya` objects
+
+        Args:
+            quran_dict (dict): the parsed quran json script with the same
+                structure of `quran-script/quran-uthmani-imlaey.json`
+            quran_path (str | Path | None): the path the script is loaded from
+            read_only (bool): if True editing the script (e.g `Aya.set_rasm_map`)
+                will raise `ReadOnlyCorpusError`. Corpora loaded by
+                `load_quran_corpus` are shared by the whole process so
+                they are always read only.
+
+        Note:
+            All sura and aya indices here are absolute indices starting from 0
+        """
+        self.quran_dict = quran_dict
+        self.quran_path = None if quran_path is None else Path(quran_path)
+        self.read_only = read_only
+        # tables derived from the script (like the imlaey to uthmani encodings)
+        # built lazily by the users of the corpus and shared between them
+        self.derived: dict = {}
+
+        suar = self.quran_dict["quran"]["sura"]
+        self.num_suar = len(suar)
+        self.num_ayat = tuple(len(sura["aya"]) for sura in suar)
+        self._build_verse_index()
+
+    def _build_verse_index(self):
+        """Global verse index: every aya has an absolute index from 0 to
+        (total_ayat - 1) ordered by sura then aya
+
+        * `sura_offsets[sura_idx]`: the absolute index of the first aya in the sura
+        with length (num_suar + 1)
+        """
+        sura_offsets = [0]
+        abs_to_sura: list[int] = []
+        abs_to_aya: list[int] = []
+        for sura_idx, num_ayat in enumerate(self.num_ayat):
+            sura_offsets.append(sura_offsets[-1] + num_ayat)
+            abs_to_sura += [sura_idx] * num_ayat
+            abs_to_aya += range(num_ayat)
+        self.sura_offsets = tuple(sura_offsets)
+        self.total_ayat = sura_offsets[-1]
+        self._abs_to_sura = tuple(abs_to_sura)
+        self._abs_to_aya = tuple(abs_to_aya)
+
+    def get_abs_aya_idx(self, sura_idx: int, aya_idx: int) -> int:
+        """the absolute index of the aya in the whole Quran (from 0 to total_ayat - 1)"""
+        return self.sura_offsets[sura_idx] + aya_idx
+
+    def get_sura_aya_idx(self, abs_aya_idx: int) -> tuple[int, int]:
+        """returns (sura_idx, aya_idx) of the absolute aya index"""
+        assert abs_aya_idx >= 0 and abs_aya_idx < self.total_ayat, (
+            f"Wrong absolute aya index {abs_aya_idx}"
+        )
+        return self._abs_to_sura[abs_aya_idx], self._abs_to_aya[abs_aya_idx]
+
+    @property
+    def version(self) -> str | None:
+        """Hash of the script file the corpus is loaded from. None for
+        editable corpora and corpora not loaded from a file
+        """
+        if not self.read_only or self.quran_path is None:
+            return None
+        return _get_file_hash(self.quran_path)
+
+    def check_writable(self):
+        if self.read_only:
+            raise ReadOnlyCorpusError(
+                "The Quran corpus is shared and read only. To edit the script "
+                "load your own copy and pass it to `Aya(quran_dict=...)`"
+            )
+
+    def get_sura_object(self, sura_idx: int) -> dict:
+        assert sura_idx >= 0 and sura_idx < self.num_suar, (
+            f"Wrong Sura index {sura_idx + 1}"
+        )
+        return self.quran_dict["quran"]["sura"][sura_idx]
+
+    def get_sura(self, sura_idx: int) -> list[dict]:
+        return self.get_sura_object(sura_idx)["aya"]
+
+    def get_sura_name(self, sura_idx: int, name_key="@name") -> str:
+        return self.get_sura_object(sura_idx)[name_key]
+
+    def get_num_ayat(self, sura_idx: int) -> int:
+        assert sura_idx >= 0 and sura_idx < self.num_suar, (
+            f"Wrong Sura index {sura_idx + 1}"
+        )
+        return self.num_ayat[sura_idx]
+
+    def get_aya(self, sura_idx: int, aya_idx: int) -> dict:
+        """returns the raw aya item of the script (dict with keys like "@uthmani")"""
+        assert aya_idx >= 0 and aya_idx < self.get_num_ayat(sura_idx), (
+            f"Sura index out of range sura_index={sura_idx + 1} "
+            + f"and len of sura={self.get_num_ayat(sura_idx)}"
+        )
+        return self.quran_dict["quran"]["sura"][sura_idx]["aya"][aya_idx]
+
+    def get_aya_words(
+        self, sura_idx: int, aya_idx: int, script="imlaey", join_prefix=" "
+    ) -> list[str]:
+        """returns the words of the aya for `script` ("uthmani" or "imlaey")"""
+        return self.get_aya(sura_idx, aya_idx)[f"@{script}"].split(join_prefix)
+
+
+@lru_cache(maxsize=None)
+def _get_file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Compiled (binary) corpus
+# -----------------------------------------------------------------------------
+# The compiled file is a header followed by flat sections. Every string
+# (sura names, ayat, words, rasm map items) is a (start, end) byte range
+# in one UTF-8 blob so words are ranges inside their aya (no copies).
+# All the other sections are int32 arrays:
+#   * `*_offsets`: cumulative counts with length (num_items + 1) so the items
+#     of aya `i` are `offsets[i]: offsets[i + 1]`
+#   * string ids with `-1` for missing strings
+_MAGIC = b"QTCORPUS"
+_VERSION = 2
+_HEADER = struct.Struct("<8sIIc3x")
+# the compiled corpus header ends with the sha1 digest of the json script it
+# is compiled from
+_COMPILED_HEADER = struct.Struct("<8sIIc3x20s")
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = (
+    "blob",
+    "str_starts",
+    "str_ends",
+    "sura_names",
+    "sura_offsets",
+    "uthmani",
+    "imlaey",
+    "bismillah_uthmani",
+    "bismillah_imlaey",
+    "uthmani_word_offsets",
+    "uthmani_words",
+    "imlaey_word_offsets",
+    "imlaey_words",
+    "rasm_map_offsets",
+    "rasm_map",
+    "bismillah_map_offsets",
+    "bismillah_map",
+)
+_BYTEORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+def _align(offset: int, alignment=8) -> int:
+    return offset + (-offset % alignment)
+
+
+class _StringsWriter(object):
+    def __init__(self):
+        self.blob = bytearray()
+        self.starts = array("i")
+        self.ends = array("i")
+        self._ids: dict[str, int] = {}
+
+    def add(self, text: str | None) -> int:
+        if text is None:
+            return -1
+        if text not in self._ids:
+            start = len(self.blob)
+            self.blob += text.encode("utf8")
+            self._ids[text] = self._add_range(start, len(self.blob))
+        return self._ids[text]
+
+    def add_words(self, text: str, join_prefix=" ") -> list[int]:
+        """Adds every word of `text` as a byte range inside `text` itself"""
+        str_id = self.add(text)
+        start = self.starts[str_id]
+        word_ids = []
+        for word in text.encode("utf8").split(join_prefix.encode("utf8")):
+            word_ids.append(self._add_range(start, start + len(word)))
+            start += len(word) + len(join_prefix.encode("utf8"))
+        return word_ids
+
+    def _add_range(self, start: int, end: int) -> int:
+        self.starts.append(start)
+        self.ends.append(end)
+        return len(self.starts) - 1
+
+
+def compile_quran_corpus(
+    out_path: str | Path | None = None,
+    quran_path: str | Path = DEFAULT_QURAN_PATH,
+    join_prefix=" ",
+) -> Path:
+    """Compiles the quran json script into a binary file for `CompiledQuranCorpus`
+
+    The binary file is memory mapped when loaded so startup is nearly instant
+    and processes on the same machine share the same physical memory pages.
+    `load_quran_corpus(quran_path)` uses the compiled file automatically if
+    it is found beside the json script (same name with `.bin` suffix) and it
+    is compiled from the same json script (its sha1 hash is saved in the
+    header).
+
+    Args:
+        out_path (str | Path | None): the output path. If None the compiled file
+            is saved beside `quran_path`
+        quran_path (str | Path): the quran json script to compile
+
+    Returns:
+        Path: the path of the compiled file
+    """
+    quran_path = Path(quran_path)
+    if out_path is None:
+        out_path = quran_path.with_suffix(COMPILED_SUFFIX)
+    out_path = Path(out_path)
+    with open(quran_path, "rb") as f:
+        script = f.read()
+    quran_dict = json.loads(script)
+
+    strings = _StringsWriter()
+    arrays = {name: array("i") for name in _SECTIONS if name != "blob"}
+    for key in arrays:
+        if key.endswith("_offsets"):
+            arrays[key].append(0)
+
+    for sura in quran_dict["quran"]["sura"]:
+        arrays["sura_names"].append(strings.add(sura["@name"]))
+        arrays["sura_offsets"].append(arrays["sura_offsets"][-1] + len(sura["aya"]))
+        for aya in sura["aya"]:
+            arrays["uthmani"].append(strings.add(aya["@uthmani"]))
+            arrays["imlaey"].append(strings.add(aya["@imlaey"]))
+            for key in ["bismillah_uthmani", "bismillah_imlaey"]:
+                arrays[key].append(strings.add(aya.get(f"@{key}")))
+            for key in ["uthmani", "imlaey"]:
+                word_ids = strings.add_words(aya[f"@{key}"], join_prefix=join_prefix)
+                arrays[f"{key}_words"].extend(word_ids)
+                arrays[f"{key}_word_offsets"].append(
+                    arrays[f"{key}_word_offsets"][-1] + len(word_ids)
+                )
+            for key in ["rasm_map", "bismillah_map"]:
+                items = aya.get(key) or []
+                for item in items:
+                    arrays[key].append(strings.add(item["@uthmani"]))
+                    arrays[key].append(strings.add(item["@imlaey"]))
+                arrays[f"{key}_offsets"].append(
+                    arrays[f"{key}_offsets"][-1] + len(items)
+                )
+    arrays["str_starts"] = strings.starts
+    arrays["str_ends"] = strings.ends
+
+    sections = [bytes(strings.blob)] + [
+        arrays[name].tobytes() for name in _SECTIONS[1:]
+    ]
+    # every section starts at 8 bytes aligned offset
+    header = _COMPILED_HEADER.pack(
+        _MAGIC, _VERSION, len(_SECTIONS), _BYTEORDER, hashlib.sha1(script).digest()
+    )
+    offset = _align(_COMPILED_HEADER.size + _SECTION.size * len(_SECTIONS))
+    for section in sections:
+        header += _SECTION.pack(offset, len(section))
+        offset = _align(offset + len(section))
+
+    # writing to a temporary file then renaming as other processes may have
+    # the old file memory mapped
+    tmp_path = out_path.with_suffix(f"{out_path.suffix}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(bytes(_align(f.tell()) - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+class CompiledQuranCorpus(QuranCorpus):
+    def __init__(self, compiled_path: str | Path):
+        """Read only Quran corpus memory mapped from a file made by `compile_quran_corpus`
+
+        Every aya is accessed by offset arithmetic over the mapped arrays
+        without parsing the whole script.
+        """
+        self.quran_path = Path(compiled_path)
+        self.read_only = True
+        self.derived: dict = {}
+        self._quran_dict = None
+
+        with open(self.quran_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        magic, version = _HEADER.unpack_from(buf, 0)[:2]
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a compiled quran corpus file: {self.quran_path}")
+        _, _, num_sections, byteorder, digest = _COMPILED_HEADER.unpack_from(buf, 0)
+        # the hash (like `QuranCorpus.version`) of the compiled json script
+        self.source_version = digest.hex()
+        if byteorder != _BYTEORDER or num_sections != len(_SECTIONS):
+            raise ValueError(
+                f"Incompatible compiled quran corpus file: {self.quran_path}"
+            )
+
+        self._sections: dict[str, memoryview] = {}
+        for idx, name in enumerate(_SECTIONS):
+            offset, nbytes = _SECTION.unpack_from(
+                buf, _COMPILED_HEADER.size + idx * _SECTION.size
+            )
+            section = buf[offset : offset + nbytes]
+            self._sections[name] = section if name == "blob" else section.cast("i")
+
+        self._blob = self._sections["blob"]
+        self._starts = self._sections["str_starts"]
+        self._ends = self._sections["str_ends"]
+        sura_offsets = self._sections["sura_offsets"]
+        self.num_suar = len(self._sections["sura_names"])
+        self.num_ayat = tuple(
+            sura_offsets[idx + 1] - sura_offsets[idx] for idx in range(self.num_suar)
+        )
+        self._build_verse_index()
+
+    def _get_str(self, str_id: int) -> str | None:
+        if str_id < 0:
+            return None
+        return str(self._blob[self._starts[str_id] : self._ends[str_id]], "utf8")
+
+    def _get_map(self, key: str, global_aya_idx: int) -> list[dict[str, str]] | None:
+        offsets = self._sections[f"{key}_offsets"]
+        items = self._sections[key]
+        start, end = offsets[global_aya_idx], offsets[global_aya_idx + 1]
+        if start == end:
+            return None
+        return [
+            {
+                "@uthmani": self._get_str(items[2 * idx]),
+                "@imlaey": self._get_str(items[2 * idx + 1]),
+            }
+            for idx in range(start, end)
+        ]
+
+    def get_sura_name(self, sura_idx: int, name_key="@name") -> str:
+        assert name_key == "@name", "compiled corpus supports only the default keys"
+        assert sura_idx >= 0 and sura_idx < self.num_suar, (
+            f"Wrong Sura index {sura_idx + 1}"
+        )
+        return self._get_str(self._sections["sura_names"][sura_idx])
+
+    def get_aya(self, sura_idx: int, aya_idx: int) -> dict:
+        assert aya_idx >= 0 and aya_idx < self.get_num_ayat(sura_idx), (
+            f"Sura index out of range sura_index={sura_idx + 1} "
+            + f"and len of sura={self.get_num_ayat(sura_idx)}"
+        )
+        idx = self.get_abs_aya_idx(sura_idx, aya_idx)
+        aya = {
+            "@index": str(aya_idx + 1),
+            "@uthmani": self._get_str(self._sections["uthmani"][idx]),
+            "@imlaey": self._get_str(self._sections["imlaey"][idx]),
+        }
+        for key in ["bismillah_uthmani", "bismillah_imlaey"]:
+            text = self._get_str(self._sections[key][idx])
+            if text is not None:
+                aya[f"@{key}"] = text
+        for key in ["rasm_map", "bismillah_map"]:
+            rasm_map = self._get_map(key, idx)
+            if rasm_map is not None:
+                aya[key] = rasm_map
+        return aya
+
+    def get_aya_words(
+        self, sura_idx: int, aya_idx: int, script="imlaey", join_prefix=" "
+    ) -> list[str]:
+        assert join_prefix == " ", "compiled corpus supports only the default keys"
+        assert aya_idx >= 0 and aya_idx < self.get_num_ayat(sura_idx), (
+            f"Sura index out of range sura_index={sura_idx + 1} "
+            + f"and len of sura={self.get_num_ayat(sura_idx)}"
+        )
+        idx = self.get_abs_aya_idx(sura_idx, aya_idx)
+        offsets = self._sections[f"{script}_word_offsets"]
+        words = self._sections[f"{script}_words"]
+        return [
+            self._get_str(words[word_idx])
+            for word_idx in range(offsets[idx], offsets[idx + 1])
+        ]
+
+    def get_sura_object(self, sura_idx: int) -> dict:
+        """The sura as the json structure decoded from the mapped file only
+        (the whole `quran_dict` is not built)
+        """
+        assert sura_idx >= 0 and sura_idx < self.num_suar, (
+            f"Wrong Sura index {sura_idx + 1}"
+        )
+        if self._quran_dict is not None:
+            return self._quran_dict["quran"]["sura"][sura_idx]
+        return {
+            "@index": str(sura_idx + 1),
+            "@name": self.get_sura_name(sura_idx),
+            "aya": [
+                self.get_aya(sura_idx, aya_idx)
+                for aya_idx in range(self.num_ayat[sura_idx])
+            ],
+        }
+
+    @property
+    def quran_dict(self) -> dict:
+        """The whole script as the json structure (built only if needed)"""
+        if self._quran_dict is None:
+            self._quran_dict = {
+                "quran": {
+                    "sura": [
+                        self.get_sura_object(sura_idx)
+                        for sura_idx in range(self.num_suar)
+                    ]
+                }
+            }
+        return self._quran_dict
+
+
+@lru_cache(maxsize=None)
+def _load_quran_corpus(quran_path: Path) -> QuranCorpus:
+    if quran_path.suffix == COMPILED_SUFFIX:
+        return CompiledQuranCorpus(quran_path)
+
+    # the compiled file is used only if it is compiled from this very script
+    # (not an older or a copied one)
+    compiled_path = quran_path.with_suffix(COMPILED_SUFFIX)
+    if compiled_path.is_file():
+        try:
+            corpus = CompiledQuranCorpus(compiled_path)
+        except ValueError:
+            corpus = None
+        if corpus is not None:
+            if corpus.source_version == _get_file_hash(quran_path):
+                return corpus
+
+    with open(quran_path, "r", encoding="utf8") as f:
+        quran_dict = json.load(f)
+    return QuranCorpus(quran_dict, quran_path=quran_path, read_only=True)
+
+
+def load_quran_corpus(quran_path: str | Path = DEFAULT_QURAN_PATH) -> QuranCorpus:
+    """Loads the Quran script once per process and shares it
+
+    The script file is parsed only in the first call for every path, the
+    next calls returns the same read only `QuranCorpus` object.
+    If `quran_path` is a compiled corpus (`.bin`) or there is a compiled
+    corpus of the same json script (checked by its hash) beside it, it is
+    memory mapped instead of parsing the json (see `compile_quran_corpus`).
+    """
+    return _load_quran_corpus(Path(quran_path).resolve())
+
+
+# -----------------------------------------------------------------------------
+# Normalized corpus
+# -----------------------------------------------------------------------------
+# The normalized imlaey words of the whole Quran for a normalization profile
+# (the `normalize_aya` arguments) saved with the same layout of the compiled
+# corpus. For every script ("imlaey" and "bismillah_imlaey"):
+#   * `{script}_text`: the UTF-8 normalized words joined without spaces
+#   * `{script}_word_starts`: the character start of every word (num_words + 1)
+#   * `{script}_word_offsets`: the first word of every aya (total_ayat + 1)
+_NORMALIZED_MAGIC = b"QTNORMAL"
+_NORMALIZED_VERSION = 1
+_NORMALIZED_SCRIPTS = ("imlaey", "bismillah_imlaey")
+_NORMALIZED_SECTIONS = tuple(
+    f"{script}_{name}"
+    for script in _NORMALIZED_SCRIPTS
+    for name in ["text", "word_starts", "word_offsets"]
+)
+NORMALIZED_SUFFIX = ".norm"
+
+
+def get_cache_dir() -> Path:
+    """The directory of the files cached by the package:
+    `$QURAN_TRANSCRIPT_CACHE_DIR` or `$XDG_CACHE_HOME/quran_transcript`
+    (`~/.cache/quran_transcript` by default)
+    """
+    if os.environ.get("QURAN_TRANSCRIPT_CACHE_DIR"):
+        return Path(os.environ["QURAN_TRANSCRIPT_CACHE_DIR"])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "quran_transcript"
+
+
+class NormalizedQuranCorpus(object):
+    def __init__(
+        self,
+        texts: dict[str, str],
+        word_starts: dict[str, Sequence[int]],
+        word_offsets: dict[str, Sequence[int]],
+    ):
+        """The normalized imlaey words of every aya (and its bismillah) of
+        the whole Quran as flat texts with word boundaries
+
+        Words of script `script` ("imlaey" or "bismillah_imlaey") are
+        indexed over the whole Quran: the words of the aya of absolute index
+        `i` (from 0) are `word_offsets[script][i]: word_offsets[script][i + 1]`
+        and word `j` is
+        `texts[script][word_starts[script][j]: word_starts[script][j + 1]]`.
+
+        Use `utils.get_normalized_corpus` to build or load it.
+        """
+        self.texts = texts
+        self.word_starts = word_starts
+        self.word_offsets = word_offsets
+        self.total_ayat = len(word_offsets["imlaey"]) - 1
+
+    def get_num_words(self, script="imlaey") -> int:
+        return len(self.word_starts[script]) - 1
+
+    def get_aya_word_range(self, abs_aya_idx: int, script="imlaey") -> range:
+        """The word indices of the aya (absolute index from 0)"""
+        offsets = self.word_offsets[script]
+        return range(offsets[abs_aya_idx], offsets[abs_aya_idx + 1])
+
+    def get_text(self, start_word: int, end_word: int, script="imlaey") -> str:
+        """The normalized text of the words [start_word, end_word)"""
+        starts = self.word_starts[script]
+        return self.texts[script][starts[start_word] : starts[end_word]]
+
+    def get_words(self, start_word: int, end_word: int, script="imlaey") -> list[str]:
+        """The normalized words [start_word, end_word)"""
+        starts = self.word_starts[script]
+        text = self.texts[script]
+        return [
+            text[starts[idx] : starts[idx + 1]] for idx in range(start_word, end_word)
+        ]
+
+    def get_aya_words(self, abs_aya_idx: int, script="imlaey") -> list[str]:
+        """The normalized words of the aya (absolute index from 0). Ayat
+        without bismillah have no "bismillah_imlaey" words
+        """
+        words = self.get_aya_word_range(abs_aya_idx, script)
+        return self.get_words(words.start, words.stop, script)
+
+    def save(self, path: str | Path) -> Path:
+        """Saves the corpus to `path` (written to a temporary file then
+        renamed so readers never see partial files)
+        """
+        path = Path(path)
+        sections = []
+        for script in _NORMALIZED_SCRIPTS:
+            sections += [
+                self.texts[script].encode("utf8"),
+                array("i", self.word_starts[script]).tobytes(),
+                array("i", self.word_offsets[script]).tobytes(),
+            ]
+        header = _HEADER.pack(
+            _NORMALIZED_MAGIC,
+            _NORMALIZED_VERSION,
+            len(_NORMALIZED_SECTIONS),
+            _BYTEORDER,
+        )
+        offset = _align(_HEADER.size + _SECTION.size * len(_NORMALIZED_SECTIONS))
+        for section in sections:
+            header += _SECTION.pack(offset, len(section))
+            offset = _align(offset + len(section))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            for section in sections:
+                f.write(bytes(_align(f.tell()) - f.tell()))
+                f.write(section)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "NormalizedQuranCorpus":
+        """Loads a corpus saved by `save`"""
+        with open(path, "rb") as f:
+            buf = memoryview(f.read())
+        magic, version, num_sections, byteorder = _HEADER.unpack_from(buf, 0)
+        if (
+            magic != _NORMALIZED_MAGIC
+            or version != _NORMALIZED_VERSION
+            or byteorder != _BYTEORDER
+            or num_sections != len(_NORMALIZED_SECTIONS)
+        ):
+            raise ValueError(f"Incompatible normalized quran corpus file: {path}")
+
+        sections: dict[str, memoryview] = {}
+        for idx, name in enumerate(_NORMALIZED_SECTIONS):
+            offset, nbytes = _SECTION.unpack_from(
+                buf, _HEADER.size + idx * _SECTION.size
+            )
+            sections[name] = buf[offset : offset + nbytes]
+        return cls(
+            texts={
+                script: str(sections[f"{script}_text"], "utf8")
+                for script in _NORMALIZED_SCRIPTS
+            },
+            word_starts={
+                script: sections[f"{script}_word_starts"].cast("i")
+                for script in _NORMALIZED_SCRIPTS
+            },
+            word_offsets={
+                script: sections[f"{script}_word_offsets"].cast("i")
+                for script in _NORMALIZED_SCRIPTS
+            },
+        )
@@ -0,0 +1,278 @@
+from dataclasses import dataclass
+
+from .utils import (
+    Aya,
+    PartOfUthmaniWord,
+    SearchItem,
+    WordSpan,
+    _check_result_item,
+    _strip_istiaatha,
+    get_normalized_corpus,
+    normalize_aya,
+    search,
+)
+from .scorers import Scorer, get_match_ratio, get_scorer
+from .sura_index import get_quran_qgram_index
+
+
+@dataclass
+class _Candidate:
+    ratio: float
+    start: int
+    end: int
+    bismillah: bool = False
+
+
+def _get_word_filter(loop_aya: Aya, window: int | None, offsets):
+    """Returns a filter of the words of the ayat
+    [loop_aya, loop_aya + window] (circular) or None for the whole Quran
+    """
+    total_ayat = loop_aya.corpus.total_ayat
+    if window is None or window + 1 >= total_ayat:
+        return None
+    first_word = offsets[loop_aya.get_abs_aya_idx() - 1]
+    end_abs = loop_aya.get_abs_aya_idx() - 1 + window + 1
+    if end_abs <= total_ayat:
+        end_word = offsets[end_abs]
+        return lambda word_idx: first_word <= word_idx < end_word
+    end_word = offsets[end_abs - total_ayat]
+    return lambda word_idx: word_idx >= first_word or word_idx < end_word
+
+
+def _has_prefix(norm_text: str, prefix: str, min_ratio: float) -> bool:
+    """Whether `norm_text` starts approximately with `prefix` followed by
+    other text
+    """
+    return len(norm_text) > len(prefix) and (
+        get_match_ratio(prefix, norm_text[: len(prefix)], min_ratio) >= min_ratio
+    )
+
+
+def fuzzy_search(
+    text: str,
+    top_k: int = 5,
+    min_ratio: float = 0.7,
+    start_aya: Aya | None = None,
+    window: int | None = None,
+    suffix=" ",
+    num_candidates: int | None = None,
+    slack_words: int | None = None,
+    scorer: Scorer | str | None = "banded",
+    q: int = 3,
+    **kwargs,
+) -> list[SearchItem]:
+    """Approximate `search`: returns the `top_k` spans of whole imlaey words
+    closest to `text` (best first) so texts with recognition errors are
+    still found
+
+    The candidate starts are proposed by the q-gram index of the whole
+    Quran (see `QGramIndex.query`) then every window of words around a
+    candidate is scored by `scorer` and the best non overlapping spans with
+    a ratio >= `min_ratio` are returned with their ratio as
+    `SearchItem.score` (1 for exact matches).
+
+    A leading istiaatha and a leading bismillah are matched approximately:
+    the istiaatha is removed from the text and spans of the first aya of a
+    sura are also tried with its bismillah.
+
+    Normalized texts shorter than `q` have no q-grams: their exact matches
+    (`search`) are returned instead with score 1.
+
+    Args:
+        text (str): the text to search with (expected with imlaey script)
+        top_k (int): the maximum number of returned items
+        min_ratio (float): the minimum match ratio (see
+            `scorers.get_match_ratio`) of the returned items
+        start_aya (Aya | None): the pivot aya of `window`. If None
+            `Aya(1, 1)` is used
+        window (int | None): only spans starting in the ayat
+            [start_aya - window // 2, start_aya + window // 2] are returned.
+            If None the whole Quran is searched
+        suffix (str): the suffix that sperate the quran words
+        num_candidates (int | None): the number of q-gram candidate starts.
+            Defaults to `2 * top_k + 3`
+        slack_words (int | None): candidate starts and lengths are tried
+            within +-`slack_words` words. Defaults to 1 + (words of text) // 4
+        scorer (Scorer | str | None): scores the windows (see
+            `scorers.get_scorer`)
+        q (int): the number of characters of the q-grams
+        kwargs: the arguments of `normalize_aya`
+
+    Returns:
+        list[SearchItem]: sorted by `score` (descending)
+    """
+    if start_aya is None:
+        start_aya = Aya(1, 1)
+    scorer = get_scorer(scorer)
+    if num_candidates is None:
+        num_candidates = 2 * top_k + 3
+
+    norm_text = normalize_aya(text, remove_spaces=True, **kwargs)
+    text_words = normalize_aya(text, remove_spaces=False, **kwargs).split()
+    norm_text, has_istiaatha = _strip_istiaatha(
+        norm_text, start_aya, suffix=suffix, **kwargs
+    )
+    if not has_istiaatha:
+        istiaatha_text = normalize_aya(start_aya.istiaatha_imlaey, **kwargs)
+        has_istiaatha = _has_prefix(norm_text, istiaatha_text, min_ratio)
+        if has_istiaatha:
+            norm_text = norm_text[len(istiaatha_text) :]
+    if norm_text == "":
+        return []
+    if len(norm_text) < q:
+        items = []
+        for item in search(
+            norm_text,
+            start_aya=start_aya,
+            window=window,
+            suffix=suffix,
+            spans_only=True,
+            **kwargs,
+        ):
+            item.has_istiaatha = has_istiaatha
+            try:
+                _check_result_item(item)
+            except PartOfUthmaniWord:
+                continue
+            items.append(item)
+            if len(items) == top_k:
+                break
+        return items
+    if has_istiaatha:
+        text_words = text_words[len(start_aya.istiaatha_imlaey.split()) :]
+    num_words = max(1, len(text_words))
+    if slack_words is None:
+        slack_words = 1 + num_words // 4
+
+    normalized = get_normalized_corpus(start_aya, **kwargs)
+    offsets = normalized.word_offsets["imlaey"]
+    word_starts = normalized.word_starts["imlaey"]
+    total_words = normalized.get_num_words()
+    index = get_quran_qgram_index(q=q, **kwargs)
+    loop_aya = start_aya if window is None else start_aya.step(-window // 2)
+    word_filter = _get_word_filter(loop_aya, window, offsets)
+
+    # (start word, number of bismillah words) -> the best candidate
+    best: dict[tuple[int, int], _Candidate] = {}
+
+    def _score(start: int, bismillah_words: list[str]):
+        """Scores the windows of `start` (with the bismillah words before)"""
+        min_end = start + max(1, num_words - len(bismillah_words) - slack_words)
+        max_end = min(
+            total_words, start + num_words - len(bismillah_words) + slack_words
+        )
+        if min_end > max_end:
+            return
+        region_starts = [0]
+        for word in bismillah_words:
+            region_starts.append(region_starts[-1] + len(word))
+        region = "".join(bismillah_words) + normalized.get_text(start, max_end)
+        region_starts += [
+            region_starts[len(bismillah_words)] + word_starts[idx] - word_starts[start]
+            for idx in range(start + 1, max_end + 1)
+        ]
+        ends = list(range(min_end, max_end + 1))
+        ratios = scorer.window_ratios(
+            norm_text,
+            region,
+            region_starts,
+            0,
+            [end - start + len(bismillah_words) for end in ends],
+            min_ratio=min_ratio,
+            text_words=text_words,
+        )
+        for ratio, end in zip(ratios, ends):
+            key = (start, len(bismillah_words))
+            if ratio >= min_ratio and (key not in best or ratio > best[key].ratio):
+                best[key] = _Candidate(
+                    ratio=ratio, start=start, end=end, bismillah=bool(bismillah_words)
+                )
+
+    starts = set()
+    for candidate in index.query(
+        norm_text,
+        top_k=num_candidates,
+        min_distance=1,
+        normalized=True,
+        word_filter=word_filter,
+    ):
+        starts.update(
+            range(
+                max(0, candidate - slack_words),
+                min(total_words, candidate + slack_words + 1),
+            )
+        )
+    for start in sorted(starts):
+        if word_filter is None or word_filter(start):
+            _score(start, [])
+
+    # a leading bismillah: trying the first ayat of the suar after it
+    corpus = start_aya.corpus
+    bismillah_words = normalized.get_aya_words(
+        corpus.get_abs_aya_idx(1, 0), "bismillah_imlaey"
+    )
+    bismillah_text = "".join(bismillah_words)
+    if _has_prefix(norm_text, bismillah_text, min_ratio):
+        for candidate in index.query(
+            norm_text[len(bismillah_text) :],
+            top_k=num_candidates,
+            min_distance=1,
+            normalized=True,
+            word_filter=word_filter,
+        ):
+            # the candidate may be shifted to the end of the former sura
+            for word_idx in {candidate, min(candidate + slack_words, total_words - 1)}:
+                abs_aya_idx = corpus.get_abs_aya_idx(
+                    index.get_cursor(word_idx).sura_idx, 0
+                )
+                start = offsets[abs_aya_idx]
+                aya_bismillah = normalized.get_aya_words(
+                    abs_aya_idx, "bismillah_imlaey"
+                )
+                if (
+                    aya_bismillah
+                    and (start, len(aya_bismillah)) not in best
+                    and abs(candidate - start) <= slack_words
+                    and (word_filter is None or word_filter(start))
+                ):
+                    _score(start, aya_bismillah)
+
+    # the best non overlapping spans
+    items: list[SearchItem] = []
+    taken: list[_Candidate] = []
+    for candidate in sorted(best.values(), key=lambda c: (-c.ratio, c.start)):
+        if len(items) == top_k:
+            break
+        if any(
+            candidate.start < other.end and other.start < candidate.end
+            for other in taken
+        ):
+            continue
+        start_cursor = index.get_cursor(candidate.start)
+        end_cursor = index.get_cursor(candidate.end - 1)
+        start_abs = corpus.get_abs_aya_idx(start_cursor.sura_idx, start_cursor.aya_idx)
+        end_abs = corpus.get_abs_aya_idx(end_cursor.sura_idx, end_cursor.aya_idx)
+        num_ayat = end_abs - start_abs + 1
+        span = WordSpan(
+            start=start_cursor.start_imlaey_word_idx,
+            end=end_cursor.start_imlaey_word_idx + 1,
+        )
+        if candidate.bismillah and num_ayat == 1:
+            # the word indices of the first aya count the bismillah words
+            span.end += len(normalized.get_aya_words(start_abs, "bismillah_imlaey"))
+        item = SearchItem(
+            start_aya=start_aya.set_new_abs(start_abs + 1),
+            num_ayat=num_ayat,
+            imlaey_word_span=span,
+            has_bismillah=candidate.bismillah,
+            has_istiaatha=has_istiaatha,
+            score=candidate.ratio,
+            suffix=suffix,
+        )
+        try:
+            _check_result_item(item)
+        except PartOfUthmaniWord:
+            continue
+        taken.append(candidate)
+        items.append(item)
+    return items
@@ -0,0 +1,350 @@
+from typing import Sequence
+
+import Levenshtein as lv
+
+from . import alphabet as alpha
+
+
+def get_max_distance(ref_len: int, min_ratio: float) -> int | None:
+    """Returns the largest Levenshtein distance whose match ratio
+    (see `get_match_ratio`) is >= `min_ratio`. None means no limit
+    """
+    if min_ratio <= 0:
+        return None
+    max_dist = int((1 - min_ratio) * ref_len)
+    # fixing floating point rounding to match `get_match_ratio` exactly
+    while max_dist < ref_len and 1 - (max_dist + 1) / ref_len >= min_ratio:
+        max_dist += 1
+    while max_dist >= 0 and 1 - max_dist / ref_len < min_ratio:
+        max_dist -= 1
+    return max_dist
+
+
+def get_match_ratio(
+    ref_text: str,
+    other_text: str,
+    min_ratio: float | None = None,
+    scorer: "Scorer | str | None" = None,
+) -> float:
+    """Returns the match ratio: 1 - (Levenshtein distance / len(ref_text))
+
+    Args:
+        min_ratio (float | None): if given the distance computation stops
+            early once the ratio is known to be < `min_ratio` and a ratio
+            < `min_ratio` (not the exact one) is returned
+        scorer (Scorer | str | None): computes the ratio instead (see
+            `get_scorer`)
+    """
+    if scorer is not None:
+        return get_scorer(scorer).ratio(ref_text, other_text, min_ratio)
+    # ratio = lv.ratio(ref_text, other_text)
+    max_dist = None
+    if min_ratio is not None:
+        max_dist = get_max_distance(len(ref_text), min_ratio)
+        # the distance is at least the length difference
+        if max_dist is not None and abs(len(ref_text) - len(other_text)) > max_dist:
+            return 1 - (min(max_dist + 1, len(ref_text)) / len(ref_text))
+    dist = lv.distance(ref_text, other_text, score_cutoff=max_dist)
+    return 1 - (min(dist, len(ref_text)) / len(ref_text))
+
+
+class Scorer(object):
+    """Computes the match ratios of a normalized text segment against
+    normalized quran text (1 is a perfect match).
+
+    Subclasses implement `ratio` and may override `window_ratios` to score
+    the windows of the same start at once
+    """
+
+    def ratio(
+        self, ref_text: str, other_text: str, min_ratio: float | None = None
+    ) -> float:
+        """Returns the match ratio of `other_text` against `ref_text`
+
+        Args:
+            min_ratio (float | None): ratios < `min_ratio` may be returned as
+                any ratio < `min_ratio`
+        """
+        raise NotImplementedError
+
+    def window_ratios(
+        self,
+        text: str,
+        region: str,
+        word_starts: Sequence[int],
+        first_word: int,
+        last_words: Sequence[int],
+        min_ratio: float = 0.0,
+        text_words: Sequence[str] | None = None,
+    ) -> list[float]:
+        """Returns the ratio of `text` against the region words
+        [first_word, last_word) for every last word of `last_words`
+
+        Args:
+            word_starts (Sequence[int]): the start of every word in `region`
+                (number of words + 1)
+            min_ratio (float): ratios < `min_ratio` may be returned as any
+                ratio < `min_ratio`
+            text_words (Sequence[str] | None): the words of `text` (needed by
+                word level scorers)
+        """
+        start = word_starts[first_word]
+        return [
+            self.ratio(text, region[start : word_starts[last]], min_ratio)
+            for last in last_words
+        ]
+
+
+class LevenshteinScorer(Scorer):
+    """Plain character Levenshtein ratio (exact for every window)"""
+
+    def ratio(
+        self, ref_text: str, other_text: str, min_ratio: float | None = None
+    ) -> float:
+        return get_match_ratio(ref_text, other_text)
+
+
+class BandedLevenshteinScorer(Scorer):
+    """Character Levenshtein ratio bounded by `min_ratio` (the default of
+    tasmeea): distances stop once the ratio is known to be < `min_ratio`
+    and windows longer than the text by more than the maximum distance are
+    not computed
+    """
+
+    def ratio(
+        self, ref_text: str, other_text: str, min_ratio: float | None = None
+    ) -> float:
+        return get_match_ratio(ref_text, other_text, min_ratio)
+
+    def window_ratios(
+        self,
+        text: str,
+        region: str,
+        word_starts: Sequence[int],
+        first_word: int,
+        last_words: Sequence[int],
+        min_ratio: float = 0.0,
+        text_words: Sequence[str] | None = None,
+    ) -> list[float]:
+        start = word_starts[first_word]
+        max_dist = get_max_distance(len(text), min_ratio)
+        ratios = []
+        for last in last_words:
+            candidate = region[start : word_starts[last]]
+            # windows only get longer
+            if max_dist is not None and len(candidate) - len(text) > max_dist:
+                too_long_ratio = 1 - (min(max_dist + 1, len(text)) / len(text))
+                return ratios + [too_long_ratio] * (len(last_words) - len(ratios))
+            ratios.append(get_match_ratio(text, candidate, min_ratio))
+        return ratios
+
+
+class TokenScorer(Scorer):
+    def __init__(self):
+        """Word level Levenshtein ratio: 1 - (word distance / number of words
+        of the text). Texts are split on spaces in `ratio` so they have to be
+        normalized without `remove_spaces`
+        """
+        # word -> a private use character
+        self._codes: dict[str, str] = {}
+
+    def _encode(self, words: Sequence[str]) -> str:
+        return "".join(
+            self._codes.setdefault(w, chr(0xF0000 + len(self._codes))) for w in words
+        )
+
+    def _word_ratio(
+        self, ref_codes: str, other_codes: str, min_ratio: float | None
+    ) -> float:
+        if len(ref_codes) == 0:
+            return 0.0
+        return get_match_ratio(ref_codes, other_codes, min_ratio)
+
+    def ratio(
+        self, ref_text: str, other_text: str, min_ratio: float | None = None
+    ) -> float:
+        return self._word_ratio(
+            self._encode(ref_text.split()), self._encode(other_text.split()), min_ratio
+        )
+
+    def window_ratios(
+        self,
+        text: str,
+        region: str,
+        word_starts: Sequence[int],
+        first_word: int,
+        last_words: Sequence[int],
+        min_ratio: float = 0.0,
+        text_words: Sequence[str] | None = None,
+    ) -> list[float]:
+        assert text_words is not None, "`TokenScorer` needs the text words"
+        if len(last_words) == 0:
+            return []
+        # the codes are planes 15 and 16 (private use)
+        if len(self._codes) > 0x1FFFD - len(text_words) - len(word_starts):
+            self._codes = {}
+        text_codes = self._encode(text_words)
+        region_codes = self._encode(
+            region[word_starts[idx] : word_starts[idx + 1]]
+            for idx in range(first_word, last_words[-1])
+        )
+        return [
+            self._word_ratio(text_codes, region_codes[: last - first_word], min_ratio)
+            for last in last_words
+        ]
+
+
+class PhoneticScorer(BandedLevenshteinScorer):
+    def __init__(self, classes: Sequence[str] | None = None):
+        """Character Levenshtein ratio (bounded by `min_ratio`) where letters
+        of close pronunciation are the same character
+
+        Args:
+            classes (Sequence[str] | None): groups of letters considered the
+                same. Defaults to the hamazat and ain, (ت ط ة), (س ص ث),
+                (ز ذ ظ), (د ض), (ه ح) and (ق ك)
+        """
+        if classes is None:
+            classes = [
+                alpha.imlaey.hamazat + "ع",
+                "تطة",
+                "سصث",
+                "زذظ",
+                "دض",
+                "هح",
+                "قك",
+            ]
+        self._table = {ord(c): group[0] for group in classes for c in group}
+        # the last region and its translation
+        self._region = ("", "")
+
+    def ratio(
+        self, ref_text: str, other_text: str, min_ratio: float | None = None
+    ) -> float:
+        return get_match_ratio(
+            ref_text.translate(self._table),
+            other_text.translate(self._table),
+            min_ratio,
+        )
+
+    def window_ratios(
+        self,
+        text: str,
+        region: str,
+        word_starts: Sequence[int],
+        first_word: int,
+        last_words: Sequence[int],
+        min_ratio: float = 0.0,
+        text_words: Sequence[str] | None = None,
+    ) -> list[float]:
+        if self._region[0] is not region:
+            self._region = (region, region.translate(self._table))
+        # the translation keeps the lengths so `word_starts` still apply
+        return super().window_ratios(
+            text.translate(self._table),
+            self._region[1],
+            word_starts,
+            first_word,
+            last_words,
+            min_ratio,
+        )
+
+
+class NumpyScorer(LevenshteinScorer):
+    def __init__(self):
+        """Vectorized `Scorer`: the edit distances of all the windows of a
+        start are computed in a single pass over `text`. Row i of the dynamic
+        program holds the distances of text[:i] to every prefix of the region
+        after the start so the last row has the distance of every window end.
+
+        It is a reference scorer (exact like "levenshtein") not a faster one:
+        a numpy call per character of `text` on short rows costs more than
+        the C distances of "banded" (about 7x slower on the tasmeea suar of
+        `benchmarks/scorer_benchmark.py`)
+
+        Characters are encoded as uint8 codes (`alphabet.imlaey` first).
+        Needs numpy: `pip install quran-transcript[numpy]`
+        """
+        # imported here so `import quran_transcript` does not load numpy
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                "`NumpyScorer` needs numpy: `pip install quran-transcript[numpy]`"
+            )
+        self._np = numpy
+        self._table = {
+            ord(c): idx for idx, c in enumerate(alpha.imlaey.alphabet, start=1)
+        }
+        # the last encoded region and text
+        self._encoded: dict[str, tuple[str, "numpy.ndarray"]] = {}
+
+    def _encode(self, key: str, text: str) -> "numpy.ndarray":
+        np = self._np
+        if key in self._encoded and self._encoded[key][0] is text:
+            return self._encoded[key][1]
+        for c in set(text):
+            if ord(c) not in self._table:
+                assert len(self._table) < 255, "too many characters"
+                self._table[ord(c)] = len(self._table) + 1
+        codes = np.frombuffer(
+            text.translate(self._table).encode("latin-1"), dtype=np.uint8
+        )
+        self._encoded[key] = (text, codes)
+        return codes
+
+    def window_ratios(
+        self,
+        text: str,
+        region: str,
+        word_starts: Sequence[int],
+        first_word: int,
+        last_words: Sequence[int],
+        min_ratio: float = 0.0,
+        text_words: Sequence[str] | None = None,
+    ) -> list[float]:
+        if len(last_words) == 0:
+            return []
+        np = self._np
+        text_codes = self._encode("text", text)
+        start = word_starts[first_word]
+        windows = self._encode("region", region)[
+            start : word_starts[last_words[-1]]
+        ]
+        cols = np.arange(len(windows) + 1, dtype=np.int32)
+        row = cols
+        new_row = np.empty_like(cols)
+        for idx, code in enumerate(text_codes, start=1):
+            # substitution (or match) and deletion
+            np.minimum(row[:-1] + (windows != code), row[1:] + 1, out=new_row[1:])
+            new_row[0] = idx
+            # insertion: new_row[j] = min(new_row[k] + j - k) for k <= j
+            row = np.minimum.accumulate(new_row - cols) + cols
+        ends = np.fromiter((word_starts[last] - start for last in last_words), int)
+        dists = np.minimum(row[ends], len(text))
+        return (1 - dists / len(text)).tolist()
+
+
+SCORERS: dict[str, type[Scorer]] = {
+    "levenshtein": LevenshteinScorer,
+    "banded": BandedLevenshteinScorer,
+    "token": TokenScorer,
+    "phonetic": PhoneticScorer,
+    "numpy": NumpyScorer,
+}
+# name -> the scorer shared by the calls using the name
+_named_scorers: dict[str, Scorer] = {}
+
+
+def get_scorer(scorer: Scorer | str | None) -> Scorer | None:
+    """Returns the scorer of a name of `SCORERS` (created once), the scorer
+    itself or None
+    """
+    if not isinstance(scorer, str):
+        return scorer
+    assert scorer in SCORERS, (
+        f"Unknown scorer: `{scorer}`. Available: {list(SCORERS)}"
+    )
+    if scorer not in _named_scorers:
+        _named_scorers[scorer] = SCORERS[scorer]()
+    return _named_scorers[scorer]
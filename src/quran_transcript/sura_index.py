@@ -0,0 +1,193 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from typing import Callable
+
+from .utils import Aya, AyaCursor, get_normalized_corpus, normalize_aya
+
+# `QGramIndex.query` votes with the rarest q-grams of the text up to this
+# number of postings. The starts with the most votes (`_RESCORED_PER_START`
+# per returned start) then get the exact votes of the other (frequent) ones
+_MAX_VOTES = 1000
+_RESCORED_PER_START = 10
+
+
+class QGramIndex(object):
+    def __init__(self, start_aya: Aya, num_ayat: int, q: int = 3, **kwargs):
+        """Inverted index of the character q-grams of the normalized imlaey
+        script of consecutive ayat (without bismillah) used to propose where
+        a text segment starts
+
+        Args:
+            start_aya (Aya): the first aya of the index
+            num_ayat (int): the number of indexed ayat
+            q (int): the number of characters of every gram
+            kwargs: the arguments of `normalize_aya`
+
+        Words are indexed from 0 (the first word of `start_aya`)
+        """
+        assert q >= 1
+        self.q = q
+        self.kwargs = kwargs
+        self._start_aya = start_aya
+        self.start_abs_aya_idx = start_aya.get_abs_aya_idx()
+        self.num_ayat = num_ayat
+
+        normalized = get_normalized_corpus(start_aya, **kwargs)
+        offsets = normalized.word_offsets["imlaey"]
+        first_word = offsets[self.start_abs_aya_idx - 1]
+        end_word = offsets[self.start_abs_aya_idx - 1 + num_ayat]
+        # the word index of the first word of every aya
+        self.aya_word_starts = [
+            offsets[self.start_abs_aya_idx - 1 + idx] - first_word
+            for idx in range(num_ayat + 1)
+        ]
+        self.num_words = end_word - first_word
+
+        # the word index of every character of the normalized text and the
+        # character index of every word (and of the end of the text)
+        word_starts = normalized.word_starts["imlaey"]
+        self.char_to_word: list[int] = []
+        self.word_chars: list[int] = []
+        for word_idx in range(self.num_words):
+            word_len = (
+                word_starts[first_word + word_idx + 1]
+                - word_starts[first_word + word_idx]
+            )
+            self.word_chars.append(len(self.char_to_word))
+            self.char_to_word += [word_idx] * word_len
+        self.word_chars.append(len(self.char_to_word))
+
+        text = normalized.get_text(first_word, end_word)
+        # q-gram -> the character positions it starts at
+        self.postings: dict[str, list[int]] = {}
+        for pos in range(len(text) - q + 1):
+            self.postings.setdefault(text[pos : pos + q], []).append(pos)
+
+    def query(
+        self,
+        text: str,
+        top_k: int = 5,
+        min_distance=3,
+        normalized=False,
+        word_filter: Callable[[int], bool] | None = None,
+    ) -> list[int]:
+        """Returns the word indices of the `top_k` most probable starts of
+        `text` (most probable first)
+
+        Every q-gram of `text` found in the index votes for the word where
+        `text` would start if that q-gram is aligned. Only the rarest q-grams
+        vote for every word (see `_MAX_VOTES`): the frequent ones are counted
+        for the best starts only.
+
+        Args:
+            min_distance (int): the minimum number of words between two
+                returned starts
+            normalized (bool): whether `text` is already normalized
+            word_filter (Callable[[int], bool] | None): only the starts it
+                accepts are returned
+        """
+        norm_text = text if normalized else normalize_aya(text, **self.kwargs)
+        num_chars = len(self.char_to_word)
+        # (number of postings, offset in `norm_text`, postings)
+        grams = []
+        for offset in range(len(norm_text) - self.q + 1):
+            postings = self.postings.get(norm_text[offset : offset + self.q])
+            if postings:
+                grams.append((len(postings), offset, postings))
+        grams.sort(key=lambda gram: gram[0])
+
+        votes = Counter()
+        num_votes = 0
+        frequent_grams = []
+        for num_postings, offset, postings in grams:
+            if votes and num_votes + num_postings > _MAX_VOTES:
+                frequent_grams.append((offset, postings))
+                continue
+            num_votes += num_postings
+            for pos in postings:
+                start = min(max(pos - offset, 0), num_chars - 1)
+                votes[self.char_to_word[start]] += 1
+
+        candidates = [
+            word_idx
+            for word_idx, _ in votes.most_common()
+            if word_filter is None or word_filter(word_idx)
+        ]
+        if frequent_grams:
+            candidates = candidates[: _RESCORED_PER_START * top_k]
+            for word_idx in candidates:
+                start, end = self.word_chars[word_idx], self.word_chars[word_idx + 1]
+                for offset, postings in frequent_grams:
+                    votes[word_idx] += bisect_left(
+                        postings, end + offset
+                    ) - bisect_left(postings, start + offset)
+            candidates.sort(key=lambda word_idx: votes[word_idx], reverse=True)
+
+        starts: list[int] = []
+        for word_idx in candidates:
+            if len(starts) == top_k:
+                break
+            if all(abs(word_idx - s) >= min_distance for s in starts):
+                starts.append(word_idx)
+        return starts
+
+    def get_word_idx(self, cursor: AyaCursor) -> int | None:
+        """Returns the word index of an aya position or None if the position
+        is not in the index
+        """
+        aya = self._start_aya.set_new(cursor.sura_idx + 1, cursor.aya_idx + 1)
+        idx = aya.get_abs_aya_idx() - self.start_abs_aya_idx
+        if idx < 0 or idx >= self.num_ayat:
+            return None
+        return self.aya_word_starts[idx] + cursor.start_imlaey_word_idx
+
+    def get_cursor(self, word_idx: int) -> AyaCursor:
+        """Returns the aya position of a word index"""
+        assert word_idx >= 0 and word_idx < self.num_words
+        idx = bisect_right(self.aya_word_starts, word_idx) - 1
+        aya = self._start_aya.set_new_abs(self.start_abs_aya_idx + idx)
+        return AyaCursor(
+            sura_idx=aya.sura_idx,
+            aya_idx=aya.aya_idx,
+            start_imlaey_word_idx=word_idx - self.aya_word_starts[idx],
+        )
+
+
+class SuraQGramIndex(QGramIndex):
+    def __init__(self, sura_idx: int, q: int = 3, **kwargs):
+        """`QGramIndex` of a sura
+
+        Args:
+            sura_idx (int): the index of the sura starting from 1
+        """
+        self.sura_idx = sura_idx
+        aya = Aya(sura_idx=sura_idx)
+        super().__init__(aya, num_ayat=aya.get().num_ayat_in_sura, q=q, **kwargs)
+
+
+class QuranQGramIndex(QGramIndex):
+    def __init__(self, q: int = 3, **kwargs):
+        """`QGramIndex` of the whole Quran"""
+        aya = Aya(1, 1)
+        super().__init__(aya, num_ayat=aya.corpus.total_ayat, q=q, **kwargs)
+
+
+@lru_cache(maxsize=16)
+def _get_sura_qgram_index(sura_idx: int, q: int, kwargs_items: tuple) -> SuraQGramIndex:
+    return SuraQGramIndex(sura_idx, q=q, **dict(kwargs_items))
+
+
+def get_sura_qgram_index(sura_idx: int, q: int = 3, **kwargs) -> SuraQGramIndex:
+    """Returns the `SuraQGramIndex` of the sura (built once per process)"""
+    return _get_sura_qgram_index(sura_idx, q, tuple(sorted(kwargs.items())))
+
+
+@lru_cache(maxsize=4)
+def _get_quran_qgram_index(q: int, kwargs_items: tuple) -> QuranQGramIndex:
+    return QuranQGramIndex(q=q, **dict(kwargs_items))
+
+
+def get_quran_qgram_index(q: int = 3, **kwargs) -> QuranQGramIndex:
+    """Returns the `QuranQGramIndex` (built once per process)"""
+    return _get_quran_qgram_index(q, tuple(sorted(kwargs.items())))
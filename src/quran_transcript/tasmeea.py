@@ -1,11 +1,22 @@
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
+from functools import lru_cache, partial
+import inspect
 import math
 import logging
 from typing import Optional
 
-import Levenshtein as lv
-
-from .utils import normalize_aya, Aya, SegmentScripts, QuranWordIndex, PartOfUthmaniWord
+from .utils import (
+    normalize_aya,
+    Aya,
+    AyaCursor,
+    SegmentScripts,
+    QuranWordIndex,
+    PartOfUthmaniWord,
+)
+from .scorers import Scorer, get_match_ratio, get_max_distance, get_scorer
+from .sura_index import QGramIndex, get_quran_qgram_index, get_sura_qgram_index
 
 
 def estimate_window_len(text: str, winodw_words: int) -> tuple[int, int]:
@@ -29,90 +40,317 @@ class BestSegment:
     bisimillah: bool = False
 
 
-def get_match_ratio(ref_text: str, other_text: str) -> float:
-    # ratio = lv.ratio(ref_text, other_text)
-    return 1 - (min(lv.distance(ref_text, other_text), len(ref_text)) / len(ref_text))
+def _score_candidate(
+    best: BestSegment, norm_text: str, candidate: str, start: int
+) -> tuple[float, bool, bool]:
+    """Returns (match ratio, whether the candidate beats the best segment,
+    whether longer windows of the same start can not beat the best segment)
+    """
+    # the distance is at least the length difference and windows only
+    # get longer so we can stop the window loop
+    max_dist = get_max_distance(len(norm_text), best.ratio)
+    too_long = max_dist is not None and len(candidate) - len(norm_text) > max_dist
+    match_ratio = get_match_ratio(norm_text, candidate, min_ratio=best.ratio)
+    return match_ratio, _is_better(best, match_ratio, start), too_long
 
 
-def tasmeea_sura(
-    text_segments: list[str],
-    sura_idx: int,
-    pivot_list: Optional[list[str] | None] = None,
-    overlap_words: int = 6,
-    window_words=30,
-    acceptance_ratio: float = 0.5,
-    include_istiaatha=True,
-    include_bismillah=True,
-    include_sadaka=True,
+def _is_better(best: BestSegment, match_ratio: float, start: int) -> bool:
+    return (match_ratio > best.ratio) or (
+        match_ratio == best.ratio and abs(start) < abs(best.start)
+    )
+
+
+def _check_segment(
+    best: BestSegment,
+    aya: Aya,
+    norm_text: str,
+    start: int,
+    window: int,
+    istiaatha=False,
+    bismillah=False,
+    sadaka=False,
+    scorer: Scorer | None = None,
+    text_words: list[str] | None = None,
     **kwargs,
-) -> list[tuple[SegmentScripts | None, float]]:
-    """Returns the best matching quracic script for every text part
+) -> BestSegment | None:
+    try:
+        segment_scripts = aya.get_by_imlaey_words(
+            start=start,
+            window=window,
+            include_istiaatha=istiaatha,
+            include_bismillah=bismillah,
+            include_sadaka=sadaka,
+        )
+        if scorer is None:
+            aya_imalaey_str = normalize_aya(segment_scripts.imalaey, **kwargs)
+            match_ratio, is_better, _ = _score_candidate(
+                best, norm_text, aya_imalaey_str, start
+            )
+        else:
+            words = [normalize_aya(w, **kwargs) for w in segment_scripts.imalaey.split()]
+            word_starts = [0]
+            for word in words:
+                word_starts.append(word_starts[-1] + len(word))
+            match_ratio = scorer.window_ratios(
+                norm_text,
+                "".join(words),
+                word_starts,
+                0,
+                [len(words)],
+                min_ratio=best.ratio,
+                text_words=text_words,
+            )[0]
+            is_better = _is_better(best, match_ratio, start)
+        if is_better:
+            best.segment_scripts = segment_scripts
+            best.ratio = match_ratio
+            best.bisimillah = bismillah
+            if istiaatha or sadaka:
+                best.window = 0
+                best.start = 0
+            else:
+                best.window = window
+                best.start = start
+            return best
+        else:
+            return None
+    except PartOfUthmaniWord:
+        return None
 
-    Args:
-        pivot_list (list[str] | None): A list where each element is either "pivot" or an empty string "".
-            "pivot" indicates that the corresponding item is the first segment when the text is split into multiple parts.
-            An empty string ("") means the item is not the first segment.
-            This helps identify which segments are the starting points in a split text.
 
+_NORMALIZE_ARGS = set(inspect.signature(normalize_aya).parameters) - {"text"}
 
-        Note:
-            - We only support Istiaatha to be spearate segment not connected to other ayat or bismillah
-            - We only support Sadaka to be spearate segment not connected to other ayat or bismillah
+
+@lru_cache(maxsize=None)
+def _normalize_word(word: str, kwargs_items: tuple) -> str:
+    """`normalize_aya` of a single quran word (memoized per process)"""
+    return normalize_aya(word, **dict(kwargs_items))
+
+
+def _get_normalized_region(
+    aya: Aya, start: int, num_words: int, include_bismillah=False, **kwargs
+) -> tuple[str, list[int], list[bool]]:
+    """Normalizes the imlaey words of a region once so that every window of it
+    is a slice
+
+    Returns:
+        (normalized region text, the start of every word in the normalized
+        text (`num_words` + 1), `can_split` see `Aya._get_imlaey_words_region`)
     """
+    region_words, can_split = aya._get_imlaey_words_region(
+        start=start,
+        num_words=num_words,
+        include_bismillah=include_bismillah,
+    )
+    kwargs_items = tuple(sorted(kwargs.items()))
+    norm_region_words = [_normalize_word(w, kwargs_items) for w in region_words]
+    # the start of every word in the normalized region
+    norm_word_starts = [0]
+    for norm_word in norm_region_words:
+        norm_word_starts.append(norm_word_starts[-1] + len(norm_word))
+    return "".join(norm_region_words), norm_word_starts, can_split
+
+
+def _scan_windows(
+    best: BestSegment,
+    aya: Aya,
+    norm_text: str,
+    start: int,
+    end: int,
+    min_window: int,
+    max_window: int,
+    bismillah=False,
+    scorer: Scorer | None = None,
+    text_words: list[str] | None = None,
+    **kwargs,
+) -> bool:
+    """Checks the windows of sizes [min_window, max_window] starting from
+    [start, end) words relative to `aya` and updates `best` (without its
+    `segment_scripts`)
 
-    def _check_segment(
-        _best: BestSegment,
-        _aya,
-        _norm_text: str,
-        _start,
-        _window,
-        _istiaatha=False,
-        _bismillah=False,
-        _sadaka=False,
-    ) -> BestSegment | None:
-        try:
-            segment_scripts = _aya.get_by_imlaey_words(
-                start=_start,
-                window=_window,
-                include_istiaatha=_istiaatha,
-                include_bismillah=_bismillah,
-                include_sadaka=_sadaka,
+    Args:
+        scorer (Scorer | None): scores all the windows of a start at once.
+            None means one bounded Levenshtein distance per window
+        text_words (list[str] | None): the normalized words of `norm_text`
+            for `scorer`
+
+    Returns:
+        True if `best` is updated
+    """
+    # The candidate region is normalized once: every (start, window)
+    # candidate is a slice of it
+    norm_region, norm_word_starts, can_split = _get_normalized_region(
+        aya,
+        start=start,
+        num_words=end - start + max_window,
+        include_bismillah=bismillah,
+        **kwargs,
+    )
+    updated = False
+    windows = range(min_window, max_window + 1)
+    for loop_start in range(start, end):
+        first_word = loop_start - start
+        if scorer is not None:
+            ratios = scorer.window_ratios(
+                norm_text,
+                norm_region,
+                norm_word_starts,
+                first_word,
+                [first_word + window for window in windows],
+                min_ratio=best.ratio,
+                text_words=text_words,
             )
-            aya_imalaey_str = normalize_aya(segment_scripts.imalaey, **kwargs)
-            match_ratio = get_match_ratio(_norm_text, aya_imalaey_str)
-            if (match_ratio > _best.ratio) or (
-                match_ratio == _best.ratio and abs(_start) < abs(_best.start)
-            ):
-                _best.segment_scripts = segment_scripts
-                _best.ratio = match_ratio
-                _best.bisimillah = _bismillah
-                if _istiaatha or _sadaka:
-                    _best.window = 0
-                    _best.start = 0
-                else:
-                    _best.window = _window
-                    _best.start = _start
-                return _best
+        # looping over all available windows
+        for window_idx, loop_window_len in enumerate(windows):
+            last_word = first_word + loop_window_len
+            if scorer is None:
+                match_ratio, is_better, too_long = _score_candidate(
+                    best,
+                    norm_text,
+                    norm_region[
+                        norm_word_starts[first_word] : norm_word_starts[last_word]
+                    ],
+                    loop_start,
+                )
             else:
-                return None
-        except PartOfUthmaniWord:
-            return None
+                match_ratio, too_long = ratios[window_idx], False
+                is_better = _is_better(best, match_ratio, loop_start)
+            # segments can not start or end inside uthmani words
+            if is_better and can_split[first_word] and can_split[last_word]:
+                updated = True
+                best.ratio = match_ratio
+                best.bisimillah = bismillah
+                best.window = loop_window_len
+                best.start = loop_start
+            if too_long:
+                break
+    return updated
 
-    assert overlap_words >= 0
-    if pivot_list is None:
-        pivot_list = ["pivot"] * len(text_segments)
 
-    kwargs["remove_spaces"] = True
-    kwargs["remove_tashkeel"] = True
-    aya = Aya(
-        sura_idx=sura_idx,
-    )
-    last_aya = aya.step(aya.get().num_ayat_in_sura - 1)
-    outputs = []
-    prev_norm_text = None
-    penalty = 0
-    for idx, text_seg in enumerate(text_segments):
+def _get_index_start_ranges(
+    qgram_index: QGramIndex,
+    aya: Aya,
+    norm_text: str,
+    start_words: int,
+    end_words: int,
+    top_k: int = 5,
+    reanchor=False,
+    slack_words: int = 3,
+) -> list[tuple[int, int]]:
+    """Returns the sorted and disjoint [start, end) start ranges (relative to
+    `aya`) near the starts proposed by the index
+
+    Args:
+        reanchor (bool): if True the proposed starts may be out of
+            [start_words, end_words) which is kept as well
+    """
+    aya_word_idx = qgram_index.get_word_idx(aya.cursor)
+    if aya_word_idx is None:
+        return [(start_words, end_words)]
+
+    # the expected start (right after the previous segment) is always checked
+    # with the whole back overlap as the proposed starts can be other places
+    # of repeated verses
+    ranges = [(start_words, min(slack_words + 1, end_words))]
+    for word_idx in qgram_index.query(norm_text, top_k=top_k, normalized=True):
+        start = word_idx - aya_word_idx - slack_words
+        end = word_idx - aya_word_idx + slack_words + 1
+        if not reanchor:
+            start, end = max(start, start_words), min(end, end_words)
+        if start < end:
+            ranges.append((start, end))
+    if reanchor:
+        ranges.append((start_words, end_words))
+
+    merged = []
+    for start, end in sorted(r for r in ranges if r[0] < r[1]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class TasmeeaSession(object):
+    def __init__(
+        self,
+        sura_idx: int,
+        overlap_words: int = 6,
+        window_words=30,
+        acceptance_ratio: float = 0.5,
+        include_istiaatha=True,
+        include_bismillah=True,
+        include_sadaka=True,
+        use_qgram_index=False,
+        qgram_top_k: int = 5,
+        scorer: Scorer | str | None = None,
+        **kwargs,
+    ):
+        """Incremental `tasmeea_sura`: text segments of a live recitation are
+        pushed one at a time and matched right away.
+
+        Only the position after the last segment is kept (not the segments or
+        the outputs) so every push costs the same whatever the session length
+
+        Args:
+            sura_idx (int): the index of the sura starting from 1
+            kwargs: see `tasmeea_sura`
+
+        Example:
+            session = TasmeeaSession(sura_idx=1)
+            for text in asr_segments:
+                segment_scripts, ratio = session.push(text)
+        """
+        assert overlap_words >= 0
+        kwargs["remove_spaces"] = True
+        kwargs["remove_tashkeel"] = True
+        self.overlap_words = overlap_words
+        self.window_words = window_words
+        self.acceptance_ratio = acceptance_ratio
+        self.include_istiaatha = include_istiaatha
+        self.include_bismillah = include_bismillah
+        self.include_sadaka = include_sadaka
+        self.qgram_top_k = qgram_top_k
+        self.scorer = get_scorer(scorer)
+        self.kwargs = kwargs
+
+        # the position to match the next segment from
+        self.aya = Aya(sura_idx=sura_idx)
+        # the index of the next segment
+        self.idx = 0
+        self.penalty = 0
+        # the sura of the last matched segment (for sadaka)
+        self.sura_idx = sura_idx
+        self._first_failed = False
+        self._lock = asyncio.Lock()
+
+        self.qgram_index = None
+        if use_qgram_index:
+            self.qgram_index = get_sura_qgram_index(sura_idx, **kwargs)
+
+    def push(
+        self, text_seg: str, is_last=False
+    ) -> tuple[SegmentScripts | None, float]:
+        """Matches the next text segment
+
+        Args:
+            is_last (bool): whether it is the last segment of the recitation
+                (sadaka is only checked at the last segment)
+
+        Returns:
+            (the matched `SegmentScripts` or None if not accepted, ratio)
+        """
+        kwargs = self.kwargs
+        aya = self.aya
+        idx = self.idx
+        penalty = self.penalty
+        overlap_words = self.overlap_words
+        window_words = self.window_words
+
         norm_text = normalize_aya(text_seg, **kwargs)
+        text_words = None
+        if self.scorer is not None:
+            text_words = [normalize_aya(w, **kwargs) for w in text_seg.split()]
         min_winodw_len, max_windwo_len = estimate_window_len(norm_text, window_words)
         # overlap_len = estimate_overlap(norm_text, prev_norm_text, overlap_words)
         overlap_len = overlap_words
@@ -135,92 +373,859 @@ def tasmeea_sura(
         )
         if len(norm_text) > 0:
             # istiaatha at the first
-            if idx == 0 and include_istiaatha:
+            if idx == 0 and self.include_istiaatha:
                 out = _check_segment(
-                    _best=best,
-                    _aya=aya,
-                    _norm_text=norm_text,
-                    _start=0,
-                    _window=5,
-                    _istiaatha=True,
-                    _bismillah=False,
-                    _sadaka=False,
+                    best=best,
+                    aya=aya,
+                    norm_text=norm_text,
+                    start=0,
+                    window=5,
+                    istiaatha=True,
+                    bismillah=False,
+                    sadaka=False,
+                    scorer=self.scorer,
+                    text_words=text_words,
+                    **kwargs,
                 )
                 if out:
                     best = out
             # sadaka only at the last aya
-            elif (idx + 1) == len(text_segments) and include_sadaka:
+            elif is_last and self.include_sadaka:
+                last_aya = Aya(sura_idx=self.sura_idx)
+                last_aya = last_aya.step(last_aya.get().num_ayat_in_sura - 1)
                 sadaka_start = (
                     len(last_aya.get().imlaey_words)
                     - last_aya.get_start_imlaey_word_idx()
                 )
                 out = _check_segment(
-                    _best=best,
-                    _aya=last_aya,
-                    _norm_text=norm_text,
-                    _start=sadaka_start,
-                    _window=3,
-                    _istiaatha=False,
-                    _bismillah=False,
-                    _sadaka=True,
+                    best=best,
+                    aya=last_aya,
+                    norm_text=norm_text,
+                    start=sadaka_start,
+                    window=3,
+                    istiaatha=False,
+                    bismillah=False,
+                    sadaka=True,
+                    scorer=self.scorer,
+                    text_words=text_words,
+                    **kwargs,
                 )
                 if out:
                     best = out
 
+            bismillah = (
+                aya.get().sura_idx not in {1, 9}
+                and self.include_bismillah
+                and aya.get().aya_idx == 1
+            ) or (idx == 1 and self._first_failed)
+
+            start_ranges = [(start_words, end_words)]
+            if self.qgram_index is not None and not bismillah:
+                start_ranges = _get_index_start_ranges(
+                    self.qgram_index,
+                    aya,
+                    norm_text,
+                    start_words=start_words,
+                    end_words=end_words,
+                    top_k=self.qgram_top_k,
+                    reanchor=penalty > 0,
+                )
+
             # Initializing step words with min_window_len if not acceptable match
-            for loop_start in range(start_words, end_words):
-                # looping over all available windows
-                bismillah = (
-                    aya.get().sura_idx not in {1, 9}
-                    and include_bismillah
-                    and aya.get().aya_idx == 1
-                ) or (idx == 1 and outputs[0][0] is None)
-
-                for loop_window_len in range(min_winodw_len, max_windwo_len + 1):
-                    out = _check_segment(
-                        _best=best,
-                        _aya=aya,
-                        _norm_text=norm_text,
-                        _start=loop_start,
-                        _window=loop_window_len,
-                        _istiaatha=False,
-                        _bismillah=bismillah,
-                        _sadaka=False,
+            best_window_found = False
+            for range_start, range_end in start_ranges:
+                best_window_found = (
+                    _scan_windows(
+                        best,
+                        aya,
+                        norm_text,
+                        start=range_start,
+                        end=range_end,
+                        min_window=min_winodw_len,
+                        max_window=max_windwo_len,
+                        bismillah=bismillah,
+                        scorer=self.scorer,
+                        text_words=text_words,
+                        **kwargs,
                     )
-                    if out:
-                        best = out
+                    or best_window_found
+                )
+
+            # building the scripts of the best window only
+            if best_window_found:
+                best.segment_scripts = aya.get_by_imlaey_words(
+                    start=best.start,
+                    window=best.window,
+                    include_bismillah=bismillah,
+                )
 
             # reset penalities for the next loop
             penalty = 0
 
-        if best.segment_scripts is None:
+        if best.segment_scripts is None or best.ratio < self.acceptance_ratio:
             penalty = max_windwo_len
-            outputs.append((None, best.ratio))
-            aya = aya.step_by_imlaey_words(
-                start=-overlap_len,
-                window=int((min_winodw_len + max_windwo_len) / 2),
-                include_bismillah=False,
-            )
-        elif best.ratio < acceptance_ratio:
-            penalty = max_windwo_len
-            outputs.append((None, best.ratio))
+            output = (None, best.ratio)
             aya = aya.step_by_imlaey_words(
                 start=-overlap_len,
                 window=int((min_winodw_len + max_windwo_len) / 2),
                 include_bismillah=False,
             )
         else:
-            outputs.append((best.segment_scripts, best.ratio))
+            output = (best.segment_scripts, best.ratio)
+            if best.segment_scripts.start_span is not None:
+                self.sura_idx = best.segment_scripts.start_span[0]
             aya = aya.step_by_imlaey_words(
                 start=best.start,
                 window=best.window,
                 include_bismillah=best.bisimillah,
             )
 
-        # some text segments are spaned accorss multiple items
-        # the pivot is the fistt item may be the logest one
-        if pivot_list[idx] == "pivot":
-            prev_norm_text = norm_text
+        if idx == 0:
+            self._first_failed = output[0] is None
+        self.aya = aya
+        self.idx = idx + 1
+        self.penalty = penalty
+        return output
+
+    async def apush(
+        self, text_seg: str, is_last=False
+    ) -> tuple[SegmentScripts | None, float]:
+        """asyncio variant of `push`: the segment is matched in the default
+        executor (not blocking the event loop) and concurrent pushes are
+        matched in the order they are awaited
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, partial(self.push, text_seg, is_last=is_last)
+            )
+
+
+def _tasmeea_chain(
+    text_segments: list[str],
+    aya: Aya,
+    first_idx: int,
+    num_segments: int,
+    penalty: int = 0,
+    **kwargs,
+) -> tuple[list[tuple[SegmentScripts | None, float]], Aya, int]:
+    """Matches the `text_segments` one after another starting from `aya`
+
+    Args:
+        first_idx (int): the index of the first of `text_segments` in all the
+            segments of the sura
+        num_segments (int): the number of all the segments of the sura
+        kwargs: the arguments of `TasmeeaSession`
+
+    Returns:
+        (outputs, the aya to start the next segment from, the penalty of the
+        next segment)
+    """
+    session = TasmeeaSession(aya.get().sura_idx, **kwargs)
+    session.aya = aya
+    session.idx = first_idx
+    session.penalty = penalty
+    outputs = [
+        session.push(text_seg, is_last=(idx + 1) == num_segments)
+        for idx, text_seg in enumerate(text_segments, start=first_idx)
+    ]
+    return outputs, session.aya, session.penalty
+
+
+def _locate_in_sura(
+    text: str,
+    sura_idx: int,
+    acceptance_ratio: float = 0.5,
+    window_words=30,
+    **kwargs,
+) -> AyaCursor | None:
+    """Coarse localization of `text` in the whole sura
+
+    Returns:
+        the position right after the best matching window of `text` (where
+        `_tasmeea_chain` continues after matching `text`) or None if no
+        window is accepted
+    """
+    aya = Aya(sura_idx=sura_idx)
+    norm_text = normalize_aya(text, **kwargs)
+    if len(norm_text) == 0:
+        return None
+    min_window_len, max_window_len = estimate_window_len(norm_text, window_words)
+    num_sura_words = sum(
+        len(a._encode_imlaey_to_uthmani().imlaey_words)
+        for a in aya.get_ayat_after(num_ayat=aya.get().num_ayat_in_sura)
+    )
+    norm_region, norm_word_starts, can_split = _get_normalized_region(
+        aya, start=0, num_words=num_sura_words + max_window_len, **kwargs
+    )
+    best = BestSegment(start=0, window=min_window_len)
+    for start in range(num_sura_words):
+        if not can_split[start]:
+            continue
+        for window in range(min_window_len, max_window_len + 1):
+            match_ratio, is_better, too_long = _score_candidate(
+                best,
+                norm_text,
+                norm_region[norm_word_starts[start] : norm_word_starts[start + window]],
+                start,
+            )
+            if is_better and can_split[start + window]:
+                best.ratio = match_ratio
+                best.start = start
+                best.window = window
+            if too_long:
+                break
+
+    if best.ratio < acceptance_ratio:
+        return None
+    return aya.step_by_imlaey_words(start=best.start, window=best.window).cursor
+
+
+def _locate_in_quran(
+    text: str,
+    top_k: int = 5,
+    acceptance_ratio: float = 0.5,
+    window_words=30,
+    slack_words: int = 3,
+    scorer: Scorer | None = None,
+    **kwargs,
+) -> AyaCursor | None:
+    """Localization of `text` in the whole Quran: only the windows near the
+    `top_k` starts proposed by the `QuranQGramIndex` are checked (scored by
+    `scorer`, see `_scan_windows`)
+
+    Returns:
+        the start of the best matching window of `text` or None if no window
+        is accepted
+    """
+    norm_text = normalize_aya(text, **kwargs)
+    if len(norm_text) == 0:
+        return None
+    qgram_index = get_quran_qgram_index(**kwargs)
+    min_window_len, max_window_len = estimate_window_len(norm_text, window_words)
+    text_words = None
+    if scorer is not None:
+        text_words = [normalize_aya(w, **kwargs) for w in text.split()]
+    best_ratio = 0.0
+    best_cursor = None
+    for word_idx in qgram_index.query(norm_text, top_k=top_k, normalized=True):
+        aya = _aya_from_cursor(qgram_index.get_cursor(word_idx))
+        best = BestSegment(start=0, window=min_window_len)
+        found = _scan_windows(
+            best,
+            aya,
+            norm_text,
+            start=-slack_words,
+            end=slack_words + 1,
+            min_window=min_window_len,
+            max_window=max_window_len,
+            scorer=scorer,
+            text_words=text_words,
+            **kwargs,
+        )
+        if found and best.ratio > best_ratio:
+            best_ratio = best.ratio
+            best_cursor = aya.step_by_imlaey_words(start=best.start, window=0).cursor
+
+    if best_ratio < acceptance_ratio:
+        return None
+    return best_cursor
+
+
+def _aya_from_cursor(cursor: AyaCursor) -> Aya:
+    return Aya(
+        sura_idx=cursor.sura_idx + 1,
+        aya_idx=cursor.aya_idx + 1,
+        start_imlaey_word_idx=cursor.start_imlaey_word_idx,
+    )
+
+
+def _tasmeea_chunk(
+    anchor_text: str,
+    text_segments: list[str],
+    sura_idx: int,
+    first_idx: int,
+    num_segments: int,
+    chain_kwargs: dict,
+    kwargs: dict,
+) -> tuple[AyaCursor, list[tuple[SegmentScripts | None, float]], AyaCursor, int] | None:
+    """Process pool job: anchors the chunk after `anchor_text` (the end of
+    the segments before the chunk) then matches the chunk segments
+
+    Returns:
+        (anchor, outputs, the position after the chunk, the penalty after
+        the chunk) or None if the chunk can not be anchored
+    """
+    if first_idx == 0:
+        anchor = Aya(sura_idx=sura_idx).cursor
+    else:
+        anchor = _locate_in_sura(
+            anchor_text,
+            sura_idx,
+            acceptance_ratio=chain_kwargs["acceptance_ratio"],
+            window_words=chain_kwargs["window_words"],
+            **kwargs,
+        )
+        if anchor is None:
+            return None
+    outputs, aya, penalty = _tasmeea_chain(
+        text_segments,
+        _aya_from_cursor(anchor),
+        first_idx=first_idx,
+        num_segments=num_segments,
+        **chain_kwargs,
+        **kwargs,
+    )
+    return anchor, outputs, aya.cursor, penalty
+
+
+def _tasmeea_sura_dp(
+    text_segments: list[str],
+    sura_idx: int,
+    overlap_words: int = 6,
+    window_words=30,
+    acceptance_ratio: float = 0.5,
+    include_istiaatha=True,
+    include_bismillah=True,
+    include_sadaka=True,
+    band_words: int | None = None,
+    gap_penalty: float = 0.01,
+    scorer: Scorer | str | None = None,
+    **kwargs,
+) -> list[tuple[SegmentScripts | None, float]]:
+    """Aligns all the segments to the words of the sura at once with dynamic
+    programming (Viterbi like)
+
+    Every segment is either not matched or matched to a window of words
+    (ratio >= `acceptance_ratio`) starting at most `overlap_words` words
+    before and `window_words` words after the end of the previous matched
+    segment. Like the penalty of the greedy alignment every not matched
+    segment widens this range by its maximum window (up to `band_words`).
+    The alignment with the largest sum of the ratios of the matched segments
+    minus `gap_penalty` for every skipped or repeated word out of this
+    widening is chosen.
+
+    Args:
+        band_words (int | None): only the alignment ends within `band_words`
+            words of the best one (and scoring at most a whole segment less)
+            are kept after every segment so every segment costs
+            O(band_words * window) ratios at most. Defaults to `window_words`
+    """
+    if band_words is None:
+        band_words = window_words
+    scorer = get_scorer(scorer)
+    aya = Aya(sura_idx=sura_idx)
+    _, bismillah, _ = aya._get_valid_flags(include_bismillah=include_bismillah, warn=False)
+    index = aya._get_imlaey_word_index(include_bismillah=bismillah)
+    first_abs_idx = aya.get_abs_aya_idx() - 1
+    num_words = (
+        index.offsets[first_abs_idx + aya.get().num_ayat_in_sura]
+        - index.offsets[first_abs_idx]
+    )
+    num_bismillah_words = len(index.encodings[first_abs_idx].imlaey_words) - len(
+        aya.get().imlaey_words
+    )
+    # segments may end in the next sura (like the greedy alignment)
+    norm_region, norm_word_starts, can_split = _get_normalized_region(
+        aya,
+        start=0,
+        num_words=num_words + window_words,
+        include_bismillah=bismillah,
+        **kwargs,
+    )
+    last_aya = aya.step(aya.get().num_ayat_in_sura - 1)
+
+    # alignment end (words of the sura) -> the best score
+    states: dict[int, float] = {0: 0.0, num_bismillah_words: 0.0}
+    # alignment end -> the words the not matched segments after it may cover
+    slacks: dict[int, int] = {0: 0, num_bismillah_words: 0}
+    # for every segment: end -> (previous end, (start, end) or the scripts
+    # of istiaatha and sadaka or None if not matched, ratio)
+    backs: list[dict] = []
+    for idx, text_seg in enumerate(text_segments):
+        norm_text = normalize_aya(text_seg, **kwargs)
+        text_words = None
+        if scorer is not None:
+            text_words = [normalize_aya(w, **kwargs) for w in text_seg.split()]
+        min_window, max_window = estimate_window_len(norm_text, window_words)
+        new_states = dict(states)
+        new_slacks = {
+            end: min(slack + max_window * (len(norm_text) > 0), band_words)
+            for end, slack in slacks.items()
+        }
+        # the best ratio of the segment (the ratio of not matched segments)
+        seg_ratio = 0.0
+        back = {end: (end, None, 0.0) for end in states}
+
+        specials = []
+        if len(norm_text) > 0 and idx == 0 and include_istiaatha:
+            specials.append((aya, 0, 5, dict(istiaatha=True), {0}))
+        elif len(norm_text) > 0 and idx + 1 == len(text_segments) and include_sadaka:
+            sadaka_start = len(last_aya.get().imlaey_words)
+            specials.append((last_aya, sadaka_start, 3, dict(sadaka=True), states))
+        for special_aya, start, window, flags, ends in specials:
+            best = BestSegment(start=0, window=0)
+            out = _check_segment(
+                best,
+                special_aya,
+                norm_text,
+                start,
+                window,
+                scorer=scorer,
+                text_words=text_words,
+                **flags,
+                **kwargs,
+            )
+            if out is None:
+                continue
+            seg_ratio = max(seg_ratio, out.ratio)
+            if out.ratio < acceptance_ratio:
+                continue
+            for end in ends:
+                if end in states and states[end] + out.ratio > new_states[end]:
+                    new_states[end] = states[end] + out.ratio
+                    new_slacks[end] = slacks[end]
+                    back[end] = (end, out.segment_scripts, out.ratio)
+
+        for start in range(
+            max(0, min(end - overlap_words - slacks[end] for end in states)),
+            min(num_words, max(end + window_words + slacks[end] for end in states) + 1),
+        ):
+            if len(norm_text) == 0 or not can_split[start]:
+                continue
+            # the best previous end for this start
+            prev_score, prev_end = -math.inf, None
+            for end, score in states.items():
+                slack = slacks[end]
+                if -overlap_words - slack <= start - end <= window_words + slack:
+                    score -= gap_penalty * max(abs(start - end) - slack, 0)
+                    if score > prev_score:
+                        prev_score, prev_end = score, end
+            if prev_end is None:
+                continue
+
+            ends = range(
+                start + min_window, min(start + max_window, num_words + window_words) + 1
+            )
+            if scorer is not None:
+                ratios = scorer.window_ratios(
+                    norm_text,
+                    norm_region,
+                    norm_word_starts,
+                    start,
+                    ends,
+                    min_ratio=min(acceptance_ratio, seg_ratio),
+                    text_words=text_words,
+                )
+            for end_idx, end in enumerate(ends):
+                if scorer is None:
+                    min_ratio = min(acceptance_ratio, seg_ratio)
+                    candidate = norm_region[
+                        norm_word_starts[start] : norm_word_starts[end]
+                    ]
+                    # windows only get longer
+                    max_dist = get_max_distance(len(norm_text), min_ratio)
+                    if (
+                        max_dist is not None
+                        and len(candidate) - len(norm_text) > max_dist
+                    ):
+                        break
+                if not can_split[end]:
+                    continue
+                if scorer is None:
+                    ratio = get_match_ratio(norm_text, candidate, min_ratio=min_ratio)
+                else:
+                    ratio = ratios[end_idx]
+                seg_ratio = max(seg_ratio, ratio)
+                if ratio < acceptance_ratio:
+                    continue
+                if prev_score + ratio > new_states.get(end, -math.inf):
+                    new_states[end] = prev_score + ratio
+                    new_slacks[end] = 0
+                    back[end] = (prev_end, (start, end), ratio)
+
+        # banding
+        best_end = max(new_states, key=lambda end: (new_states[end], -end))
+        states = {
+            end: score
+            for end, score in new_states.items()
+            if abs(end - best_end) <= band_words
+            and score >= new_states[best_end] - 1
+        }
+        slacks = {end: new_slacks[end] for end in states}
+        for end, (prev_end, out, _) in back.items():
+            if out is None:
+                back[end] = (prev_end, out, seg_ratio)
+        backs.append(back)
+
+    outputs = []
+    end = max(states, key=lambda end: (states[end], -end))
+    for back in reversed(backs):
+        end, out, ratio = back[end]
+        if out is None or isinstance(out, SegmentScripts):
+            outputs.append((out, ratio))
+        else:
+            start, stop = out
+            if start < num_bismillah_words:
+                segment_scripts = aya.get_by_imlaey_words(
+                    start=start, window=stop - start, include_bismillah=True
+                )
+            else:
+                segment_scripts = aya.get_by_imlaey_words(
+                    start=start - num_bismillah_words, window=stop - start
+                )
+            outputs.append((segment_scripts, ratio))
+    return outputs[::-1]
+
+
+def tasmeea_sura(
+    text_segments: list[str],
+    sura_idx: int,
+    pivot_list: Optional[list[str] | None] = None,
+    overlap_words: int = 6,
+    window_words=30,
+    acceptance_ratio: float = 0.5,
+    include_istiaatha=True,
+    include_bismillah=True,
+    include_sadaka=True,
+    num_workers: int = 1,
+    chunk_segments: int = 32,
+    anchor_words: int = 8,
+    use_qgram_index=False,
+    qgram_top_k: int = 5,
+    alignment: str = "greedy",
+    scorer: Scorer | str | None = None,
+    **kwargs,
+) -> list[tuple[SegmentScripts | None, float]]:
+    """Returns the best matching quracic script for every text part
+
+    Args:
+        pivot_list (list[str] | None): A list where each element is either "pivot" or an empty string "".
+            "pivot" indicates that the corresponding item is the first segment when the text is split into multiple parts.
+            An empty string ("") means the item is not the first segment.
+            This helps identify which segments are the starting points in a split text.
+
+        num_workers (int): if > 1 the segments are split into chunks of
+            `chunk_segments` segments matched in parallel by a process pool.
+            Every chunk is anchored by locating the last `anchor_words` words
+            before it in the whole sura. If the anchor of a chunk does not
+            agree with where the previous chunk ended the chunk is matched
+            again sequentially so the outputs are always the same as
+            `num_workers=1`
+
+        use_qgram_index (bool): if True a character q-gram index of the
+            sura (`SuraQGramIndex`) proposes `qgram_top_k` starts for every
+            segment and only the starts near them in the start range are
+            checked. After a failed segment the proposed starts are checked
+            anywhere in the sura in addition to the start range to re-anchor.
+
+        alignment (str): "greedy": every segment is matched to the best
+            window after the previous segment one after another.
+            "dp": all the segments are aligned at once with dynamic
+            programming (see `_tasmeea_sura_dp`, accepts `band_words` and
+            `gap_penalty`) so a wrong segment does not misplace the next
+            ones and the cost per segment is bounded. `num_workers` and
+            `use_qgram_index` are for "greedy" only
+
+        scorer (Scorer | str | None): scores the windows of a segment
+            (`Scorer` or a name of `scorers.SCORERS`: "levenshtein",
+            "banded", "token", "phonetic" or "numpy"). `acceptance_ratio` is
+            a ratio of this scorer. None means one bounded Levenshtein
+            distance per window (like "banded")
+
+        Note:
+            - We only support Istiaatha to be spearate segment not connected to other ayat or bismillah
+            - We only support Sadaka to be spearate segment not connected to other ayat or bismillah
+    """
+    assert overlap_words >= 0
+    assert chunk_segments >= 2, "chunks can not start at the second segment"
+    assert anchor_words >= 1
+    assert alignment in {"greedy", "dp"}
+    if pivot_list is None:
+        pivot_list = ["pivot"] * len(text_segments)
+
+    kwargs["remove_spaces"] = True
+    kwargs["remove_tashkeel"] = True
+    if alignment == "dp":
+        return _tasmeea_sura_dp(
+            text_segments,
+            sura_idx,
+            overlap_words=overlap_words,
+            window_words=window_words,
+            acceptance_ratio=acceptance_ratio,
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+            scorer=scorer,
+            **kwargs,
+        )
+
+    chain_kwargs = dict(
+        overlap_words=overlap_words,
+        window_words=window_words,
+        acceptance_ratio=acceptance_ratio,
+        include_istiaatha=include_istiaatha,
+        include_bismillah=include_bismillah,
+        include_sadaka=include_sadaka,
+        use_qgram_index=use_qgram_index,
+        qgram_top_k=qgram_top_k,
+        scorer=scorer,
+    )
+    if num_workers <= 1 or len(text_segments) <= chunk_segments:
+        outputs, _, _ = _tasmeea_chain(
+            text_segments,
+            Aya(sura_idx=sura_idx),
+            first_idx=0,
+            num_segments=len(text_segments),
+            **chain_kwargs,
+            **kwargs,
+        )
+        return outputs
+
+    chunk_starts = list(range(0, len(text_segments), chunk_segments))
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(
+                _tasmeea_chunk,
+                # every segment has at least a word
+                " ".join(
+                    " ".join(text_segments[max(0, start - anchor_words) : start])
+                    .split()[-anchor_words:]
+                ),
+                text_segments[start : start + chunk_segments],
+                sura_idx,
+                start,
+                len(text_segments),
+                chain_kwargs,
+                kwargs,
+            )
+            for start in chunk_starts
+        ]
+
+        outputs = []
+        cursor = Aya(sura_idx=sura_idx).cursor
+        penalty = 0
+        for start, future in zip(chunk_starts, futures):
+            chunk_out = future.result()
+            if chunk_out is not None and chunk_out[0] == cursor and penalty == 0:
+                _, chunk_outputs, cursor, penalty = chunk_out
+            else:
+                # the anchor disagrees with the previous chunk
+                logging.debug(f"Chunk starting at {start} is matched sequentially")
+                chunk_outputs, aya, penalty = _tasmeea_chain(
+                    text_segments[start : start + chunk_segments],
+                    _aya_from_cursor(cursor),
+                    first_idx=start,
+                    num_segments=len(text_segments),
+                    penalty=penalty,
+                    **chain_kwargs,
+                    **kwargs,
+                )
+                cursor = aya.cursor
+            outputs += chunk_outputs
+
+    return outputs
+
+
+def tasmeea_quran(
+    text_segments: list[str],
+    overlap_words: int = 6,
+    window_words=30,
+    acceptance_ratio: float = 0.5,
+    include_istiaatha=True,
+    include_bismillah=True,
+    include_sadaka=True,
+    anchor_words: int = 16,
+    max_anchor_segments: int = 8,
+    use_qgram_index=False,
+    qgram_top_k: int = 5,
+    scorer: Scorer | str | None = None,
+    **kwargs,
+) -> list[tuple[SegmentScripts | None, float]]:
+    """Returns the best matching quracic script for every text part of a
+    recitation of unknown sura
+
+    The start of the recitation is located in the whole Quran with the
+    `QuranQGramIndex` (only the windows near its `qgram_top_k` proposed
+    starts are checked) then the segments are matched one after another
+    like `tasmeea_sura` (continuing to the next suar if any)
+
+    Args:
+        anchor_words (int): the minimum number of words (of the first
+            segments after istiaatha and bismillah) used to locate the start
+        max_anchor_segments (int): the number of segments tried to locate the
+            start. The segments before the located one are not matched (None)
+        use_qgram_index (bool): see `tasmeea_sura`
+        scorer (Scorer | str | None): scores the windows of the start
+            location and of every segment (see `tasmeea_sura`)
+
+        Note:
+            - Istiaatha and bismillah are only matched if the recitation
+            starts at the beginning of a sura
+    """
+    assert overlap_words >= 0
+    assert anchor_words >= 1
+    scorer = get_scorer(scorer)
+    kwargs["remove_spaces"] = True
+    kwargs["remove_tashkeel"] = True
+
+    # istiaatha and bismillah segments can not locate the recitation
+    aya = Aya(sura_idx=2)
+    norm_prefixes = [
+        normalize_aya(aya.istiaatha_imlaey, **kwargs),
+        normalize_aya(aya.get().bismillah_imlaey, **kwargs),
+    ]
+    num_leading = 0
+    for text_seg in text_segments[:2]:
+        norm_text = normalize_aya(text_seg, **kwargs)
+        if len(norm_text) == 0 or all(
+            get_match_ratio(norm_text, p, min_ratio=acceptance_ratio)
+            < acceptance_ratio
+            for p in norm_prefixes
+        ):
+            break
+        num_leading += 1
+
+    cursor = None
+    for anchor_idx in range(
+        num_leading, min(len(text_segments), num_leading + max_anchor_segments)
+    ):
+        anchor_text = []
+        for text_seg in text_segments[anchor_idx:]:
+            anchor_text += text_seg.split()
+            if len(anchor_text) >= anchor_words:
+                break
+        cursor = _locate_in_quran(
+            " ".join(anchor_text),
+            top_k=qgram_top_k,
+            acceptance_ratio=acceptance_ratio,
+            window_words=window_words,
+            scorer=scorer,
+            **kwargs,
+        )
+        if cursor is not None:
+            break
+    if cursor is None:
+        return [(None, 0.0)] * len(text_segments)
+
+    first_idx = anchor_idx
+    if anchor_idx == num_leading and (
+        num_leading == 0 or (cursor.aya_idx == 0 and cursor.start_imlaey_word_idx == 0)
+    ):
+        first_idx = 0
+    outputs, _, _ = _tasmeea_chain(
+        text_segments[first_idx:],
+        _aya_from_cursor(cursor),
+        first_idx=first_idx,
+        num_segments=len(text_segments),
+        overlap_words=overlap_words,
+        window_words=window_words,
+        acceptance_ratio=acceptance_ratio,
+        include_istiaatha=include_istiaatha,
+        include_bismillah=include_bismillah,
+        include_sadaka=include_sadaka,
+        use_qgram_index=use_qgram_index,
+        qgram_top_k=qgram_top_k,
+        scorer=scorer,
+        **kwargs,
+    )
+    return [(None, 0.0)] * first_idx + outputs
+
+
+def _prepare_sura(sura_idx: int, **kwargs):
+    """Builds what is shared by all the tasmeea of the sura in this process:
+    the encodings and word index of the Quran and the normalized words of the
+    sura
+    """
+    # only the `normalize_aya` arguments
+    kwargs = {k: v for k, v in kwargs.items() if k in _NORMALIZE_ARGS}
+    kwargs["remove_spaces"] = True
+    kwargs["remove_tashkeel"] = True
+    aya = Aya(sura_idx=sura_idx)
+    num_sura_words = sum(
+        len(a._encode_imlaey_to_uthmani().imlaey_words)
+        for a in aya.get_ayat_after(num_ayat=aya.get().num_ayat_in_sura)
+    )
+    _get_normalized_region(aya, start=0, num_words=num_sura_words, **kwargs)
+
+
+def _tasmeea_batch_task(
+    sura_idx: int, jobs: list[list[list[str]]], kwargs: dict
+) -> list[list[tuple[SegmentScripts | None, float]]]:
+    """Process pool job: `tasmeea_sura_multi_part` of recordings of the
+    same sura
+    """
+    _prepare_sura(sura_idx, **kwargs)
+    return [tasmeea_sura_multi_part(segs, sura_idx, **kwargs) for segs in jobs]
+
+
+def tasmeea_batch(
+    jobs: list[tuple[int, list[list[str]]]],
+    num_workers: int = 1,
+    jobs_per_task: int = 4,
+    max_in_flight: int | None = None,
+    **kwargs,
+) -> list[list[tuple[SegmentScripts | None, float]]]:
+    """`tasmeea_sura_multi_part` of many recordings
+
+    Jobs are grouped by sura so the per sura work (normalized words, encodings)
+    is done once per worker and distributed over a process pool
+
+    Args:
+        jobs (list[tuple[int, list[list[str]]]]): list of
+            (sura_idx, text_segments) (see `tasmeea_sura_multi_part`)
+        num_workers (int): the number of processes. 1 means in this process
+        jobs_per_task (int): the number of jobs (of the same sura) sent to a
+            worker at once
+        max_in_flight (int | None): the maximum number of tasks submitted and
+            not collected yet (bounds the memory of pending inputs and
+            outputs). Defaults to `2 * num_workers`
+        kwargs: the arguments of `tasmeea_sura_multi_part`
+
+    Returns:
+        the outputs of `tasmeea_sura_multi_part` for every job in the same
+        order of `jobs`
+    """
+    assert jobs_per_task >= 1
+    if max_in_flight is None:
+        max_in_flight = 2 * num_workers
+
+    # grouping jobs by sura: (sura_idx, job ids)
+    sura_to_ids: dict[int, list[int]] = {}
+    for job_idx, (sura_idx, _) in enumerate(jobs):
+        sura_to_ids.setdefault(sura_idx, []).append(job_idx)
+    tasks: list[tuple[int, list[int]]] = []
+    for sura_idx, ids in sura_to_ids.items():
+        for start in range(0, len(ids), jobs_per_task):
+            tasks.append((sura_idx, ids[start : start + jobs_per_task]))
+
+    outputs: list = [None] * len(jobs)
+    if num_workers <= 1:
+        for sura_idx, ids in tasks:
+            task_outs = _tasmeea_batch_task(
+                sura_idx, [jobs[idx][1] for idx in ids], kwargs
+            )
+            for idx, out in zip(ids, task_outs):
+                outputs[idx] = out
+        return outputs
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        # future -> job ids
+        in_flight = {}
+        for sura_idx, ids in tasks:
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for idx, out in zip(in_flight.pop(future), future.result()):
+                        outputs[idx] = out
+            future = executor.submit(
+                _tasmeea_batch_task, sura_idx, [jobs[idx][1] for idx in ids], kwargs
+            )
+            in_flight[future] = ids
+
+        for future in list(in_flight):
+            for idx, out in zip(in_flight.pop(future), future.result()):
+                outputs[idx] = out
 
     return outputs
 
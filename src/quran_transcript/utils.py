@@ -1,13 +1,23 @@
 from pathlib import Path
 import json
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
+import inspect
+from operator import attrgetter
 import re
 from typing import Optional
 import warnings
 
-import xmltodict
-
 from . import alphabet as alpha
+from .corpus import (
+    NORMALIZED_SUFFIX,
+    NormalizedQuranCorpus,
+    QuranCorpus,
+    get_cache_dir,
+    load_quran_corpus,
+)
 
 BASE_PATH = Path(__file__).parent
 
@@ -149,6 +159,23 @@ class EncodingOutput:
     sadaka_imlaey_span_words: tuple[int, int] | None
 
 
+@dataclass
+class ImlaeyWordIndex:
+    """
+    Flat word level index of the imlaey words of the whole Quran for given
+    istiaatha, bismillah and sadaka flags.
+
+    Attributes:
+        offsets: offsets[i] is the position of the first imlaey word of the
+            absolute aya `i` (starting from 0) in the whole Quran.
+            offsets[-1] is the total number of imlaey words
+        encodings: the encoding of every absolute aya
+    """
+
+    offsets: list[int]
+    encodings: list[EncodingOutput]
+
+
 @dataclass
 class QuranWordIndex:
     """
@@ -264,8 +291,94 @@ class SegmentScripts:
     """
 
 
-# TODO: Add quran_dict as default
+@lru_cache(maxsize=None)
+def _get_unique_rasm_imlaey(join_prefix=" ") -> dict[str, list[tuple[int, str]]]:
+    """alphabet.unique_rasm.rasm_map imlaey scripts grouped by their first word
+    Return:
+        {first_word: [(number of imlaey words, imlaey script)]}
+    """
+    out: dict[str, list[tuple[int, str]]] = {}
+    for unique_rasm in alpha.unique_rasm.rasm_map:
+        words = unique_rasm["imlaey"].split(join_prefix)
+        out.setdefault(words[0], []).append((len(words), unique_rasm["imlaey"]))
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class AyaCursor:
+    """
+    Light immutable position in the Holy Quran
+
+    Attributes:
+        sura_idx: the index of the sura starting from 0
+        aya_idx: the index of the aya in the sura starting from 0
+        start_imlaey_word_idx: the imlaey word offset in the aya used by
+            imlaey words stepping
+    """
+
+    sura_idx: int
+    aya_idx: int
+    start_imlaey_word_idx: int = 0
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class _AyaSettings:
+    """The corpus and script keys shared by an `Aya` and every `Aya` derived
+    from it (by `step`, `set_new`, ...)
+    """
+
+    corpus: QuranCorpus
+    quran_path: Path
+    map_key: str
+    bismillah_map_key: str
+    uthmani_key: str
+    imlaey_key: str
+    sura_name_key: str
+    bismillah_uthmani_key: str
+    bismillah_imlaey_key: str
+    join_prefix: str
+
+    @property
+    def keys(self) -> tuple:
+        """All the settings that affect the scripts of an Aya (used as key for
+        the corpus derived tables)
+        """
+        return (
+            self.map_key,
+            self.bismillah_map_key,
+            self.uthmani_key,
+            self.imlaey_key,
+            self.sura_name_key,
+            self.bismillah_uthmani_key,
+            self.bismillah_imlaey_key,
+            self.join_prefix,
+        )
+
+
 class Aya(object):
+    # Aya is a tiny wrapper of a position (`AyaCursor`) and shared settings
+    # so that looping over the Quran does not allocate heavy objects
+    __slots__ = ("settings", "cursor")
+
+    corpus = property(attrgetter("settings.corpus"))
+    quran_path = property(attrgetter("settings.quran_path"))
+    map_key = property(attrgetter("settings.map_key"))
+    bismillah_map_key = property(attrgetter("settings.bismillah_map_key"))
+    uthmani_key = property(attrgetter("settings.uthmani_key"))
+    imlaey_key = property(attrgetter("settings.imlaey_key"))
+    sura_name_key = property(attrgetter("settings.sura_name_key"))
+    bismillah_uthmani_key = property(attrgetter("settings.bismillah_uthmani_key"))
+    bismillah_imlaey_key = property(attrgetter("settings.bismillah_imlaey_key"))
+    join_prefix = property(attrgetter("settings.join_prefix"))
+
+    # NOTE: we are storing sura index and aya index as absolute index (starting from 0 not 1)
+    # TODO: confuse naming we should make it clean that is diffrent for user
+    # exepctations we should name it python_sura_idx to diffrentiate it
+    sura_idx = property(attrgetter("cursor.sura_idx"))
+    aya_idx = property(attrgetter("cursor.aya_idx"))
+    # NOTE: used by word steping for imlaey script
+    start_imlaey_word_idx = property(attrgetter("cursor.start_imlaey_word_idx"))
+
     def __init__(
         self,
         sura_idx=1,
@@ -273,6 +386,7 @@ class Aya(object):
         quran_path: str | Path = BASE_PATH / "quran-script/quran-uthmani-imlaey.json",
         quran_dict: Optional[dict] = None,
         start_imlaey_word_idx: Optional[int] = None,
+        corpus: Optional[QuranCorpus] = None,
         prefix="@",
         map_key="rasm_map",
         bismillah_map_key="bismillah_map",
@@ -287,60 +401,71 @@ class Aya(object):
             emlaey uthmani scripts
         sura_idx: the index of the Sura in the Quran starting with 1 to 114
         aya_idx: the index of the aya starting form 1
+        quran_dict (dict | None): your own copy of the quran script. If None
+            the shared read only script of `quran_path` is used (loaded
+            only once per process)
+        corpus (QuranCorpus | None): the corpus to use directly (overrides
+            `quran_path` and `quran_dict`)
         """
-        self.quran_path = Path(quran_path)
-        if quran_dict is None:
-            with open(self.quran_path, "r", encoding="utf8") as f:
-                self.quran_dict = json.load(f)
-        else:
-            self.quran_dict = quran_dict
-
-        # Loading Istiaath
-        self.istiaatha_imlaey = alpha.istiaatha.imlaey
-        self.istiaatha_uthmani = alpha.istiaatha.uthmani
+        quran_path = Path(quran_path)
+        if corpus is None:
+            if quran_dict is not None:
+                corpus = QuranCorpus(quran_dict, quran_path=quran_path, read_only=False)
+            else:
+                corpus = load_quran_corpus(quran_path)
+
+        self.settings = _AyaSettings(
+            corpus=corpus,
+            quran_path=quran_path,
+            map_key=map_key,
+            bismillah_map_key=bismillah_map_key,
+            uthmani_key=prefix + uthmani_key,
+            imlaey_key=prefix + imlaey_key,
+            sura_name_key=prefix + sura_name_key,
+            bismillah_uthmani_key=f"{prefix}{bismillah_key}_{uthmani_key}",
+            bismillah_imlaey_key=f"{prefix}{bismillah_key}_{imlaey_key}",
+            join_prefix=join_prefix,
+        )
 
         self._check_indices(sura_idx - 1, aya_idx - 1)
-        # NOTE: we are storing sura index and aya index as absolute index (starting from 0 not 1)
-        # TODO: confuse naming we should make it clean that is diffrent for user
-        # exepctations we should name it python_sura_idx to diffrentiate it
-        self.sura_idx = sura_idx - 1
-        self.aya_idx = aya_idx - 1
-
-        self.map_key = map_key
-        self.bismillah_map_key = bismillah_map_key
-        self.uthmani_key = prefix + uthmani_key
-        self.imlaey_key = prefix + imlaey_key
-        self.sura_name_key = prefix + sura_name_key
-        self.bismillah_uthmani_key = f"{prefix}{bismillah_key}_{uthmani_key}"
-        self.bismillah_imlaey_key = f"{prefix}{bismillah_key}_{imlaey_key}"
-        self.join_prefix = join_prefix
-
-        # NOTE: this variables used in by word steping for imlaey script in methods:
-        # * ``
-        # * ``
-        if start_imlaey_word_idx is None:
-            self.start_imlaey_word_idx = 0
-        else:
-            self.start_imlaey_word_idx = start_imlaey_word_idx
-        self.decoding_cache = {}
+        self.cursor = AyaCursor(
+            sura_idx=sura_idx - 1,
+            aya_idx=aya_idx - 1,
+            start_imlaey_word_idx=start_imlaey_word_idx or 0,
+        )
+
+    def _from_cursor(self, cursor: AyaCursor) -> "Aya":
+        """Returns a new Aya at `cursor` sharing the settings of this Aya
+        without the cost of `__init__`
+        """
+        aya = object.__new__(type(self))
+        aya.settings = self.settings
+        aya.cursor = cursor
+        return aya
+
+    @property
+    def istiaatha_imlaey(self) -> str:
+        return alpha.istiaatha.imlaey
+
+    @property
+    def istiaatha_uthmani(self) -> str:
+        return alpha.istiaatha.uthmani
+
+    @property
+    def quran_dict(self) -> dict:
+        return self.corpus.quran_dict
 
     def get_start_imlaey_word_idx(self):
         return self.start_imlaey_word_idx
 
     def _get_sura(self, sura_idx):
-        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
-        return self.quran_dict["quran"]["sura"][sura_idx]["aya"]
+        return self.corpus.get_sura(sura_idx)
 
     def _get_sura_object(self, sura_idx):
-        assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
-        return self.quran_dict["quran"]["sura"][sura_idx]
+        return self.corpus.get_sura_object(sura_idx)
 
     def _get_aya(self, sura_idx, aya_idx):
-        assert aya_idx >= 0 and aya_idx < len(self._get_sura(sura_idx)), (
-            f"Sura index out of range sura_index={sura_idx + 1} "
-            + f"and len of sura={len(self._get_sura(sura_idx))}"
-        )
-        return self._get_sura(sura_idx)[aya_idx]
+        return self.corpus.get_aya(sura_idx, aya_idx)
 
     def _get(self, sura_idx, aya_idx) -> AyaFormat:
         """
@@ -390,32 +515,29 @@ class Aya(object):
                     if None: the aya is not the first aya of the sura
                     (Note: bismillah maping is set automaticllay no by the user)
         """
+        aya = self._get_aya(sura_idx, aya_idx)
         bismillah = {self.bismillah_uthmani_key: None, self.bismillah_imlaey_key: None}
         for key in bismillah.keys():
-            if key in self._get_aya(sura_idx, aya_idx).keys():
-                bismillah[key] = self._get_aya(sura_idx, aya_idx)[key]
+            if key in aya.keys():
+                bismillah[key] = aya[key]
 
         bismillah_map = None
-        if self.bismillah_map_key in self._get_aya(sura_idx, aya_idx).keys():
-            bismillah_map = self._get_aya(sura_idx, aya_idx)[self.bismillah_map_key]
+        if self.bismillah_map_key in aya.keys():
+            bismillah_map = aya[self.bismillah_map_key]
 
         rasm_map = None
-        if self.map_key in self._get_aya(sura_idx, aya_idx).keys():
-            rasm_map = self._get_aya(sura_idx, aya_idx)[self.map_key]
+        if self.map_key in aya.keys():
+            rasm_map = aya[self.map_key]
 
         return AyaFormat(
             sura_idx=sura_idx + 1,
             aya_idx=aya_idx + 1,
-            sura_name=self._get_sura_object(sura_idx)[self.sura_name_key],
-            num_ayat_in_sura=len(self._get_sura(sura_idx)),
-            uthmani=self._get_aya(sura_idx, aya_idx)[self.uthmani_key],
-            uthmani_words=self._get_aya(sura_idx, aya_idx)[self.uthmani_key].split(
-                self.join_prefix
-            ),
-            imlaey=self._get_aya(sura_idx, aya_idx)[self.imlaey_key],
-            imlaey_words=self._get_aya(sura_idx, aya_idx)[self.imlaey_key].split(
-                self.join_prefix
-            ),
+            sura_name=self.corpus.get_sura_name(sura_idx, self.sura_name_key),
+            num_ayat_in_sura=self.corpus.get_num_ayat(sura_idx),
+            uthmani=aya[self.uthmani_key],
+            uthmani_words=aya[self.uthmani_key].split(self.join_prefix),
+            imlaey=aya[self.imlaey_key],
+            imlaey_words=aya[self.imlaey_key].split(self.join_prefix),
             rasm_map=rasm_map,
             bismillah_uthmani=bismillah[self.bismillah_uthmani_key],
             bismillah_imlaey=bismillah[self.bismillah_imlaey_key],
@@ -442,13 +564,39 @@ class Aya(object):
                 bismillah_imlaey (str): bismillah in uthmani script if the
                     aya index == 1 and the sura has bismillah or bismillah is
                     not aya like sura Alfateha and else (None)
-        """
 
-        return self._get(self.sura_idx, self.aya_idx)
+        Note: The AyaFormat is built once per aya and shared between all Aya
+        objects of the same corpus. Do not modify it.
+        """
+        formats = self.corpus.derived.setdefault(
+            ("aya_format", self.settings.keys), {}
+        )
+        key = (self.sura_idx, self.aya_idx)
+        if key not in formats:
+            formats[key] = self._get(self.sura_idx, self.aya_idx)
+        return formats[key]
 
     def is_last(self) -> bool:
         """Whether the aya is the last aya in the sura or not"""
-        return (self.aya_idx + 1) == self.get().num_ayat_in_sura
+        return (self.aya_idx + 1) == self.corpus.get_num_ayat(self.sura_idx)
+
+    def get_abs_aya_idx(self) -> int:
+        """The absolute index of the aya in the whole Quran starting from 1
+        Example: Aya(1, 1) -> 1, Aya(2, 1) -> 8, Aya(114, 6) -> 6236
+        """
+        return self.corpus.get_abs_aya_idx(self.sura_idx, self.aya_idx) + 1
+
+    def set_new_abs(self, abs_aya_idx: int, start_imlaey_word_idx: int | None = None):
+        """Return new aya with the absolute aya index
+        Args:
+            abs_aya_idx: the absolute index of the aya in the Quran from 1 to 6236
+        """
+        sura_idx, aya_idx = self.corpus.get_sura_aya_idx(abs_aya_idx - 1)
+        return self.set_new(
+            sura_idx=sura_idx + 1,
+            aya_idx=aya_idx + 1,
+            start_imlaey_word_idx=start_imlaey_word_idx,
+        )
 
     def __str__(self):
         return str(self.get())
@@ -462,15 +610,18 @@ class Aya(object):
         """
         assert sura_idx >= 0 and sura_idx <= 113, f"Wrong Sura index {sura_idx + 1}"
 
-        assert aya_idx >= 0 and aya_idx < len(self._get_sura(sura_idx)), (
+        assert aya_idx >= 0 and aya_idx < self.corpus.get_num_ayat(sura_idx), (
             f"Aya index out of range (sura_index={sura_idx + 1} "
             + f"aya_index={aya_idx + 1}) "
-            + f"and length of sura={len(self._get_sura(sura_idx))}"
+            + f"and length of sura={self.corpus.get_num_ayat(sura_idx)}"
         )
 
     def _set_ids(self, sura_idx, aya_idx):
-        self.sura_idx = sura_idx
-        self.aya_idx = aya_idx
+        self.cursor = AyaCursor(
+            sura_idx=sura_idx,
+            aya_idx=aya_idx,
+            start_imlaey_word_idx=self.start_imlaey_word_idx,
+        )
 
     def set(self, sura_idx, aya_idx, start_imlaey_word_idx: int | None = None) -> None:
         """Set the aya
@@ -481,7 +632,11 @@ class Aya(object):
         self._check_indices(sura_idx - 1, aya_idx - 1)
         self._set_ids(sura_idx=sura_idx - 1, aya_idx=aya_idx - 1)
         if start_imlaey_word_idx:
-            self.start_imlaey_word_idx = start_imlaey_word_idx
+            self.cursor = AyaCursor(
+                sura_idx=self.sura_idx,
+                aya_idx=self.aya_idx,
+                start_imlaey_word_idx=start_imlaey_word_idx,
+            )
 
     def set_new(self, sura_idx, aya_idx, start_imlaey_word_idx: int | None = None):
         """Return new aya with sura, and aya indices
@@ -489,12 +644,13 @@ class Aya(object):
         sura_idx: the index of the Sura in the Quran starting with 1 to 114
         aya_idx: the index of the aya starting form 1
         """
-        return Aya(
-            quran_path=self.quran_path,
-            sura_idx=sura_idx,
-            aya_idx=aya_idx,
-            quran_dict=self.quran_dict,
-            start_imlaey_word_idx=start_imlaey_word_idx,
+        self._check_indices(sura_idx - 1, aya_idx - 1)
+        return self._from_cursor(
+            AyaCursor(
+                sura_idx=sura_idx - 1,
+                aya_idx=aya_idx - 1,
+                start_imlaey_word_idx=start_imlaey_word_idx or 0,
+            )
         )
 
     def step(self, step_len: int) -> "Aya":
@@ -502,33 +658,10 @@ class Aya(object):
         Return new Aya object with "step_len" aya after of before
         circular loop
         """
-        aya_relative_idx = step_len + self.aya_idx
-
-        # +VE or zero aya idx
-        if aya_relative_idx >= 0:
-            sura_idx = self.sura_idx
-            while True:
-                num_ayat = self._get(sura_idx=sura_idx, aya_idx=0).num_ayat_in_sura
-                if aya_relative_idx < num_ayat:
-                    break
-                aya_relative_idx -= num_ayat
-                sura_idx = (sura_idx + 1) % 114
-
-        # -VE aya idx
-        else:
-            sura_idx = (self.sura_idx - 1) % 114
-            while True:
-                num_ayat = self._get(sura_idx=sura_idx, aya_idx=0).num_ayat_in_sura
-                aya_relative_idx += num_ayat
-                if aya_relative_idx >= 0:
-                    break
-
-        return Aya(
-            quran_path=self.quran_path,
-            sura_idx=sura_idx + 1,
-            aya_idx=aya_relative_idx + 1,
-            quran_dict=self.quran_dict,
-        )
+        abs_aya_idx = self.corpus.get_abs_aya_idx(self.sura_idx, self.aya_idx)
+        abs_aya_idx = (abs_aya_idx + step_len) % self.corpus.total_ayat
+        sura_idx, aya_idx = self.corpus.get_sura_aya_idx(abs_aya_idx)
+        return self._from_cursor(AyaCursor(sura_idx=sura_idx, aya_idx=aya_idx))
 
     # TODO: Add vertix
     def get_ayat_after(self, end_vertix=(114, 6), num_ayat: int | None = None):
@@ -538,26 +671,18 @@ class Aya(object):
         Args:
             num_aya: loop for ayat until reaching aya + num_ayat - 1
         """
+        start_abs_idx = self.corpus.get_abs_aya_idx(self.sura_idx, self.aya_idx)
         if num_ayat is not None:
-            aya = self
-            for _ in range(num_ayat):
-                yield aya
-                aya = aya.step(1)
+            if num_ayat > 0:
+                yield self
+            for idx in range(1, num_ayat):
+                yield self.step(idx)
             return
 
         # TODO: subject to end_vertix
-        aya_start_idx = self.aya_idx
-        for sura_loop_idx in range(self.sura_idx, 114):
-            for aya_loop_idx in range(
-                aya_start_idx, len(self._get_sura(sura_loop_idx))
-            ):
-                yield Aya(
-                    quran_path=self.quran_path,
-                    sura_idx=sura_loop_idx + 1,
-                    aya_idx=aya_loop_idx + 1,
-                    quran_dict=self.quran_dict,
-                )
-            aya_start_idx = 0
+        for abs_aya_idx in range(start_abs_idx, self.corpus.total_ayat):
+            sura_idx, aya_idx = self.corpus.get_sura_aya_idx(abs_aya_idx)
+            yield self._from_cursor(AyaCursor(sura_idx=sura_idx, aya_idx=aya_idx))
 
     def _get_map_dict(
         self, uthmani_list: list[str], imlaey_list: list[str]
@@ -597,6 +722,8 @@ class Aya(object):
         uthmani_list: list[list[str]],
         imlaey_list: list[list[str]],
     ):
+        self.corpus.check_writable()
+
         # Assert len
         assert len(uthmani_list) == len(imlaey_list), (
             f"Lenght mismatch: len(uthmani)={len(uthmani_list)} "
@@ -644,7 +771,12 @@ class Aya(object):
                 self.bismillah_map_key
             ] = bismillah_map
 
+        # the derived tables are built from the old script
+        self.corpus.derived.clear()
+
     def save_quran_dict(self):
+        self.corpus.check_writable()
+
         # save the file
         with open(self.quran_path, "w+", encoding="utf8") as f:
             json.dump(self.quran_dict, f, ensure_ascii=False, indent=2)
@@ -701,79 +833,197 @@ class Aya(object):
             - Warnings are issued if Istiaatha, Bismillah, or Sadaka are requested in invalid positions.
             - Handles edge cases where Uthmani and Imlaey word counts differ (e.g., due to unique Rasm rules).
         """
-        # caching decoding (indexing starge) for fasster infernce
-        if self.decoding_cache:
-            if (
-                self.decoding_cache["include_istiaatha"] == include_istiaatha
-                and self.decoding_cache["include_bismillah"] == include_bismillah
-                and self.decoding_cache["include_sadaka"] == include_sadaka
-            ):
-                imlaey2uthmani = self.decoding_cache["imlaey2uthmani"]
-                uthmani_words = self.decoding_cache["uthmani_words"]
-                imlaey_words = self.decoding_cache["imlaey_words"]
-                return EncodingOutput(
-                    imlaey2uthmani=imlaey2uthmani,
-                    uthmani_words=uthmani_words,
-                    imlaey_words=imlaey_words,
-                    aya_imlaey_span_words=self.decoding_cache["aya_imlaey_span_words"],
-                    istiaatha_imlaey_span_words=self.decoding_cache[
-                        "istiaatha_imlaey_span_words"
-                    ],
-                    bismillah_imlaey_span_words=self.decoding_cache[
-                        "bismillah_imlaey_span_words"
-                    ],
-                    sadaka_imlaey_span_words=self.decoding_cache[
-                        "sadaka_imlaey_span_words"
-                    ],
-                )
+        include_istiaatha, include_bismillah, include_sadaka = self._get_valid_flags(
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+        )
+        return self._get_encoding(
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+        )
 
-        uthmani_words = []
-        imlaey_words = []
-        istiaatha_imlaey_span_words = None
-        bismillah_imlaey_span_words = None
-        sadaka_imlaey_span_words = None
+    def _get_valid_flags(
+        self,
+        include_istiaatha=False,
+        include_bismillah=False,
+        include_sadaka=False,
+        warn=True,
+    ) -> tuple[bool, bool, bool]:
+        """returns (include_istiaatha, include_bismillah, include_sadaka) after
+        dropping the flags that do not apply to the aya
+        """
         # NOTE: include istiaathta only at the begining of the sura
-        if include_istiaatha:
-            if (self.aya_idx + 1) == 1:
-                ist_start = len(imlaey_words)
-                uthmani_words += alpha.istiaatha.uthmani.split(self.join_prefix)
-                imlaey_words += alpha.istiaatha.imlaey.split(self.join_prefix)
-                istiaatha_imlaey_span_words = (ist_start, len(imlaey_words))
-            else:
+        if include_istiaatha and (self.aya_idx + 1) != 1:
+            if warn:
                 warnings.warn(
                     f"Istiaatha will not be included. We only include Istiaatha at the beginning of every sura (first aya only). Aya index is: `{self.aya_idx + 1}`"
                 )
+            include_istiaatha = False
+
         # NOTE: we inlcude bimillah only at the first of every sura except for every sura number 9
         # surah Al-Tawba
         # bismillah is part of surah Al fatiha so according to Hafs so we do not
         # inlcude it as it is already an aya
-        if include_bismillah:
-            if self.get().bismillah_uthmani is not None:
-                bis_start = len(imlaey_words)
-                uthmani_words += self.get().bismillah_uthmani.split(self.join_prefix)
-                imlaey_words += self.get().bismillah_imlaey.split(self.join_prefix)
-                bismillah_imlaey_span_words = (bis_start, len(imlaey_words))
-            else:
+        if (
+            include_bismillah
+            and self.bismillah_uthmani_key
+            not in self._get_aya(self.sura_idx, self.aya_idx)
+        ):
+            if warn:
                 warnings.warn(
                     f"Bismillah will not be included, as it is only placed at the beginning of each surah (except Surah At-Tawbah (9)). Note: Bismillah is counted as an ayah in Surah Al-Fatiha (1). The sura is : `{self.sura_idx + 1}` and Aya is: `{self.aya_idx + 1}`"
                 )
+            include_bismillah = False
+
+        # NOTE: include sadaka and the aya is the last aya in the sura only
+        if include_sadaka and not self.is_last():
+            if warn:
+                warnings.warn(
+                    f"صدق الله العظيم will not be included. We only include `sadaka` after the end of every sura. The Sura idx is: `{self.sura_idx + 1}`, the aya is: `{self.aya_idx + 1}` and the last aya is `{self.corpus.get_num_ayat(self.sura_idx)}` "
+                )
+            include_sadaka = False
+
+        return include_istiaatha, include_bismillah, include_sadaka
+
+    def _get_encoding(
+        self,
+        include_istiaatha=False,
+        include_bismillah=False,
+        include_sadaka=False,
+    ) -> EncodingOutput:
+        """returns the encoding of valid flags (see `_get_valid_flags`)"""
+        # The encoding table is computed once for every (aya, flags) and shared
+        # by all Aya objects of the same corpus
+        table = self.corpus.derived.setdefault(
+            ("imlaey2uthmani", self.settings.keys), {}
+        )
+        key = (
+            self.sura_idx,
+            self.aya_idx,
+            include_istiaatha,
+            include_bismillah,
+            include_sadaka,
+        )
+        if key not in table:
+            table[key] = self._build_imlaey_to_uthmani_encoding(
+                include_bismillah=include_bismillah,
+                include_istiaatha=include_istiaatha,
+                include_sadaka=include_sadaka,
+            )
+        return table[key]
+
+    def _get_imlaey_word_index(
+        self,
+        include_istiaatha=False,
+        include_bismillah=False,
+        include_sadaka=False,
+    ) -> ImlaeyWordIndex:
+        """returns the flat imlaey word index of the whole Quran (built once
+        per corpus). The flags are applied only to the ayat they are valid for.
+        """
+        key = (
+            "imlaey_word_index",
+            self.settings.keys,
+            include_istiaatha,
+            include_bismillah,
+            include_sadaka,
+        )
+        if key not in self.corpus.derived:
+            offsets = [0]
+            encodings = []
+            for abs_idx in range(1, self.corpus.total_ayat + 1):
+                aya = self.set_new_abs(abs_idx)
+                encoding = aya._get_encoding(
+                    *aya._get_valid_flags(
+                        include_istiaatha=include_istiaatha,
+                        include_bismillah=include_bismillah,
+                        include_sadaka=include_sadaka,
+                        warn=False,
+                    )
+                )
+                encodings.append(encoding)
+                offsets.append(offsets[-1] + len(encoding.imlaey_words))
+            self.corpus.derived[key] = ImlaeyWordIndex(
+                offsets=offsets, encodings=encodings
+            )
+        return self.corpus.derived[key]
+
+    def _locate_imlaey_word(
+        self, index: ImlaeyWordIndex, start: int
+    ) -> tuple[int, int]:
+        """returns (absolute aya idx starting from 0, imlaey word idx) of the
+        word `start` words away of the aya start word (circular looping)
+        """
+        pos = index.offsets[self.get_abs_aya_idx() - 1]
+        pos = (pos + self.start_imlaey_word_idx + start) % index.offsets[-1]
+        abs_idx = bisect_right(index.offsets, pos) - 1
+        return abs_idx, pos - index.offsets[abs_idx]
+
+    def precompute_encodings(self):
+        """Builds the imlaey to uthmani encoding table of every aya in the
+        corpus for all valid combinations of istiaatha, bismillah and sadaka
+        so that later calls of `imlaey_to_uthmani`, `get_by_imlaey_words`
+        and `step_by_imlaey_words` from any Aya sharing this corpus never
+        encode again
+        """
+        for abs_idx in range(1, self.corpus.total_ayat + 1):
+            aya = self.set_new_abs(abs_idx)
+            istiaatha_options = [False, True] if aya.aya_idx == 0 else [False]
+            bismillah_options = (
+                [False, True]
+                if aya.bismillah_uthmani_key in aya._get_aya(aya.sura_idx, aya.aya_idx)
+                else [False]
+            )
+            sadaka_options = [False, True] if aya.is_last() else [False]
+            for include_istiaatha in istiaatha_options:
+                for include_bismillah in bismillah_options:
+                    for include_sadaka in sadaka_options:
+                        aya._get_encoding(
+                            include_bismillah=include_bismillah,
+                            include_istiaatha=include_istiaatha,
+                            include_sadaka=include_sadaka,
+                        )
+
+    def _build_imlaey_to_uthmani_encoding(
+        self,
+        include_bismillah=False,
+        include_istiaatha=False,
+        include_sadaka=False,
+    ) -> EncodingOutput:
+        """Computes the encoding of `_encode_imlaey_to_uthmani` assuming that
+        the istiaatha, bismillah and sadaka flags are valid for the aya
+        """
+        uthmani_words = []
+        imlaey_words = []
+        istiaatha_imlaey_span_words = None
+        bismillah_imlaey_span_words = None
+        sadaka_imlaey_span_words = None
+        if include_istiaatha:
+            ist_start = len(imlaey_words)
+            uthmani_words += alpha.istiaatha.uthmani.split(self.join_prefix)
+            imlaey_words += alpha.istiaatha.imlaey.split(self.join_prefix)
+            istiaatha_imlaey_span_words = (ist_start, len(imlaey_words))
+
+        aya_format = self.get()
+        if include_bismillah:
+            bis_start = len(imlaey_words)
+            uthmani_words += aya_format.bismillah_uthmani.split(self.join_prefix)
+            imlaey_words += aya_format.bismillah_imlaey.split(self.join_prefix)
+            bismillah_imlaey_span_words = (bis_start, len(imlaey_words))
+
         # The Aya itself
         aya_imlaey_span_start = len(imlaey_words)
-        uthmani_words += self.get().uthmani_words
-        imlaey_words += self.get().imlaey_words
+        uthmani_words += aya_format.uthmani_words
+        imlaey_words += aya_format.imlaey_words
         aya_imlaey_span_words = (aya_imlaey_span_start, len(imlaey_words))
 
-        # NOTE: include sadaka and the aya is the last aya in the sura only
         if include_sadaka:
-            if (self.aya_idx + 1) == self.get().num_ayat_in_sura:
-                s_start = len(imlaey_words)
-                uthmani_words += alpha.sadaka.uthmani.split(self.join_prefix)
-                imlaey_words += alpha.sadaka.imlaey.split(self.join_prefix)
-                sadaka_imlaey_span_words = (s_start, len(imlaey_words))
-            else:
-                warnings.warn(
-                    f"صدق الله العظيم will not be included. We only include `sadaka` after the end of every sura. The Sura idx is: `{self.sura_idx + 1}`, the aya is: `{self.aya_idx + 1}` and the last aya is `{self.get().num_ayat_in_sura}` "
-                )
+            s_start = len(imlaey_words)
+            uthmani_words += alpha.sadaka.uthmani.split(self.join_prefix)
+            imlaey_words += alpha.sadaka.imlaey.split(self.join_prefix)
+            sadaka_imlaey_span_words = (s_start, len(imlaey_words))
 
         # Same words map to each other for both imlaey and uthmani
         if len(uthmani_words) == len(imlaey_words):
@@ -807,18 +1057,6 @@ class Aya(object):
         #
         assert sorted(imlaey2uthmani.values())[-1] == len(uthmani_words) - 1
 
-        # Saving the claculated inices in cache
-        self.decoding_cache["imlaey2uthmani"] = imlaey2uthmani
-        self.decoding_cache["uthmani_words"] = uthmani_words
-        self.decoding_cache["imlaey_words"] = imlaey_words
-        self.decoding_cache["aya_imlaey_span_words"] = aya_imlaey_span_words
-        self.decoding_cache["istiaatha_imlaey_span_words"] = istiaatha_imlaey_span_words
-        self.decoding_cache["bismillah_imlaey_span_words"] = bismillah_imlaey_span_words
-        self.decoding_cache["sadaka_imlaey_span_words"] = sadaka_imlaey_span_words
-        self.decoding_cache["include_istiaatha"] = include_istiaatha
-        self.decoding_cache["include_bismillah"] = include_bismillah
-        self.decoding_cache["include_sadaka"] = include_sadaka
-
         return EncodingOutput(
             imlaey2uthmani=imlaey2uthmani,
             uthmani_words=uthmani_words,
@@ -836,9 +1074,10 @@ class Aya(object):
         alphabet.unique_rasm.rasm_map
         Else: None
         """
-        for unique_rasm in alpha.unique_rasm.rasm_map:
-            span = len(unique_rasm["imlaey"].split(self.join_prefix))
-            if self.join_prefix.join(words[idx : idx + span]) == unique_rasm["imlaey"]:
+        for span, imlaey in _get_unique_rasm_imlaey(self.join_prefix).get(
+            words[idx], []
+        ):
+            if self.join_prefix.join(words[idx : idx + span]) == imlaey:
                 return span
         return None
 
@@ -847,6 +1086,8 @@ class Aya(object):
         imlaey_wordspan: WordSpan,
         imlaey2uthmani: dict[int, int],
         uthmani_words: list[str],
+        sura_idx: int | None = None,
+        aya_idx: int | None = None,
     ) -> str:
         """
         Args:
@@ -854,9 +1095,47 @@ class Aya(object):
                 start: the start word idx in imlaey script of the aya
                 end: the (end + 1) word idx in imlaey script of the aya if end
                     is None then means to the last word idx of the imlaey aya
+            sura_idx, aya_idx: (starting from 0) of the encoding used in error
+                messages. Defaults to the aya of this object
         return the uthmani script of the given imlaey_word_span in
         Imlaey script Aya
         """
+        start, end = self._check_imlaey_wordspan(
+            imlaey_wordspan,
+            imlaey2uthmani,
+            uthmani_words,
+            sura_idx=sura_idx,
+            aya_idx=aya_idx,
+        )
+
+        out_script = ""
+        prev_uth_idx = -1
+        for idx in range(start, end):
+            if prev_uth_idx != imlaey2uthmani[idx]:
+                out_script += uthmani_words[imlaey2uthmani[idx]]
+
+                # Adding space Except for end idx
+                if idx != end - 1:
+                    out_script += self.join_prefix
+            prev_uth_idx = imlaey2uthmani[idx]
+        return out_script
+
+    def _check_imlaey_wordspan(
+        self,
+        imlaey_wordspan: WordSpan,
+        imlaey2uthmani: dict[int, int],
+        uthmani_words: list[str],
+        sura_idx: int | None = None,
+        aya_idx: int | None = None,
+    ) -> tuple[int, int]:
+        """Raises `PartOfUthmaniWord` if the imlaey word span (see
+        `_decode_uthmani`) starts or ends inside an uthmani word
+
+        Returns:
+            (start, end) of the span (`end` is not None)
+        """
+        sura_idx = self.sura_idx if sura_idx is None else sura_idx
+        aya_idx = self.aya_idx if aya_idx is None else aya_idx
         start = imlaey_wordspan.start
         if imlaey_wordspan.end is None:
             end = len(imlaey2uthmani)
@@ -867,24 +1146,13 @@ class Aya(object):
         if end in imlaey2uthmani:
             if imlaey2uthmani[end - 1] == imlaey2uthmani[end]:
                 raise PartOfUthmaniWord(
-                    f"The Imlay Word is part of uthmani word, Sura: `{self.sura_idx + 1}`, Aya: `{self.aya_idx + 1}`, Imlaey Wordspan: ({start}, {end}), Uthmai Aya: {self.join_prefix.join(uthmani_words)}"
+                    f"The Imlay Word is part of uthmani word, Sura: `{sura_idx + 1}`, Aya: `{aya_idx + 1}`, Imlaey Wordspan: ({start}, {end}), Uthmai Aya: {self.join_prefix.join(uthmani_words)}"
                 )
         if (start > 0) and (imlaey2uthmani[start] == imlaey2uthmani[start - 1]):
             raise PartOfUthmaniWord(
-                f"The Imlay Word is part of uthmani word, Sura: `{self.sura_idx + 1}`, Aya: `{self.aya_idx + 1}`, Imlaey Wordspan: ({start}, {end}), Uthmai Aya: {self.join_prefix.join(uthmani_words)}"
+                f"The Imlay Word is part of uthmani word, Sura: `{sura_idx + 1}`, Aya: `{aya_idx + 1}`, Imlaey Wordspan: ({start}, {end}), Uthmai Aya: {self.join_prefix.join(uthmani_words)}"
             )
-
-        out_script = ""
-        prev_uth_idx = -1
-        for idx in range(start, end):
-            if prev_uth_idx != imlaey2uthmani[idx]:
-                out_script += uthmani_words[imlaey2uthmani[idx]]
-
-                # Adding space Except for end idx
-                if idx != end - 1:
-                    out_script += self.join_prefix
-            prev_uth_idx = imlaey2uthmani[idx]
-        return out_script
+        return start, end
 
     def _has_intersection(
         self, x: tuple[int, int] | None, y: tuple[int, int] | None
@@ -939,65 +1207,85 @@ class Aya(object):
             include_istiaatha=include_istiaatha,
             include_sadaka=include_sadaka,
         )
+        if return_checks:
+            return self._get_imlaey2uthmani_output(encoding_out, imlaey_word_span)
+        return self._decode_uthmani(
+            imlaey_wordspan=imlaey_word_span,
+            imlaey2uthmani=encoding_out.imlaey2uthmani,
+            uthmani_words=encoding_out.uthmani_words,
+        )
 
+    def _get_imlaey2uthmani_output(
+        self,
+        encoding_out: EncodingOutput,
+        imlaey_word_span: WordSpan,
+        sura_idx: int | None = None,
+        aya_idx: int | None = None,
+    ) -> Imlaey2uthmaniOutput:
+        """`imlaey_to_uthmani` with `return_checks=True` of the given encoding
+
+        Args:
+            sura_idx, aya_idx: (starting from 0) of the encoding. Defaults to
+                the aya of this object
+        """
         uthmani_script = self._decode_uthmani(
             imlaey_wordspan=imlaey_word_span,
             imlaey2uthmani=encoding_out.imlaey2uthmani,
             uthmani_words=encoding_out.uthmani_words,
+            sura_idx=sura_idx,
+            aya_idx=aya_idx,
         )
-        if return_checks:
-            end_imlaey = (
-                imlaey_word_span.end
-                if imlaey_word_span.end is not None
-                else len(encoding_out.imlaey_words)
+        end_imlaey = (
+            imlaey_word_span.end
+            if imlaey_word_span.end is not None
+            else len(encoding_out.imlaey_words)
+        )
+        input_iml_word_span = (imlaey_word_span.start, end_imlaey)
+        has_quran = self._has_intersection(
+            input_iml_word_span, encoding_out.aya_imlaey_span_words
+        )
+        if has_quran:
+            quran_imlaey_word_start = max(
+                imlaey_word_span.start - encoding_out.aya_imlaey_span_words[0], 0
             )
-            input_iml_word_span = (imlaey_word_span.start, end_imlaey)
-            has_quran = self._has_intersection(
-                input_iml_word_span, encoding_out.aya_imlaey_span_words
+            quran_imlaey_word_end = min(
+                end_imlaey - encoding_out.aya_imlaey_span_words[0],
+                encoding_out.aya_imlaey_span_words[1]
+                - encoding_out.aya_imlaey_span_words[0],
             )
-            if has_quran:
-                quran_imlaey_word_start = max(
-                    imlaey_word_span.start - encoding_out.aya_imlaey_span_words[0], 0
-                )
-                quran_imlaey_word_end = min(
-                    end_imlaey - encoding_out.aya_imlaey_span_words[0],
-                    encoding_out.aya_imlaey_span_words[1]
-                    - encoding_out.aya_imlaey_span_words[0],
-                )
-                quran_start = QuranWordIndex(
-                    imlaey=quran_imlaey_word_start,
-                    uthmani=encoding_out.imlaey2uthmani[quran_imlaey_word_start],
-                )
-                quran_end = QuranWordIndex(
-                    imlaey=quran_imlaey_word_end,
-                    uthmani=encoding_out.imlaey2uthmani[quran_imlaey_word_end - 1] + 1,
-                )
-            else:
-                quran_start = None
-                quran_end = None
-
-            return Imlaey2uthmaniOutput(
-                imlaey=self.join_prefix.join(
-                    encoding_out.imlaey_words[imlaey_word_span.start : end_imlaey]
-                ),
-                uthmani=uthmani_script,
-                quran_start=quran_start,
-                quran_end=quran_end,
-                has_quran=has_quran,
-                has_istiaatha=self._has_intersection(
-                    input_iml_word_span,
-                    encoding_out.istiaatha_imlaey_span_words,
-                ),
-                has_bismillah=self._has_intersection(
-                    input_iml_word_span,
-                    encoding_out.bismillah_imlaey_span_words,
-                ),
-                has_sadaka=self._has_intersection(
-                    input_iml_word_span,
-                    encoding_out.sadaka_imlaey_span_words,
-                ),
+            quran_start = QuranWordIndex(
+                imlaey=quran_imlaey_word_start,
+                uthmani=encoding_out.imlaey2uthmani[quran_imlaey_word_start],
+            )
+            quran_end = QuranWordIndex(
+                imlaey=quran_imlaey_word_end,
+                uthmani=encoding_out.imlaey2uthmani[quran_imlaey_word_end - 1] + 1,
             )
-        return uthmani_script
+        else:
+            quran_start = None
+            quran_end = None
+
+        return Imlaey2uthmaniOutput(
+            imlaey=self.join_prefix.join(
+                encoding_out.imlaey_words[imlaey_word_span.start : end_imlaey]
+            ),
+            uthmani=uthmani_script,
+            quran_start=quran_start,
+            quran_end=quran_end,
+            has_quran=has_quran,
+            has_istiaatha=self._has_intersection(
+                input_iml_word_span,
+                encoding_out.istiaatha_imlaey_span_words,
+            ),
+            has_bismillah=self._has_intersection(
+                input_iml_word_span,
+                encoding_out.bismillah_imlaey_span_words,
+            ),
+            has_sadaka=self._has_intersection(
+                input_iml_word_span,
+                encoding_out.sadaka_imlaey_span_words,
+            ),
+        )
 
     def get_by_imlaey_words(
         self,
@@ -1033,33 +1321,12 @@ class Aya(object):
             - Retrieves last 2 words of previous ayah (114:6)
             - First 3 words of Surah 1:1
         """
-        start_aya = self
-        # making the start relative to the saved (self.start_imaley_words_idx)
-        start += self.start_imlaey_word_idx
-        if start < 0:
-            new_start = start
-            while new_start < 0:
-                start_aya = start_aya.step(-1)
-                encoding_out = start_aya._encode_imlaey_to_uthmani(
-                    include_bismillah=include_bismillah,
-                    include_istiaatha=include_istiaatha,
-                    include_sadaka=include_sadaka,
-                )
-                new_start += len(encoding_out.imlaey_words)
-            start = new_start
-
-        # Moving the aya to the start position
-        while True:
-            encoding_out = start_aya._encode_imlaey_to_uthmani(
-                include_bismillah=include_bismillah,
-                include_istiaatha=include_istiaatha,
-                include_sadaka=include_sadaka,
-            )
-            num_iml_words = len(encoding_out.imlaey_words)
-            if start < num_iml_words:
-                break
-            start -= num_iml_words
-            start_aya = start_aya.step(1)
+        index = self._get_imlaey_word_index(
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+        )
+        abs_idx, start = self._locate_imlaey_word(index, start)
 
         imlaey_str = ""
         uthmani_str = ""
@@ -1070,27 +1337,21 @@ class Aya(object):
         first_time = True
         quran_word_start: QuranWordIndex | None = None
         quran_word_end: QuranWordIndex | None = None
-        start_aya_idx = start_aya.get().aya_idx
-        start_sura_idx = start_aya.get().sura_idx
-        loop_aya = start_aya
+        start_sura_idx, start_aya_idx = self.corpus.get_sura_aya_idx(abs_idx)
         while window > 0:
             if imlaey_str != "":
                 imlaey_str += self.join_prefix
             if uthmani_str != "":
                 uthmani_str += self.join_prefix
 
-            encoding_out = loop_aya._encode_imlaey_to_uthmani(
-                include_bismillah=include_bismillah,
-                include_istiaatha=include_istiaatha,
-                include_sadaka=include_sadaka,
-            )
+            encoding_out = index.encodings[abs_idx]
+            end_sura_idx, end_aya_idx = self.corpus.get_sura_aya_idx(abs_idx)
             end = min(start + window, len(encoding_out.imlaey_words))
-            iml2uth_out = loop_aya.imlaey_to_uthmani(
+            iml2uth_out = self._get_imlaey2uthmani_output(
+                encoding_out,
                 WordSpan(start, end),
-                include_istiaatha=include_istiaatha,
-                include_bismillah=include_bismillah,
-                include_sadaka=include_sadaka,
-                return_checks=True,
+                sura_idx=end_sura_idx,
+                aya_idx=end_aya_idx,
             )
 
             if first_time and iml2uth_out.has_quran:
@@ -1106,28 +1367,67 @@ class Aya(object):
 
             if has_quran:
                 quran_word_end = iml2uth_out.quran_end
-            end_aya_idx = loop_aya.get().aya_idx
-            end_sura_idx = loop_aya.get().sura_idx
 
             # Steping
             assert end > start
             window -= end - start
-            loop_aya = loop_aya.step(1)
+            abs_idx = (abs_idx + 1) % len(index.encodings)
             start = 0
 
         return SegmentScripts(
             imalaey=imlaey_str,
             uthmani=uthmani_str,
-            start_span=(start_sura_idx, start_aya_idx, quran_word_start)
+            start_span=(start_sura_idx + 1, start_aya_idx + 1, quran_word_start)
+            if has_quran
+            else None,
+            end_span=(end_sura_idx + 1, end_aya_idx + 1, quran_word_end)
             if has_quran
             else None,
-            end_span=(end_sura_idx, end_aya_idx, quran_word_end) if has_quran else None,
             has_quran=has_quran,
             has_istiaatha=has_istiaatha,
             has_bismillah=has_bismillah,
             has_sadaka=has_sadaka,
         )
 
+    def _get_imlaey_words_region(
+        self,
+        start: int,
+        num_words: int,
+        include_istiaatha=False,
+        include_bismillah=False,
+        include_sadaka=False,
+    ) -> tuple[list[str], list[bool]]:
+        """returns the `num_words` imlaey words starting from `start` (see
+        `get_by_imlaey_words`) and for every word boundary (`num_words` + 1)
+        whether a segment can start or end at it. A segment can not
+        start or end inside a uthmani word (ex: يا أيها)
+
+        So `get_by_imlaey_words(start + i, j - i)` for `i < j` raises
+        `PartOfUthmaniWord` if `can_split[i]` or `can_split[j]` is False
+        and its imlaey script is the `words[i:j]`
+        """
+        index = self._get_imlaey_word_index(
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+        )
+        abs_idx, word_idx = self._locate_imlaey_word(index, start)
+        words = []
+        can_split = []
+        while len(can_split) <= num_words:
+            encoding = index.encodings[abs_idx]
+            imlaey2uthmani = encoding.imlaey2uthmani
+            for idx in range(word_idx, len(encoding.imlaey_words)):
+                if len(can_split) > num_words:
+                    break
+                can_split.append(
+                    idx == 0 or imlaey2uthmani[idx] != imlaey2uthmani[idx - 1]
+                )
+                words.append(encoding.imlaey_words[idx])
+            abs_idx = (abs_idx + 1) % len(index.encodings)
+            word_idx = 0
+        return words[:num_words], can_split
+
     def step_by_imlaey_words(
         self,
         start: int,
@@ -1163,37 +1463,15 @@ class Aya(object):
                 Position at word 1 of next ayah (1:2)
 
         """
-        step = self.start_imlaey_word_idx + start + window
-
-        loop_aya = self
-        # -ve step
-        if step < 0:
-            while step < 0:
-                loop_aya = loop_aya.step(-1)
-                encoding_out = loop_aya._encode_imlaey_to_uthmani(
-                    include_bismillah=include_bismillah,
-                    include_istiaatha=include_istiaatha,
-                    include_sadaka=include_sadaka,
-                )
-                step += len(encoding_out.imlaey_words)
-        # -ve step
-        else:
-            while True:
-                encoding_out = loop_aya._encode_imlaey_to_uthmani(
-                    include_bismillah=include_bismillah,
-                    include_istiaatha=include_istiaatha,
-                    include_sadaka=include_sadaka,
-                )
-                if step < len(encoding_out.imlaey_words):
-                    break
-                step -= len(encoding_out.imlaey_words)
-                loop_aya = loop_aya.step(1)
-
-        return Aya(
-            sura_idx=loop_aya.sura_idx + 1,
-            aya_idx=loop_aya.aya_idx + 1,
-            start_imlaey_word_idx=step,
-            quran_dict=self.quran_dict,
+        index = self._get_imlaey_word_index(
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+        )
+        abs_idx, step = self._locate_imlaey_word(index, start + window)
+        sura_idx, aya_idx = self.corpus.get_sura_aya_idx(abs_idx)
+        return self._from_cursor(
+            AyaCursor(sura_idx=sura_idx, aya_idx=aya_idx, start_imlaey_word_idx=step)
         )
 
 
@@ -1202,9 +1480,13 @@ class SearchItem:
     start_aya: Aya | None
     num_ayat: int
     imlaey_word_span: WordSpan | None
-    uthmani_script: str
     has_bismillah: bool = False
     has_istiaatha: bool = False
+    score: float = 1.0
+    suffix: str = field(default=" ", repr=False)
+    _uthmani_script: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
     """
     start_aya (Aya): the start aya of the first search
 
@@ -1219,11 +1501,38 @@ class SearchItem:
         start: the start word idx of the imlaey scriptin thestart_aya
         end: the end imlaey_idx of the imlaey (start_aya + num_ayat - 1)
 
-    uthmani_script (str) the equvilent uthmani script of the given imlaey script
+    uthmani_script (str) the equvilent uthmani script of the given imlaey script.
+        Decoded on first access (then cached) if not given. `__eq__` and
+        `__repr__` do not decode it: the items are compared by the fields it
+        is decoded from (`suffix` included)
+
+    score (float): the match ratio of the text (1 for exact matches see
+        `fuzzy.fuzzy_search`)
+
     if istiaatha is only will return:
         start_aya=None, num_ayat=None, imlaey_word_span=None, has_bismillah=None
     """
 
+    def __init__(
+        self,
+        start_aya: Aya | None,
+        num_ayat: int,
+        imlaey_word_span: WordSpan | None,
+        uthmani_script: str | None = None,
+        has_bismillah: bool = False,
+        has_istiaatha: bool = False,
+        score: float = 1.0,
+        suffix: str = " ",
+    ):
+        self.start_aya = start_aya
+        self.num_ayat = num_ayat
+        self.imlaey_word_span = imlaey_word_span
+        self.has_bismillah = has_bismillah
+        self.has_istiaatha = has_istiaatha
+        self.score = score
+        self.suffix = suffix
+        self._uthmani_script = uthmani_script
+
     def __str__(self):
         out_str = ""
         if self.start_aya:
@@ -1238,13 +1547,35 @@ class SearchItem:
 
         return out_str
 
+    @property
+    def uthmani_script(self) -> str | None:
+        if self._uthmani_script is None and self.start_aya is not None:
+            uthmani_script = _get_uthmani_of_result_item(self, suffix=self.suffix)
+            if self.has_istiaatha:
+                uthmani_script = (
+                    self.start_aya.istiaatha_uthmani + self.suffix + uthmani_script
+                )
+            self._uthmani_script = uthmani_script
+        return self._uthmani_script
+
+    @uthmani_script.setter
+    def uthmani_script(self, uthmani_script: str | None):
+        self._uthmani_script = uthmani_script
+
+
+# `search` windows of fewer ayat are scanned by a regex over the normalized
+# window ayat: it is fast enough and does not build the whole Quran index
+# (and normalized corpus) in short lived processes
+_INDEX_MIN_AYAT = 100
+
 
 # TODO: Add Examples
 def search(
     text: str,
-    start_aya: Aya = Aya(1, 1),
-    window: int = 2,
+    start_aya: Aya | None = None,
+    window: int | None = 2,
     suffix=" ",
+    spans_only=False,
     **kwargs,
 ) -> list[SearchItem]:
     """searches the Holy Quran of Imlaey script to match the given text
@@ -1259,12 +1590,23 @@ def search(
     Args:
         text (str): the text to search with (expected with imlaey script)
 
-        start_aya (Aya): The Pivot Aya to set Search with.
+        start_aya (Aya | None): The Pivot Aya to set Search with.
+            If None: `Aya(1, 1)` is used
 
-        winodw (int): the search winodw:
-        [start_aya - winowd //2, start_aya + winodw //2]
+        winodw (int | None): the search winodw:
+        [start_aya - winowd //2, start_aya + winodw //2]. If None the whole
+        Quran is searched. Windows of `_INDEX_MIN_AYAT` ayat or more only
+        filter the results of the whole Quran index so they cost nearly
+        nothing
 
         suffix (str): the suffix that sperate the quran words either imlaey or uthmani
+
+        spans_only (bool): if True only the word spans are found: the items
+        are not checked to start and end at uthmani words (no
+        `PartOfUthmaniWord` is raised) and `uthmani_script` is decoded only
+        if it is accessed. Otherwise `uthmani_script` is still decoded on
+        first access (only the word boundaries are checked)
+
         the rest of **kwargs are from normalize_aya function below
     Returns:
         list[SearchItem]: Every SearchItem is:
@@ -1285,87 +1627,173 @@ def search(
         NOTE: if istiaatha is only will return:
         start_aya=None, num_ayat=None, imlaey_word_span=None, has_bismillah=None
     """
+    if start_aya is None:
+        start_aya = Aya(1, 1)
     normalized_text: str = normalize_aya(text, remove_spaces=True, **kwargs)
     if normalized_text == "":
         return []
 
     # Prepare ayat within [-window/2, window/2]
-    loop_aya = start_aya.step(-window // 2)
+    if window is None:
+        loop_aya = start_aya.set_new_abs(1)
+    else:
+        loop_aya = start_aya.step(-window // 2)
 
     # ----------------------------------
     # Checking for Itiaatha
     # ----------------------------------
     # NOTE: Assuming Istiaatha is at the first only
-    has_istiaatha = False
-    istiaatha_imlaey_words = normalize_aya(
-        start_aya.get().istiaatha_imlaey,
-        remove_spaces=False,
-        **kwargs,
-    ).split(suffix)
-    istiaatha_imlaey_str = "".join(istiaatha_imlaey_words)
-    re_span = re.search(istiaatha_imlaey_str, normalized_text)
-    if re_span:
-        normalized_text = normalized_text[re_span.span()[1] :]
-        has_istiaatha = True
-        if normalized_text == "":
-            # return istiaatha only
-            return [
-                SearchItem(
-                    start_aya=None,
-                    num_ayat=0,
-                    imlaey_word_span=None,
-                    has_bismillah=False,
-                    has_istiaatha=has_istiaatha,
-                    uthmani_script=start_aya.get().istiaatha_uthmani,
-                )
-            ]
+    normalized_text, has_istiaatha = _strip_istiaatha(
+        normalized_text, start_aya, suffix=suffix, **kwargs
+    )
+    if has_istiaatha and normalized_text == "":
+        # return istiaatha only
+        return [
+            SearchItem(
+                start_aya=None,
+                num_ayat=0,
+                imlaey_word_span=None,
+                has_bismillah=False,
+                has_istiaatha=has_istiaatha,
+                uthmani_script=start_aya.get().istiaatha_uthmani,
+            )
+        ]
+
+    # the whole Quran index is used for wide windows unless the window ayat
+    # wrap around the end of the Quran or the text is a regex
+    num_ayat = start_aya.corpus.total_ayat if window is None else window + 1
+    use_index = (
+        suffix == start_aya.join_prefix
+        and re.escape(normalized_text) == normalized_text
+        and num_ayat >= _INDEX_MIN_AYAT
+        and loop_aya.get_abs_aya_idx() - 1 + num_ayat <= start_aya.corpus.total_ayat
+    )
 
     found = []
     for bismillah_flag in [False, True]:
-        aya_imlaey_words, aya_imlaey_str = _get_imlaey_words_and_str(
-            start_aya=loop_aya,
-            window=window,
-            suffix=suffix,
-            include_bismillah=bismillah_flag,
-            **kwargs,
-        )
-
-        for re_search in re.finditer(normalized_text, aya_imlaey_str):
-            if re_search is not None:
-                span = _get_words_span(
-                    start=re_search.span()[0],
-                    end=re_search.span()[1],
-                    words_list=aya_imlaey_words,
+        if use_index:
+            spans = _search_index(
+                normalized_text,
+                loop_aya=loop_aya,
+                num_ayat=num_ayat,
+                include_bismillah=bismillah_flag,
+                **kwargs,
+            )
+        else:
+            spans = _search_regex(
+                normalized_text,
+                loop_aya=loop_aya,
+                window=num_ayat - 1,
+                suffix=suffix,
+                include_bismillah=bismillah_flag,
+                **kwargs,
+            )
+        for start_vertex, end_vertex in spans:
+            found.append(
+                SearchItem(
+                    start_aya=loop_aya.step(start_vertex.aya_idx),
+                    num_ayat=end_vertex.aya_idx - start_vertex.aya_idx + 1,
+                    imlaey_word_span=WordSpan(
+                        start=start_vertex.word_idx, end=end_vertex.word_idx
+                    ),
+                    has_bismillah=bismillah_flag,
+                    has_istiaatha=has_istiaatha,
+                    suffix=suffix,
                 )
-                if span is not None:
-                    start_vertex, end_vertex = span
-                    found.append(
-                        SearchItem(
-                            start_aya=loop_aya.step(start_vertex.aya_idx),
-                            num_ayat=end_vertex.aya_idx - start_vertex.aya_idx + 1,
-                            imlaey_word_span=WordSpan(
-                                start=start_vertex.word_idx, end=end_vertex.word_idx
-                            ),
-                            has_bismillah=bismillah_flag,
-                            has_istiaatha=has_istiaatha,
-                            uthmani_script="",
-                        )
-                    )
-                    found[-1].uthmani_script = _get_uthmani_of_result_item(
-                        found[-1], suffix=suffix
-                    )
+            )
+            if not spans_only:
+                _check_result_item(found[-1])
         if found != []:
-            # add istiaatah uthamni script
-            if has_istiaatha:
-                for item in found:
-                    item.uthmani_script = (
-                        start_aya.get().istiaatha_uthmani + suffix + item.uthmani_script
-                    )
             return found
 
     return found
 
 
+class AyaNormalizer(object):
+    def __init__(
+        self,
+        remove_spaces=True,
+        ignore_hamazat=False,
+        ignore_alef_maksoora=True,
+        ignore_taa_marboota=False,
+        normalize_taat=False,
+        remove_small_alef=True,
+        remove_tashkeel=False,
+        cache_size: int | None = 2**16,
+    ):
+        """Compiled `normalize_aya` (see its arguments): all the single
+        character substitutions and removals are one `str.translate` table
+        built once and the normalized texts of the last `cache_size` inputs
+        are cached (None: no limit, 0: no cache)
+
+        Use `get_normalizer` to share normalizers of the same arguments
+        """
+        assert not (ignore_taa_marboota and normalize_taat), (
+            "You can not `ignore_taa_marboota` and `normaize_taat` at the same time"
+        )
+        self.remove_spaces = remove_spaces
+
+        # (characters, replacement) in the order of `normalize_aya`
+        steps = []
+        if ignore_alef_maksoora:
+            steps.append((alpha.imlaey.alef_maksoora, alpha.imlaey.alef))
+        if ignore_hamazat:
+            steps.append((alpha.imlaey.hamazat, alpha.imlaey.hamza))
+        if ignore_taa_marboota:
+            steps.append((alpha.imlaey.taa_marboota, alpha.imlaey.haa))
+        if normalize_taat:
+            steps.append((alpha.imlaey.taa_marboota, alpha.imlaey.taa_mabsoota))
+        if remove_small_alef:
+            steps.append((alpha.imlaey.small_alef, ""))
+        if remove_tashkeel:
+            steps.append((alpha.imlaey.tashkeel, ""))
+
+        # composing the steps: a step applies to the outputs of the former
+        self.table: dict[int, str] = {}
+        for chars, replacement in steps:
+            for key, value in self.table.items():
+                if value and value in chars:
+                    self.table[key] = replacement
+            for c in chars:
+                self.table.setdefault(ord(c), replacement)
+
+        if cache_size == 0:
+            self._cached_normalize = self._normalize
+        else:
+            self._cached_normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, text: str) -> str:
+        if self.remove_spaces:
+            # the same whitespace characters of `\s`
+            text = "".join(text.split())
+        return text.translate(self.table)
+
+    def __call__(self, text: str) -> str:
+        return self._cached_normalize(text)
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(
+    remove_spaces=True,
+    ignore_hamazat=False,
+    ignore_alef_maksoora=True,
+    ignore_taa_marboota=False,
+    normalize_taat=False,
+    remove_small_alef=True,
+    remove_tashkeel=False,
+) -> AyaNormalizer:
+    """Returns the `AyaNormalizer` of the arguments (built once per process)"""
+    return AyaNormalizer(
+        remove_spaces=remove_spaces,
+        ignore_hamazat=ignore_hamazat,
+        ignore_alef_maksoora=ignore_alef_maksoora,
+        ignore_taa_marboota=ignore_taa_marboota,
+        normalize_taat=normalize_taat,
+        remove_small_alef=remove_small_alef,
+        remove_tashkeel=remove_tashkeel,
+    )
+
+
 def normalize_aya(
     text: str,
     remove_spaces=True,
@@ -1404,48 +1832,284 @@ def normalize_aya(
         Return:
             str: the normalied imlaey text
     """
-    assert not (ignore_taa_marboota and normalize_taat), (
-        "You can not `ignore_taa_marboota` and `normaize_taat` at the same time"
+    return get_normalizer(
+        remove_spaces,
+        ignore_hamazat,
+        ignore_alef_maksoora,
+        ignore_taa_marboota,
+        normalize_taat,
+        remove_small_alef,
+        remove_tashkeel,
+    )(text)
+
+
+_NORMALIZE_DEFAULTS = {
+    name: param.default
+    for name, param in inspect.signature(normalize_aya).parameters.items()
+    if name not in {"text", "remove_spaces"}
+}
+
+
+def _get_normalize_profile(**kwargs) -> dict:
+    """All the `normalize_aya` arguments that affect single words"""
+    kwargs.pop("remove_spaces", None)
+    assert set(kwargs) <= set(_NORMALIZE_DEFAULTS), (
+        f"Unknown normalization arguments: {set(kwargs) - set(_NORMALIZE_DEFAULTS)}"
+    )
+    return {**_NORMALIZE_DEFAULTS, **kwargs}
+
+
+def _build_normalized_corpus(aya: "Aya", **kwargs) -> NormalizedQuranCorpus:
+    normalizer = AyaNormalizer(cache_size=None, **kwargs)
+    texts = {"imlaey": [], "bismillah_imlaey": []}
+    word_starts = {script: [0] for script in texts}
+    word_offsets = {script: [0] for script in texts}
+    for abs_idx in range(1, aya.corpus.total_ayat + 1):
+        aya_format = aya.set_new_abs(abs_idx).get()
+        bismillah_words = []
+        if aya_format.bismillah_imlaey is not None:
+            bismillah_words = aya_format.bismillah_imlaey.split(aya.join_prefix)
+        for script, words in [
+            ("imlaey", aya_format.imlaey_words),
+            ("bismillah_imlaey", bismillah_words),
+        ]:
+            for word in words:
+                norm_word = normalizer(word)
+                texts[script].append(norm_word)
+                word_starts[script].append(word_starts[script][-1] + len(norm_word))
+            word_offsets[script].append(word_offsets[script][-1] + len(words))
+    return NormalizedQuranCorpus(
+        texts={script: "".join(words) for script, words in texts.items()},
+        word_starts=word_starts,
+        word_offsets=word_offsets,
     )
 
-    norm_text = text
 
-    # TODO: Ingonre alef as hamza
+def _get_normalized_corpus_key(aya: "Aya", profile: dict) -> tuple:
+    return ("normalized_corpus", aya.settings.keys, tuple(sorted(profile.items())))
 
-    if remove_spaces:
-        norm_text = re.sub(r"\s+", "", norm_text)
 
-    if ignore_alef_maksoora:
-        norm_text = re.sub(alpha.imlaey.alef_maksoora, alpha.imlaey.alef, norm_text)
+def _get_loaded_normalized_corpus(
+    aya: "Aya", **kwargs
+) -> NormalizedQuranCorpus | None:
+    """Returns the normalized corpus (see `get_normalized_corpus`) if it is
+    already built or loaded in this process else None
+    """
+    profile = _get_normalize_profile(**kwargs)
+    return aya.corpus.derived.get(_get_normalized_corpus_key(aya, profile))
 
-    if ignore_hamazat:
-        norm_text = re.sub(f"[{alpha.imlaey.hamazat}]", alpha.imlaey.hamza, norm_text)
 
-    if ignore_taa_marboota:
-        norm_text = re.sub(
-            f"[{alpha.imlaey.taa_marboota}]",
-            alpha.imlaey.haa,
-            norm_text,
+def get_normalized_corpus(
+    aya: "Aya | None" = None,
+    cache_dir: str | Path | None = None,
+    save=True,
+    **kwargs,
+) -> NormalizedQuranCorpus:
+    """Returns the imlaey words of the whole Quran normalized by
+    `normalize_aya` with `kwargs` (`remove_spaces` has no effect as words are
+    normalized separately)
+
+    The corpus is built once per process for every normalization profile
+    and saved to `cache_dir` as a file named by a hash of the profile, the
+    script keys and the script file (`QuranCorpus.version`) so the next
+    processes load it instead. Editable corpora are never saved.
+
+    Args:
+        aya (Aya | None): its corpus and script keys are used. If None
+            `Aya()` is used
+        cache_dir (str | Path | None): the directory of the saved corpora.
+            If None `corpus.get_cache_dir()` is used
+        save (bool): save the built corpus to `cache_dir`
+    """
+    if aya is None:
+        aya = Aya()
+    profile = _get_normalize_profile(**kwargs)
+    key = _get_normalized_corpus_key(aya, profile)
+    if key in aya.corpus.derived:
+        return aya.corpus.derived[key]
+
+    path = None
+    if aya.corpus.version is not None:
+        name = hashlib.sha1(
+            json.dumps([aya.corpus.version, key[1:]]).encode("utf8")
+        ).hexdigest()
+        path = Path(cache_dir or get_cache_dir()) / f"{name}{NORMALIZED_SUFFIX}"
+
+    normalized = None
+    if path is not None and path.is_file():
+        try:
+            normalized = NormalizedQuranCorpus.load(path)
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Rebuilding the normalized corpus `{path}`: {e}")
+        if normalized is not None and (
+            normalized.total_ayat != aya.corpus.total_ayat
+        ):
+            normalized = None
+    if normalized is None:
+        normalized = _build_normalized_corpus(aya, **profile)
+        if save and path is not None:
+            try:
+                normalized.save(path)
+            except OSError as e:
+                warnings.warn(
+                    f"Could not save the normalized corpus to `{path}`: {e}"
+                )
+    aya.corpus.derived[key] = normalized
+    return normalized
+
+
+class ImlaeySearchIndex(object):
+    def __init__(
+        self,
+        normalized: NormalizedQuranCorpus,
+        include_bismillah=False,
+        key_len=32,
+    ):
+        """Sparse suffix array of the normalized imlaey text of the whole
+        Quran (words joined without spaces): only the suffixes starting at
+        words are indexed as `search` matches start at words only.
+
+        Suffixes are sorted by their first `key_len` characters so queries
+        longer than `key_len` are checked against the text after the lookup
+
+        Args:
+            include_bismillah (bool): the bismillah words are the first words
+                of the ayat having bismillah
+        """
+        self.key_len = key_len
+        self.include_bismillah = include_bismillah
+        if include_bismillah:
+            texts = []
+            self.word_starts = [0]
+            self.aya_word_offsets = [0]
+            for abs_idx in range(normalized.total_ayat):
+                for script in ["bismillah_imlaey", "imlaey"]:
+                    words = normalized.get_aya_word_range(abs_idx, script)
+                    starts = normalized.word_starts[script]
+                    texts.append(normalized.get_text(words.start, words.stop, script))
+                    self.word_starts += [
+                        self.word_starts[-1] + starts[idx + 1] - starts[words.start]
+                        for idx in words
+                    ]
+                self.aya_word_offsets.append(len(self.word_starts) - 1)
+            self.text = "".join(texts)
+        else:
+            self.text = normalized.texts["imlaey"]
+            self.word_starts = list(normalized.word_starts["imlaey"])
+            self.aya_word_offsets = list(normalized.word_offsets["imlaey"])
+
+        # the first word of every character start (words may be empty)
+        suffixes = []
+        for word_idx in range(len(self.word_starts) - 1):
+            char_idx = self.word_starts[word_idx]
+            if char_idx < len(self.text) and (
+                word_idx == 0 or self.word_starts[word_idx - 1] != char_idx
+            ):
+                suffixes.append(word_idx)
+        self.suffixes = sorted(
+            suffixes,
+            key=lambda w: self.text[self.word_starts[w] : self.word_starts[w] + key_len],
         )
 
-    if normalize_taat:
-        norm_text = re.sub(
-            f"[{alpha.imlaey.taa_marboota}]",
-            alpha.imlaey.taa_mabsoota,
-            norm_text,
+    def find(self, pattern: str) -> list[int]:
+        """Returns the indices of the words where `pattern` starts (sorted)"""
+        prefix = pattern[: self.key_len]
+
+        def _get_key(word_idx: int) -> str:
+            start = self.word_starts[word_idx]
+            return self.text[start : start + len(prefix)]
+
+        lo = bisect_left(self.suffixes, prefix, key=_get_key)
+        hi = bisect_right(self.suffixes, prefix, lo=lo, key=_get_key)
+        words = self.suffixes[lo:hi]
+        if len(pattern) > len(prefix):
+            words = [
+                w for w in words if self.text.startswith(pattern, self.word_starts[w])
+            ]
+        return sorted(words)
+
+    def get_end_word(self, start_word: int, end_char: int) -> int | None:
+        """Returns the (exclusive) end word of the first word after
+        `start_word` ending at `end_char` or None if `end_char` is inside a
+        word
+        """
+        idx = bisect_left(self.word_starts, end_char, lo=start_word + 1)
+        if idx < len(self.word_starts) and self.word_starts[idx] == end_char:
+            return idx
+        return None
+
+    def get_vertex(self, word_idx: int, end=False) -> tuple[int, int]:
+        """Returns (absolute aya index from 0, word index in the aya) of a
+        start word or an (exclusive) end word
+        """
+        aya_idx = bisect_right(self.aya_word_offsets, word_idx - end) - 1
+        return aya_idx, word_idx - self.aya_word_offsets[aya_idx]
+
+
+def _get_search_index(
+    aya: "Aya", include_bismillah=False, **kwargs
+) -> ImlaeySearchIndex:
+    """Returns the `ImlaeySearchIndex` of a normalization profile (built
+    once per corpus)
+    """
+    profile = _get_normalize_profile(**kwargs)
+    key = (
+        "search_index",
+        aya.settings.keys,
+        include_bismillah,
+        tuple(sorted(profile.items())),
+    )
+    if key not in aya.corpus.derived:
+        aya.corpus.derived[key] = ImlaeySearchIndex(
+            get_normalized_corpus(aya, **profile),
+            include_bismillah=include_bismillah,
         )
+    return aya.corpus.derived[key]
 
-    if remove_small_alef:
-        norm_text = re.sub(alpha.imlaey.small_alef, "", norm_text)
 
-    if remove_tashkeel:
-        norm_text = re.sub(f"[{alpha.imlaey.tashkeel}]", "", norm_text)
+@dataclass
+class WordsOffsets:
+    """Character offsets of the words of ayat joined without spaces
+
+    Attributes:
+        aya_offsets: the flat index of the first word of every aya
+            (number of ayat + 1)
+        start_to_word: the start character of a word -> the flat index of
+            the first word starting there
+        end_to_word: the end character (exclusive) of a word -> the flat
+            index of the first word ending there
+    """
 
-    return norm_text
+    aya_offsets: list[int]
+    start_to_word: dict[int, int]
+    end_to_word: dict[int, int]
+
+
+def _get_words_offsets(words_list: list[list[str]]) -> WordsOffsets:
+    aya_offsets = [0]
+    start_to_word: dict[int, int] = {}
+    end_to_word: dict[int, int] = {}
+    chars_count = 0
+    word_idx = 0
+    for aya_words in words_list:
+        for word in aya_words:
+            start_to_word.setdefault(chars_count, word_idx)
+            chars_count += len(word)
+            end_to_word.setdefault(chars_count, word_idx)
+            word_idx += 1
+        aya_offsets.append(word_idx)
+    return WordsOffsets(
+        aya_offsets=aya_offsets,
+        start_to_word=start_to_word,
+        end_to_word=end_to_word,
+    )
 
 
 def _get_words_span(
-    start: int, end: int, words_list: list[list[str]]
+    start: int,
+    end: int,
+    words_list: list[list[str]],
+    offsets: WordsOffsets | None = None,
 ) -> tuple[Vertex, Vertex] | None:
     """
     return the word indices at every word boundary only not inside the word:
@@ -1467,6 +2131,9 @@ def _get_words_span(
         start (int): the start char idx
         end (int): the end char idx + 1
         words_list (list[list[str]]): given words
+        offsets (WordsOffsets | None): the offsets of `words_list` (see
+            `_get_words_offsets`) to share between the spans of the same
+            words. Every span is then found in O(log(number of ayat))
 
     return: WordSpan:
         start: the start idx of the word in "words"
@@ -1474,49 +2141,165 @@ def _get_words_span(
         if valid boundary else None
     """
 
-    def _get_start_span(start_char: int) -> tuple[int, int] | None:
-        chars_count = 0
-        for aya_idx in range(len(words_list)):
-            for word_idx in range(len(words_list[aya_idx])):
-                if start_char == chars_count:
-                    return aya_idx, word_idx
-                chars_count += len(words_list[aya_idx][word_idx])
-            aya_idx += 1
+    if offsets is None:
+        offsets = _get_words_offsets(words_list)
+    start_word = offsets.start_to_word.get(start)
+    end_word = offsets.end_to_word.get(end)
+    if start_word is None or end_word is None or start >= end:
         return None
 
-    def _get_end_span(
-        end_char: int, chars_count=0, start_aya_idx=0, start_word_idx=0
-    ) -> tuple[int, int] | None:
-        for aya_idx in range(start_aya_idx, len(words_list)):
-            for word_idx in range(start_word_idx, len(words_list[aya_idx])):
-                chars_count += len(words_list[aya_idx][word_idx])
-                if end_char == chars_count:
-                    return aya_idx, word_idx + 1
-            start_word_idx = 0
-        return None
+    # `end_word` is the last word of the span
+    start_aya_idx = bisect_right(offsets.aya_offsets, start_word) - 1
+    end_aya_idx = bisect_right(offsets.aya_offsets, end_word) - 1
+    return (
+        Vertex(
+            aya_idx=start_aya_idx,
+            word_idx=start_word - offsets.aya_offsets[start_aya_idx],
+        ),
+        Vertex(
+            aya_idx=end_aya_idx,
+            word_idx=end_word - offsets.aya_offsets[end_aya_idx] + 1,
+        ),
+    )
 
-    # print('start=', start, ', end=', end)
-    span = _get_start_span(start)
-    # print(f'start=({span})')
-    if span is None:
-        return None
-    start_aya_idx, start_word_idx = span
 
-    span = _get_end_span(
-        end,
-        chars_count=start,
-        start_aya_idx=start_aya_idx,
-        start_word_idx=start_word_idx,
+def _strip_istiaatha(
+    normalized_text: str, aya: Aya, suffix=" ", **kwargs
+) -> tuple[str, bool]:
+    """Removes the istiaatha and what is before it from the normalized text
+
+    Returns:
+        (the text after the istiaatha, whether the istiaatha is found)
+    """
+    istiaatha_imlaey_words = normalize_aya(
+        aya.get().istiaatha_imlaey,
+        remove_spaces=False,
+        **kwargs,
+    ).split(suffix)
+    istiaatha_imlaey_str = "".join(istiaatha_imlaey_words)
+    re_span = re.search(istiaatha_imlaey_str, normalized_text)
+    if re_span:
+        return normalized_text[re_span.span()[1] :], True
+    return normalized_text, False
+
+
+def _search_regex(
+    normalized_text: str,
+    loop_aya: Aya,
+    window: int,
+    suffix=" ",
+    include_bismillah=False,
+    **kwargs,
+) -> list[tuple[Vertex, Vertex]]:
+    """Matches `normalized_text` as a regex over the ayat
+    [loop_aya, loop_aya + window]
+
+    Returns:
+        the (start, end) word spans of the matches. The aya indices are
+        relative to `loop_aya`
+    """
+    aya_imlaey_words, aya_imlaey_str = _get_imlaey_words_and_str(
+        start_aya=loop_aya,
+        window=window,
+        suffix=suffix,
+        include_bismillah=include_bismillah,
+        **kwargs,
     )
-    # print(f'end=({span})')
-    if span is None:
-        return None
-    end_aya_idx, end_word_idx = span
-    return (
-        Vertex(aya_idx=start_aya_idx, word_idx=start_word_idx),
-        Vertex(aya_idx=end_aya_idx, word_idx=end_word_idx),
+    offsets = _get_words_offsets(aya_imlaey_words)
+    spans = []
+    for re_search in re.finditer(normalized_text, aya_imlaey_str):
+        span = _get_words_span(
+            start=re_search.span()[0],
+            end=re_search.span()[1],
+            words_list=aya_imlaey_words,
+            offsets=offsets,
+        )
+        if span is not None:
+            spans.append(span)
+    return spans
+
+
+def _get_finditer_starts(
+    text: str, pattern: str, starts: list[int], first_char=0
+) -> list[int]:
+    """Returns the occurrences of `pattern` in `text` among `starts` that
+    `re.finditer(re.escape(pattern), text[first_char:])` would return: an
+    occurrence is skipped if it overlaps a returned occurrence before it
+    (the ones not in `starts` too). Only the occurrences overlapping
+    `starts` are looked for so it costs nearly nothing if they do not
+    overlap
+    """
+    # occurrence -> returned by `re.finditer`
+    returned: dict[int, bool] = {}
+
+    def _is_returned(pos: int) -> bool:
+        if pos not in returned:
+            returned[pos] = True
+            # the occurrences starting in (pos - len(pattern), pos)
+            end = pos + len(pattern) - 1
+            other = text.find(pattern, max(first_char, pos - len(pattern) + 1), end)
+            while other != -1:
+                if _is_returned(other):
+                    returned[pos] = False
+                    break
+                other = text.find(pattern, other + 1, end)
+        return returned[pos]
+
+    return [pos for pos in starts if _is_returned(pos)]
+
+
+def _search_index(
+    normalized_text: str,
+    loop_aya: Aya,
+    num_ayat: int,
+    include_bismillah=False,
+    **kwargs,
+) -> list[tuple[Vertex, Vertex]]:
+    """Finds the occurrences of `normalized_text` in the ayat
+    [loop_aya, loop_aya + num_ayat - 1] using the whole Quran
+    `ImlaeySearchIndex`. The same spans as `_search_regex` are returned:
+    occurrences overlapping a former one are skipped like `re.finditer`
+
+    Returns:
+        the (start, end) word spans of the matches. The aya indices are
+        relative to `loop_aya`
+    """
+    index = _get_search_index(loop_aya, include_bismillah=include_bismillah, **kwargs)
+    first_aya = loop_aya.get_abs_aya_idx() - 1
+    start_word = index.aya_word_offsets[first_aya]
+    end_word = index.aya_word_offsets[first_aya + num_ayat]
+    end_char = index.word_starts[end_word]
+    matches = []
+    for word_idx in index.find(normalized_text):
+        match_end = index.word_starts[word_idx] + len(normalized_text)
+        if word_idx < start_word or match_end > end_char:
+            continue
+        match_end_word = index.get_end_word(word_idx, match_end)
+        if match_end_word is not None:
+            matches.append((word_idx, match_end_word))
+    finditer_starts = set(
+        _get_finditer_starts(
+            index.text,
+            normalized_text,
+            [index.word_starts[word_idx] for word_idx, _ in matches],
+            first_char=index.word_starts[start_word],
+        )
     )
 
+    spans = []
+    for word_idx, match_end_word in matches:
+        if index.word_starts[word_idx] not in finditer_starts:
+            continue
+        start_aya_idx, start_word_idx = index.get_vertex(word_idx)
+        end_aya_idx, end_word_idx = index.get_vertex(match_end_word, end=True)
+        spans.append(
+            (
+                Vertex(aya_idx=start_aya_idx - first_aya, word_idx=start_word_idx),
+                Vertex(aya_idx=end_aya_idx - first_aya, word_idx=end_word_idx),
+            )
+        )
+    return spans
+
 
 def _get_uthmani_of_result_item(search_item: SearchItem, suffix=" ") -> str:
     """
@@ -1542,6 +2325,37 @@ def _get_uthmani_of_result_item(search_item: SearchItem, suffix=" ") -> str:
     return uthmani_str
 
 
+def _check_result_item(search_item: SearchItem) -> None:
+    """Raises `PartOfUthmaniWord` like `_get_uthmani_of_result_item` if the
+    span of the search item starts or ends inside an uthmani word without
+    decoding its uthmani script
+    """
+    span = search_item.imlaey_word_span
+    start_aya = search_item.start_aya
+    if search_item.num_ayat == 1:
+        checks = [(start_aya, span)]
+    else:
+        checks = [
+            (start_aya, WordSpan(start=span.start, end=None)),
+            (
+                start_aya.step(search_item.num_ayat - 1),
+                WordSpan(start=0, end=span.end),
+            ),
+        ]
+    for aya, wordspan in checks:
+        include_istiaatha, include_bismillah, include_sadaka = aya._get_valid_flags(
+            include_bismillah=search_item.has_bismillah, warn=False
+        )
+        encoding = aya._get_encoding(
+            include_istiaatha=include_istiaatha,
+            include_bismillah=include_bismillah,
+            include_sadaka=include_sadaka,
+        )
+        aya._check_imlaey_wordspan(
+            wordspan, encoding.imlaey2uthmani, encoding.uthmani_words
+        )
+
+
 def _get_imlaey_words_and_str(
     start_aya: Aya,
     window: int,
@@ -1557,7 +2371,25 @@ def _get_imlaey_words_and_str(
     """
     aya_imlaey_words: list[list[str]] = []
     aya_imlaey_str = ""
+    # the normalized words are looked up instead of normalizing every aya if
+    # the normalized corpus is loaded or worth loading
+    normalized = None
+    if suffix == start_aya.join_prefix:
+        normalized = _get_loaded_normalized_corpus(start_aya, **kwargs)
+        if normalized is None and window + 1 >= _INDEX_MIN_AYAT:
+            normalized = get_normalized_corpus(start_aya, **kwargs)
     for aya in start_aya.get_ayat_after(num_ayat=window + 1):
+        if normalized is not None:
+            abs_idx = aya.get_abs_aya_idx() - 1
+            aya_words = normalized.get_aya_words(abs_idx)
+            if include_bismillah:
+                aya_words = (
+                    normalized.get_aya_words(abs_idx, "bismillah_imlaey") + aya_words
+                )
+            aya_imlaey_words.append(aya_words)
+            aya_imlaey_str += "".join(aya_words)
+            continue
+
         aya_words = []
 
         # Including Bismillah at The start of sura except for:
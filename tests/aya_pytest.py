@@ -1,8 +1,53 @@
+import asyncio
+import copy
+import shutil
+import subprocess
+import sys
+
 import pytest
 
-from quran_transcript import Aya, WordSpan
-from quran_transcript.utils import SegmentScripts, QuranWordIndex, PartOfUthmaniWord
-from quran_transcript.tasmeea import check_sura_missing_parts, merge_segment_scritps
+from quran_transcript import (
+    Aya,
+    AyaNormalizer,
+    normalize_aya,
+    WordSpan,
+    load_quran_corpus,
+    compile_quran_corpus,
+    CompiledQuranCorpus,
+    NormalizedQuranCorpus,
+    get_normalized_corpus,
+    search,
+    fuzzy_search,
+    search_many,
+    AhoCorasick,
+    get_sura_qgram_index,
+    get_quran_qgram_index,
+)
+from quran_transcript import scorers
+from quran_transcript.corpus import ReadOnlyCorpusError
+from quran_transcript.utils import (
+    AyaCursor,
+    Vertex,
+    _get_finditer_starts,
+    _get_words_offsets,
+    _get_words_span,
+    _search_index,
+    _search_regex,
+    SegmentScripts,
+    QuranWordIndex,
+    PartOfUthmaniWord,
+    SearchItem,
+)
+from quran_transcript.tasmeea import (
+    check_sura_missing_parts,
+    merge_segment_scritps,
+    tasmeea_sura,
+    tasmeea_sura_multi_part,
+    tasmeea_quran,
+    tasmeea_batch,
+    TasmeeaSession,
+    get_match_ratio,
+)
 
 
 @pytest.mark.parametrize(
@@ -1370,3 +1415,645 @@ def test_merge_segscritps(
 ):
     out_seg = merge_segment_scritps(seg_scripts)
     assert out_seg == ex_seg
+
+
+def test_shared_corpus():
+    aya = Aya(2, 255)
+    assert aya.corpus is load_quran_corpus()
+    assert aya.step(1000).corpus is aya.corpus
+    assert aya.step_by_imlaey_words(0, 40).corpus is aya.corpus
+    with pytest.raises(ReadOnlyCorpusError):
+        aya.set_rasm_map([[w] for w in aya.get().uthmani_words], [[w] for w in aya.get().imlaey_words])
+
+
+def test_private_corpus():
+    quran_dict = copy.deepcopy(load_quran_corpus().quran_dict)
+    aya = Aya(114, 1, quran_dict=quran_dict)
+    assert aya.corpus is not load_quran_corpus()
+    aya.set_rasm_map([[w] for w in aya.get().uthmani_words], [[w] for w in aya.get().imlaey_words])
+    assert aya.get().rasm_map is not None
+    assert aya.step(1).quran_dict is quran_dict
+    assert Aya(114, 1).get().rasm_map is None
+
+
+def test_import_loads_no_data_files():
+    code = (
+        "import sys\n"
+        "opened = []\n"
+        "sys.addaudithook(lambda ev, args: opened.append(args[0]) "
+        "if ev == 'open' and 'quran-script' in str(args[0]) else None)\n"
+        "import quran_transcript\n"
+        "from quran_transcript import search, tasmeea_sura, alphabet\n"
+        "print(len(opened))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "0"
+
+
+def test_compiled_corpus(tmp_path):
+    json_corpus = load_quran_corpus()
+    compiled_path = compile_quran_corpus(tmp_path / "quran.bin")
+    corpus = CompiledQuranCorpus(compiled_path)
+    assert corpus.num_ayat == json_corpus.num_ayat
+    for sura_idx in range(corpus.num_suar):
+        assert corpus.get_sura_name(sura_idx) == json_corpus.get_sura_name(sura_idx)
+        for aya_idx in range(corpus.num_ayat[sura_idx]):
+            assert corpus.get_aya(sura_idx, aya_idx) == json_corpus.get_aya(
+                sura_idx, aya_idx
+            )
+            assert corpus.get_aya_words(
+                sura_idx, aya_idx, "uthmani"
+            ) == json_corpus.get_aya_words(sura_idx, aya_idx, "uthmani")
+
+    # a single sura is decoded without the whole script
+    assert corpus.get_sura_object(1) == json_corpus.get_sura_object(1)
+    assert corpus._quran_dict is None
+    assert corpus.quran_dict["quran"]["sura"][1] == corpus.get_sura_object(1)
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    aya = Aya(2, 255, corpus=corpus)
+    assert aya.get() == Aya(2, 255).get()
+    assert load_quran_corpus(compiled_path) is load_quran_corpus(compiled_path)
+
+    # the compiled file beside the json script is used automatically
+    json_path = tmp_path / "quran-copy.json"
+    shutil.copy(json_corpus.quran_path, json_path)
+    compile_quran_corpus(quran_path=json_path)
+    assert isinstance(load_quran_corpus(json_path), CompiledQuranCorpus)
+
+    # a compiled file of another script is not used even if it is newer
+    edited_path = tmp_path / "quran-edited.json"
+    shutil.copy(json_corpus.quran_path, edited_path)
+    shutil.copy(json_path.with_suffix(".bin"), edited_path.with_suffix(".bin"))
+    with open(edited_path, "a", encoding="utf8") as f:
+        f.write("\n")
+    assert not isinstance(load_quran_corpus(edited_path), CompiledQuranCorpus)
+
+
+@pytest.mark.parametrize(
+    "aya, step_len, ex_sura_idx, ex_aya_idx",
+    [
+        (Aya(1, 1), 0, 1, 1),
+        (Aya(1, 1), -1, 114, 6),
+        (Aya(114, 6), 1, 1, 1),
+        (Aya(1, 7), 1, 2, 1),
+        (Aya(3, 1), -287, 1, 7),
+        (Aya(5, 108), -6686, 3, 34),
+        (Aya(2, 255), 6236, 2, 255),
+        (Aya(2, 255), 6236 * 3 + 1, 2, 256),
+    ],
+)
+def test_step(aya: Aya, step_len: int, ex_sura_idx: int, ex_aya_idx: int):
+    out_aya = aya.step(step_len)
+    assert out_aya.get().sura_idx == ex_sura_idx
+    assert out_aya.get().aya_idx == ex_aya_idx
+
+
+def test_abs_aya_idx():
+    assert Aya(1, 1).get_abs_aya_idx() == 1
+    assert Aya(2, 1).get_abs_aya_idx() == 8
+    assert Aya(114, 6).get_abs_aya_idx() == 6236
+    aya = Aya(1, 1).set_new_abs(6236)
+    assert (aya.get().sura_idx, aya.get().aya_idx) == (114, 6)
+    assert aya.is_last()
+    assert not Aya(2, 285).is_last()
+    assert len(list(Aya(1, 1).get_ayat_after())) == 6236
+    assert [a.get_abs_aya_idx() for a in Aya(114, 5).get_ayat_after(num_ayat=3)] == [
+        6235,
+        6236,
+        1,
+    ]
+
+
+def test_shared_encoding_table():
+    aya = Aya(2, 1)
+    encoding = aya._encode_imlaey_to_uthmani(include_bismillah=True)
+    # a new Aya of the same corpus reuses the encoding
+    assert aya.step(0)._encode_imlaey_to_uthmani(include_bismillah=True) is encoding
+    assert encoding.bismillah_imlaey_span_words == (0, 4)
+
+    # invalid flags are ignored (with a warning) and share the plain encoding
+    aya = Aya(2, 2)
+    with pytest.warns(UserWarning):
+        encoding = aya._encode_imlaey_to_uthmani(
+            include_istiaatha=True, include_sadaka=True
+        )
+    assert encoding is aya._encode_imlaey_to_uthmani()
+    assert encoding.istiaatha_imlaey_span_words is None
+    assert encoding.sadaka_imlaey_span_words is None
+
+    # precomputed for every aya and every valid flags
+    aya = Aya(quran_dict=copy.deepcopy(load_quran_corpus().quran_dict))
+    aya.precompute_encodings()
+    table = aya.corpus.derived[("imlaey2uthmani", aya.settings.keys)]
+    # extra: istiaatha (114), bismillah with and without istiaatha (112 * 2), sadaka (114)
+    assert len(table) == 6236 + 114 + 112 * 2 + 114
+    assert aya.set_new(12, 31).imlaey_to_uthmani(WordSpan(0, None)) == (
+        aya.set_new(12, 31).get().uthmani
+    )
+
+
+def test_imlaey_word_index():
+    aya = Aya(1, 1)
+    index = aya._get_imlaey_word_index()
+    num_words = index.offsets[-1]
+    assert len(index.offsets) == 6237
+    assert index.offsets[1] == 4
+
+    # circular looping over the whole Quran
+    seg = aya.get_by_imlaey_words(start=0, window=6)
+    assert aya.get_by_imlaey_words(start=-num_words, window=6) == seg
+    assert aya.get_by_imlaey_words(start=2 * num_words, window=6) == seg
+    assert seg.start_span == (1, 1, seg.start_span[2])
+    assert seg.end_span[:2] == (1, 2)
+
+    out_aya = Aya(2, 1).step_by_imlaey_words(start=-3, window=1)
+    assert (out_aya.get().sura_idx, out_aya.get().aya_idx) == (1, 7)
+    assert out_aya.get_start_imlaey_word_idx() == len(Aya(1, 7).get().imlaey_words) - 2
+    out_aya = Aya(1, 1).step_by_imlaey_words(start=0, window=num_words + 5)
+    assert (out_aya.get().sura_idx, out_aya.get().aya_idx) == (1, 2)
+    assert out_aya.get_start_imlaey_word_idx() == 1
+
+
+def test_aya_cursor():
+    aya = Aya(2, 255)
+    assert aya.cursor == AyaCursor(sura_idx=1, aya_idx=254, start_imlaey_word_idx=0)
+    next_aya = aya.step(1)
+    # stepping shares the corpus and the keys and only allocates a new cursor
+    assert next_aya.settings is aya.settings
+    assert next_aya.cursor == AyaCursor(1, 255)
+    assert not hasattr(next_aya, "__dict__")
+    with pytest.raises(AttributeError):
+        next_aya.cursor.aya_idx = 3
+
+    aya.set(2, 256, start_imlaey_word_idx=2)
+    assert aya.cursor == AyaCursor(1, 255, 2)
+
+
+def test_memoized_aya_format():
+    aya = Aya(3, 7)
+    assert aya.get() is aya.get()
+    assert Aya(3, 7).get() is aya.get()
+    assert aya.step(1).get() is not aya.get()
+    assert aya.get().imlaey_words == aya.get().imlaey.split(" ")
+
+
+@pytest.mark.parametrize(
+    "ref, other, min_ratio",
+    [
+        ("abcdefghij", "abcdefghij", 0.9),
+        ("abcdefghij", "abcdefghXX", 0.8),
+        ("abcdefghij", "abcdefghXX", 0.81),
+        ("abcdefghij", "abc", 0.5),
+        ("abc", "xyz", 0.0),
+        ("abcdefg", "abcdefgabcdefg", 0.3),
+    ],
+)
+def test_bounded_match_ratio(ref, other, min_ratio):
+    ratio = get_match_ratio(ref, other)
+    bounded_ratio = get_match_ratio(ref, other, min_ratio=min_ratio)
+    if ratio >= min_ratio:
+        assert bounded_ratio == ratio
+    else:
+        assert bounded_ratio < min_ratio
+
+
+def test_imlaey_words_region():
+    aya = Aya(2, 21)
+    words, can_split = aya._get_imlaey_words_region(start=-2, num_words=6)
+    assert len(words) == 6 and len(can_split) == 7
+    # يَا أَيُّهَا is a single uthmani word
+    assert words[2:4] == aya.get().imlaey_words[:2]
+    assert not can_split[3]
+    for i in range(6):
+        for j in range(i + 1, 7):
+            if can_split[i] and can_split[j]:
+                seg = aya.get_by_imlaey_words(start=i - 2, window=j - i)
+                assert seg.imalaey == " ".join(words[i:j])
+            else:
+                with pytest.raises(PartOfUthmaniWord):
+                    aya.get_by_imlaey_words(start=i - 2, window=j - i)
+
+
+def test_parallel_tasmeea_sura():
+    segments = [
+        aya.get().imlaey for aya in Aya(67, 1).get_ayat_after(num_ayat=30)
+    ]
+    # a wrong segment breaks the chain of the second chunk
+    segments[9] = "نص لا يوجد في القرآن"
+    kwargs = dict(overlap_words=6, window_words=20, acceptance_ratio=0.8)
+    outs = tasmeea_sura(segments, 67, **kwargs)
+    parallel_outs = tasmeea_sura(
+        segments, 67, num_workers=2, chunk_segments=5, **kwargs
+    )
+    assert parallel_outs == outs
+    assert outs[9][0] is None
+    assert outs[29][0].end_span[:2] == (67, 30)
+
+
+def test_tasmeea_batch():
+    def _segments(sura_idx):
+        return [
+            [aya.get().imlaey]
+            for aya in Aya(sura_idx, 1).get_ayat_after(
+                num_ayat=Aya(sura_idx, 1).get().num_ayat_in_sura
+            )
+        ]
+
+    jobs = [(114, _segments(114)), (112, _segments(112)), (114, _segments(114)[:3])]
+    kwargs = dict(overlap_words=4, window_words=10, acceptance_ratio=0.8)
+    expected = [
+        tasmeea_sura_multi_part(copy.deepcopy(segs), sura_idx, **kwargs)
+        for sura_idx, segs in jobs
+    ]
+    assert tasmeea_batch(copy.deepcopy(jobs), **kwargs) == expected
+    outs = tasmeea_batch(
+        copy.deepcopy(jobs),
+        num_workers=2,
+        jobs_per_task=1,
+        max_in_flight=1,
+        **kwargs,
+    )
+    assert outs == expected
+
+
+def test_sura_qgram_index():
+    index = get_sura_qgram_index(2, remove_spaces=True, remove_tashkeel=True)
+    aya = Aya(2, 255)
+    word_idx = index.get_word_idx(aya.cursor)
+    assert index.get_word_idx(Aya(2, 1).cursor) == 0
+    assert index.get_word_idx(Aya(3, 1).cursor) is None
+    text = " ".join(aya.get().imlaey_words[3:12])
+    assert index.query(text, top_k=3)[0] == word_idx + 3
+    assert get_sura_qgram_index(2, remove_tashkeel=True, remove_spaces=True) is index
+
+
+def test_tasmeea_reanchoring():
+    segments = [aya.get().imlaey for aya in Aya(2, 1).get_ayat_after(num_ayat=40)]
+    # skipped ayat after two wrong segments
+    segments = segments[:10] + ["كلام لا يوجد في القرآن", "نص آخر"] + segments[25:]
+    kwargs = dict(overlap_words=6, window_words=20, acceptance_ratio=0.8)
+    outs = tasmeea_sura(segments, 2, use_qgram_index=True, **kwargs)
+    assert [idx for idx, out in enumerate(outs) if out[0] is None] == [10, 11]
+    assert outs[12][0].start_span[:2] == (2, 26)
+
+
+def test_tasmeea_qgram_index_overlaps():
+    # overlapping segments of Al-Mumtahanah (from tests/test_tasmeea_multi.py)
+    # starting up to `overlap_words` back which the index may not propose
+    segments = [aya.get().imlaey for aya in Aya(60, 1).get_ayat_after(num_ayat=3)]
+    segments += [
+        "قَدْ كَانَتْ لَكُمْ أُسْوَةٌ حَسَنَةٌ فِي إِبْرَاهِيمَ وَالَّذِينَ مَعَهُ إِذْ قَالُوا لِقَوْمِهِمْ إِنَّا بُرَاءَاءُ مِنْكُمْ وَمِمَّا تَعْبُدُونَ مِنْ دُونِ اللَّهِ",
+        "إِذْ قَالُوا لِقَوْمِهِمْ إِنَّا بُرَاءُ مِنْكُمْ وَمِمَّا تَعْبُدُونَ مِنْ دُونِ اللَّهِ كَفَرْنَا بِكُمْ وَبَدَا بَيْنَنَا وَبَيْنَكُمُ الْعَدَاوَةُ وَالْبَغْضَاءُ أَبَدًا حَتَّى تُؤْمِنُوا بِاللَّهِ وَحْدًا",
+        "لَاكُمُ الْعَدَاوَةُ وَالْبَغْضَاءُ أَبَدًا حَتَّى تُؤْمِنُوا بِاللَّهِ وَحْدَهُ",
+        "وَبَدَا بَيْنَنَا وَبَيْنَكُمُ الْعَدَاوَةُ وَالْبَغْضَاءُ أَبَدًا حَتَّى تُؤْمِنُوا بِاللَّهِ وَحْدَهُ إِلَّا قَوْلَ إِبْرَاهِيمَ لِأَبِيهِ لَأَسْتَغْفِرَنَّ لَكَ وَمَا أَمْلِكُ لَكَ مِنَ اللَّهِ مِنْ شَيْءٍ",
+        "إِلَّا قَوْلَ إِبْرَاهِيمَ لِأَبِيهِ لَأَسْتَغْفِرَنَّ لَكَ وَمَا أَمْلِكُ لَكَ مِنَ اللَّهِ مِنْ شَيْءٍ رَبَّنَا عَلَيْكَ تَوَكَّلْنَا وَإِلَيْكَ أَنَا ابْنَا وَإِلَيْكَ الْمَصِيرُ",
+    ]
+    kwargs = dict(remove_tashkeel=True)
+    outs = tasmeea_sura(segments, 60, **kwargs)
+    index_outs = tasmeea_sura(segments, 60, use_qgram_index=True, **kwargs)
+    assert [ratio for _, ratio in index_outs] == [ratio for _, ratio in outs]
+    assert [out[0].start_span for out in index_outs] == [
+        out[0].start_span for out in outs
+    ]
+
+
+@pytest.mark.parametrize(
+    "scorer_name", ["levenshtein", "banded", "token", "phonetic", "numpy"]
+)
+def test_window_scorers(scorer_name):
+    if scorer_name == "numpy":
+        pytest.importorskip("numpy")
+    scorer = scorers.get_scorer(scorer_name)
+    words = ["الحمد", "لله", "رب", "العالمين", "الرحمن", "الرحيم"]
+    region = "".join(words)
+    word_starts = [0]
+    for word in words:
+        word_starts.append(word_starts[-1] + len(word))
+    text_words = ["الحمد", "لله", "رب", "العلمين"]
+    text = "".join(text_words)
+    ratios = scorer.window_ratios(
+        text, region, word_starts, 0, [1, 3, 4, 6], text_words=text_words
+    )
+    if scorer_name == "token":
+        assert ratios == [0.25, 0.75, 0.75, 0.25]
+    elif scorer_name == "phonetic":
+        assert scorer.ratio("الصراط", "السراط") == 1.0
+    else:
+        assert ratios == [
+            get_match_ratio(text, region[: word_starts[last]]) for last in [1, 3, 4, 6]
+        ]
+    assert scorer.window_ratios(text, region, word_starts, 1, [], 0.0, text_words) == []
+
+    segments = [aya.get().imlaey for aya in Aya(93, 1).get_ayat_after(num_ayat=11)]
+    kwargs = dict(overlap_words=4, window_words=10, acceptance_ratio=0.8)
+    outs = tasmeea_sura(segments, 93, scorer=scorer_name, **kwargs)
+    assert [out[0] for out in outs] == [
+        out[0] for out in tasmeea_sura(segments, 93, **kwargs)
+    ]
+
+
+def test_tasmeea_dp_alignment():
+    segments = [aya.get().imlaey for aya in Aya(2, 1).get_ayat_after(num_ayat=20)]
+    segments = segments[:5] + ["كلام لا يوجد في القرآن", "نص آخر"] + segments[7:]
+    kwargs = dict(overlap_words=6, window_words=20, acceptance_ratio=0.8)
+    outs = tasmeea_sura(segments, 2, alignment="dp", **kwargs)
+    assert [out[0] for out in outs] == [
+        out[0] for out in tasmeea_sura(segments, 2, **kwargs)
+    ]
+    assert [idx for idx, out in enumerate(outs) if out[0] is None] == [5, 6]
+    assert outs[7][0].start_span[:2] == (2, 8)
+
+    segments = [Aya(1, 1).istiaatha_imlaey, Aya(93, 1).get().bismillah_imlaey]
+    segments += [aya.get().imlaey for aya in Aya(93, 1).get_ayat_after(num_ayat=11)]
+    segments.append("صدق الله العظيم")
+    outs = tasmeea_sura(segments, 93, alignment="dp", **kwargs)
+    assert outs == tasmeea_sura(segments, 93, **kwargs)
+    assert outs[0][0].has_istiaatha
+    assert outs[1][0].has_bismillah
+    assert outs[-1][0].has_sadaka
+
+
+def test_tasmeea_session():
+    segments = [Aya(1, 1).istiaatha_imlaey]
+    segments += [aya.get().imlaey for aya in Aya(93, 1).get_ayat_after(num_ayat=11)]
+    segments.insert(4, "كلام لا يوجد في القرآن")
+    segments.append("صدق الله العظيم")
+    kwargs = dict(overlap_words=4, window_words=10, acceptance_ratio=0.8)
+    expected = tasmeea_sura(segments, 93, **kwargs)
+
+    session = TasmeeaSession(93, **kwargs)
+    outs = [
+        session.push(seg, is_last=idx + 1 == len(segments))
+        for idx, seg in enumerate(segments)
+    ]
+    assert outs == expected
+    assert outs[-1][0].has_sadaka
+
+    async def _push_all():
+        session = TasmeeaSession(93, **kwargs)
+        return await asyncio.gather(
+            *[
+                session.apush(seg, is_last=idx + 1 == len(segments))
+                for idx, seg in enumerate(segments)
+            ]
+        )
+
+    assert asyncio.run(_push_all()) == expected
+
+
+def test_quran_qgram_index():
+    index = get_quran_qgram_index(remove_spaces=True, remove_tashkeel=True)
+    cursor = AyaCursor(sura_idx=35, aya_idx=11, start_imlaey_word_idx=2)
+    assert index.get_cursor(index.get_word_idx(cursor)) == cursor
+    starts = index.query(" ".join(Aya(36, 12).get().imlaey_words[:8]))
+    assert index.get_cursor(starts[0]) == AyaCursor(35, 11, 0)
+
+
+def test_tasmeea_quran():
+    aya = Aya(112, 1)
+    segments = [aya.istiaatha_imlaey, aya.get().bismillah_imlaey]
+    segments += [a.get().imlaey for a in aya.get_ayat_after(num_ayat=4)]
+    segments.append(Aya(113, 1).get().bismillah_imlaey)
+    segments += [a.get().imlaey for a in Aya(113, 1).get_ayat_after(num_ayat=5)]
+    segments.append("صدق الله العظيم")
+    outs = tasmeea_quran(segments, acceptance_ratio=0.7)
+    assert all(ratio == 1.0 for _, ratio in outs)
+    assert outs[0][0].has_istiaatha
+    assert outs[6][0].has_bismillah
+    assert outs[7][0].start_span[:2] == (113, 1)
+    assert outs[-1][0].has_sadaka
+
+    # starting in the middle of a sura
+    segments = [a.get().imlaey for a in Aya(2, 30).get_ayat_after(num_ayat=5)]
+    outs = tasmeea_quran(segments, acceptance_ratio=0.8)
+    assert [out[0].start_span[:2] for out in outs] == [(2, idx) for idx in range(30, 35)]
+    outs = tasmeea_quran(segments, acceptance_ratio=0.8, scorer="token")
+    assert [out[0].start_span[:2] for out in outs] == [(2, idx) for idx in range(30, 35)]
+
+
+def test_aya_normalizer():
+    text = "إِنَّ الصَّلَاةَ كَانَتْ عَلَى الْمُؤْمِنِينَ\tكِتَٰبًا"
+    normalizer = AyaNormalizer(
+        ignore_hamazat=True, normalize_taat=True, remove_tashkeel=True
+    )
+    assert normalizer(text) == "ءنالصلاتكانتعلاالمءمنينكتبا"
+    assert normalizer(text) == normalize_aya(
+        text, ignore_hamazat=True, normalize_taat=True, remove_tashkeel=True
+    )
+    assert AyaNormalizer(remove_spaces=False, cache_size=0)(text) == (
+        "إِنَّ الصَّلَاةَ كَانَتْ عَلَا الْمُؤْمِنِينَ\tكِتَبًا"
+    )
+    with pytest.raises(AssertionError):
+        normalize_aya(text, ignore_taa_marboota=True, normalize_taat=True)
+
+
+def test_normalized_corpus(tmp_path):
+    kwargs = dict(ignore_taa_marboota=True, remove_small_alef=False)
+    normalized = get_normalized_corpus(cache_dir=tmp_path, **kwargs)
+    aya = Aya(2, 255)
+    assert normalized.get_aya_words(aya.get_abs_aya_idx() - 1) == [
+        normalize_aya(w, **kwargs) for w in aya.get().imlaey_words
+    ]
+    assert normalized.get_aya_words(0, "bismillah_imlaey") == []
+    assert normalized.get_aya_words(7, "bismillah_imlaey") == (
+        normalize_aya(Aya(2, 1).get().bismillah_imlaey, remove_spaces=False, **kwargs)
+    ).split(" ")
+
+    # saved once per profile and loaded by the next processes
+    (path,) = tmp_path.iterdir()
+    loaded = NormalizedQuranCorpus.load(path)
+    assert loaded.texts == normalized.texts
+    for script in ["imlaey", "bismillah_imlaey"]:
+        assert list(loaded.word_starts[script]) == normalized.word_starts[script]
+        assert list(loaded.word_offsets[script]) == normalized.word_offsets[script]
+    assert get_normalized_corpus(cache_dir=tmp_path, **kwargs) is normalized
+
+
+def test_search_index():
+    kwargs = dict(remove_tashkeel=True)
+    results = search("الله لا إله إلا هو الحي القيوم", window=None, **kwargs)
+    assert [(r.start_aya.sura_idx, r.start_aya.aya_idx) for r in results] == [
+        (1, 254),
+        (2, 1),
+    ]
+    assert results[0].imlaey_word_span == WordSpan(start=0, end=7)
+
+    # small windows, regex texts and windows wrapping around the Quran use
+    # the regex scan
+    results = search("الحي القي.م", start_aya=Aya(3, 2), window=2, **kwargs)
+    assert [(r.start_aya.sura_idx, r.start_aya.aya_idx) for r in results] == [(2, 1)]
+    assert len(search("الحي القي.م", start_aya=Aya(3, 2), **kwargs)) == 1
+    results = search("بسم الله", start_aya=Aya(114, 6), window=2, **kwargs)
+    assert [(r.start_aya.sura_idx, r.start_aya.aya_idx) for r in results] == [(0, 0)]
+
+
+def test_search_index_like_regex():
+    assert _get_finditer_starts("aaaaa", "aa", [0, 1, 2, 3]) == [0, 2]
+    assert _get_finditer_starts("aaaaa", "aa", [1, 2, 3], first_char=1) == [1, 3]
+    # an occurrence of "وهو" in 6:102 overlaps a former one (not at a word)
+    kwargs = dict(remove_tashkeel=True)
+    text = normalize_aya("وهو", remove_spaces=True, **kwargs)
+    spans = _search_index(text, Aya(6, 101), 6, **kwargs)
+    assert len(spans) == 3
+    assert spans == _search_regex(text, Aya(6, 101), 5, **kwargs)
+    spans = _search_index(text, Aya(6, 101), 201, **kwargs)
+    assert spans == _search_regex(text, Aya(6, 101), 200, **kwargs)
+
+
+def test_fuzzy_search():
+    kwargs = dict(remove_tashkeel=True)
+    # one deleted and two substituted characters
+    results = fuzzy_search("الله لا اله الا هو الحى القيم", top_k=2, **kwargs)
+    assert [(r.start_aya.sura_idx, r.start_aya.aya_idx) for r in results] == [
+        (1, 254),
+        (2, 1),
+    ]
+    assert results[0].imlaey_word_span == WordSpan(start=0, end=7)
+    assert 0.8 < results[0].score < 1
+
+    # the exact matches first
+    results = fuzzy_search("الحمد لله رب العالمين", top_k=5, **kwargs)
+    exact = search("الحمد لله رب العالمين", window=None, **kwargs)
+    assert [r.score for r in results] == [1.0] * len(exact) + [results[-1].score]
+    assert results[-1].score < 1.0
+    assert [str(r) for r in results[: len(exact)]] == [str(r) for r in exact]
+
+    # only the window ayat
+    results = fuzzy_search(
+        "الحمد لله رب العالمين", start_aya=Aya(10, 10), window=2, **kwargs
+    )
+    assert [(r.start_aya.sura_idx, r.start_aya.aya_idx) for r in results] == [(9, 9)]
+
+    # approximate istiaatha and bismillah
+    results = fuzzy_search("اعوذ بالله من الشيطان الرجيم قل اعوذ برب الفلق", **kwargs)
+    assert results[0].has_istiaatha
+    assert (results[0].start_aya.sura_idx, results[0].start_aya.aya_idx) == (112, 0)
+    results = fuzzy_search("بسم الله الرحمن الرحيم قل هو الله احد", **kwargs)
+    assert results[0].has_bismillah
+    assert results[0].imlaey_word_span == WordSpan(start=0, end=8)
+
+    assert fuzzy_search("زززززز", **kwargs) == []
+
+    # shorter than a q-gram: the exact matches
+    results = fuzzy_search("ن", **kwargs)
+    assert [str(item) for item in results] == [
+        str(item) for item in search("ن", window=None, **kwargs)
+    ]
+    assert results[0].score == 1.0
+
+
+def test_search_lazy_uthmani():
+    kwargs = {"remove_tashkeel": True}
+    uthmani_script = Aya(89, 27).imlaey_to_uthmani(WordSpan(start=2, end=4))
+    item = search("النفس المطمئنة", start_aya=Aya(89, 27), **kwargs)[0]
+    # comparing and printing do not decode it
+    assert item == copy.copy(item)
+    assert "uthmani_script" not in repr(item)
+    assert item._uthmani_script is None
+    assert item.uthmani_script == uthmani_script
+    assert item._uthmani_script == uthmani_script
+
+    # a given script is not decoded
+    item = SearchItem(
+        start_aya=Aya(89, 27),
+        num_ayat=1,
+        imlaey_word_span=WordSpan(start=2, end=4),
+        uthmani_script="script",
+    )
+    assert item.uthmani_script == "script"
+
+    item = search(
+        "أعوذ بالله من الشيطان الرجيم النفس المطمئنة",
+        start_aya=Aya(89, 27),
+        **kwargs,
+    )[0]
+    assert item.uthmani_script == (
+        Aya(89, 27).istiaatha_uthmani + " " + uthmani_script
+    )
+
+    # part of the uthmani word "يَـٰٓأَيَّتُهَا"
+    with pytest.raises(PartOfUthmaniWord):
+        search("أيتها النفس المطمئنة", start_aya=Aya(89, 27), **kwargs)
+    items = search(
+        "أيتها النفس المطمئنة", start_aya=Aya(89, 27), spans_only=True, **kwargs
+    )
+    assert items[0].imlaey_word_span == WordSpan(start=1, end=4)
+    with pytest.raises(PartOfUthmaniWord):
+        items[0].uthmani_script
+
+
+def test_aho_corasick():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    assert sorted(automaton.iter_matches("ushers")) == [(4, 0), (4, 1), (6, 3)]
+    assert list(automaton.iter_matches("ushers", ends={6})) == [(6, 3)]
+
+
+@pytest.mark.parametrize("window", [None, 2, 200])
+def test_search_many(window):
+    kwargs = {"remove_tashkeel": True}
+    start_aya = Aya(2, 255)
+    texts = [
+        "الله لا اله الا هو الحي القيوم",
+        "الله",
+        "بسم الله الرحمن الرحيم",
+        "أعوذ بالله من الشيطان الرجيم الله لا اله الا هو",
+        "أعوذ بالله من الشيطان الرجيم",
+        "الحي القي.م",
+        "الله",
+        "",
+    ]
+    outputs = search_many(texts, start_aya=start_aya, window=window, **kwargs)
+    assert len(outputs) == len(texts)
+    for text, items in zip(texts, outputs):
+        expected = search(text, start_aya=start_aya, window=window, **kwargs)
+        assert [str(item) for item in items] == [str(item) for item in expected]
+        assert [item.imlaey_word_span for item in items] == [
+            item.imlaey_word_span for item in expected
+        ]
+
+    # the window wraps around the end of the Quran
+    texts = ["الحمد لله", "الناس", "قل أعوذ برب الناس"]
+    outputs = search_many(texts, start_aya=Aya(114, 6), window=window, **kwargs)
+    for text, items in zip(texts, outputs):
+        expected = search(text, start_aya=Aya(114, 6), window=window, **kwargs)
+        assert [str(item) for item in items] == [str(item) for item in expected]
+
+    # overlapping occurrences are skipped like `search`
+    outputs = search_many(["وهو"], start_aya=Aya(6, 101), window=window, **kwargs)
+    expected = search("وهو", start_aya=Aya(6, 101), window=window, **kwargs)
+    assert [item.imlaey_word_span for item in outputs[0]] == [
+        item.imlaey_word_span for item in expected
+    ]
+
+    # the texts that are part of uthmani words do not abort the others
+    texts = ["أيتها النفس المطمئنة", "النفس المطمئنة"]
+    outputs = search_many(texts, start_aya=Aya(89, 27), window=window, **kwargs)
+    assert isinstance(outputs[0], PartOfUthmaniWord)
+    assert [str(item) for item in outputs[1]] == [
+        str(item)
+        for item in search(texts[1], start_aya=Aya(89, 27), window=window, **kwargs)
+    ]
+    outputs = search_many(
+        texts, start_aya=Aya(89, 27), window=window, spans_only=True, **kwargs
+    )
+    assert outputs[0][0].imlaey_word_span == WordSpan(start=1, end=4)
+
+
+def test_get_words_span():
+    words_list = [["aaa", "bbb"], ["cc", "ddd"]]
+    offsets = _get_words_offsets(words_list)
+    assert _get_words_span(0, 8, words_list, offsets) == (
+        Vertex(aya_idx=0, word_idx=0),
+        Vertex(aya_idx=1, word_idx=1),
+    )
+    assert _get_words_span(3, 11, words_list) == (
+        Vertex(aya_idx=0, word_idx=1),
+        Vertex(aya_idx=1, word_idx=2),
+    )
+    # inside words
+    assert _get_words_span(1, 8, words_list, offsets) is None
+    assert _get_words_span(0, 7, words_list, offsets) is None
+    assert _get_words_span(3, 3, words_list, offsets) is None
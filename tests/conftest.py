@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps the files cached by the tests (the normalized corpora) out of the
+    user cache directory
+    """
+    monkeypatch.setenv("QURAN_TRANSCRIPT_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"